@@ -0,0 +1,182 @@
+""" This module contains code to build and query a precomputed aggregation
+cube of the standardized data. Each cell of the cube is one combination of
+data source, data year, city department, case type, gov level, disposition
+and tort status, with the sum and count of the payment amount and fees and
+costs columns and the number of rows. The sums are exact integer cents like
+the money columns they sum.
+
+The cube is small enough to roll up to any coarser grouping in milliseconds
+so common totals don't need to be recomputed from the row level data. It is
+refreshed one data source at a time, so re-standardizing a year only
+replaces that year's cells.
+"""
+
+# stdlib imports
+import pathlib
+from typing import Any, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import standardized_data_query
+import util
+
+# columns the cube is grouped by
+CUBE_DIMENSION_COLS = [
+    STAN_C.DATA_SOURCE_COL,
+    STAN_C.DATA_YEAR_COL,
+    STAN_C.CITY_DEPARTMENT_INVOLVED_COL,
+    STAN_C.CASE_TYPE_COL,
+    STAN_C.CASE_GOV_LEVEL_COL,
+    STAN_C.DISPOSITION_COL,
+    STAN_C.TORT_STATUS_COL,
+]
+# columns summed and counted in each cell
+CUBE_MONEY_COLS = [STAN_C.PAYMENT_AMOUNT_COL, STAN_C.FEES_AND_COSTS_COL]
+NUM_ROWS_COL = "num_rows"
+CUBE_MEASURE_COLS = [
+    f"{money_col}_{agg}" for money_col in CUBE_MONEY_COLS for agg in ["sum", "count"]
+] + [NUM_ROWS_COL]
+
+# cube loaded by load_aggregation_cube along with the path and modified time
+# of the file it was loaded from
+_loaded_cube = {"file_key": None, "cube_df": None}
+
+
+def get_cube_cells(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregates standardized rows into cube cells.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe. Dimension and money columns it doesn't have
+        are treated as missing.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per cell with the dimension and measure columns.
+    """
+    cube_input_df = df.reindex(columns=CUBE_DIMENSION_COLS + CUBE_MONEY_COLS)
+    cell_groups = cube_input_df.groupby(CUBE_DIMENSION_COLS, dropna=False, sort=True)
+    cells_df = cell_groups[CUBE_MONEY_COLS].agg(["sum", "count"])
+    cells_df.columns = [f"{money_col}_{agg}" for money_col, agg in cells_df.columns]
+    cells_df[NUM_ROWS_COL] = cell_groups.size()
+
+    return cells_df.reset_index()
+
+
+def load_aggregation_cube(
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.DataFrame:
+    """Loads the aggregation cube, reusing the last load if the file is
+    unchanged.
+
+    Parameters
+    ----------
+    save_dir
+        The directory the cube is saved in.
+
+    Returns
+    -------
+    pd.DataFrame
+        The cube, empty if it hasn't been built yet.
+    """
+    cube_path = save_dir / STAN_C.AGGREGATION_CUBE_CSV
+    if not cube_path.exists():
+        return pd.DataFrame(columns=CUBE_DIMENSION_COLS + CUBE_MEASURE_COLS)
+
+    file_key = (cube_path, cube_path.stat().st_mtime_ns)
+    if _loaded_cube["file_key"] != file_key:
+        _loaded_cube["cube_df"] = util.load_df(
+            file_name=STAN_C.AGGREGATION_CUBE_CSV,
+            save_dir=save_dir,
+        )
+        _loaded_cube["file_key"] = file_key
+
+    return _loaded_cube["cube_df"]
+
+
+def update_aggregation_cube(
+    cells_df: pd.DataFrame,
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> None:
+    """Replaces the cells of every data source in cells_df and saves the cube.
+
+    Cells of other data sources are left as they are.
+
+    Parameters
+    ----------
+    cells_df
+        New cells from get_cube_cells.
+    save_dir
+        The directory the cube is saved in.
+    """
+    cube_df = load_aggregation_cube(save_dir)
+    kept_cells_df = cube_df[
+        ~cube_df[STAN_C.DATA_SOURCE_COL].isin(cells_df[STAN_C.DATA_SOURCE_COL])
+    ]
+    # reindexed so columns of an older cube format are dropped
+    updated_cube_df = pd.concat([kept_cells_df, cells_df], ignore_index=True).reindex(
+        columns=CUBE_DIMENSION_COLS + CUBE_MEASURE_COLS
+    )
+    updated_cube_df = updated_cube_df.sort_values(
+        [STAN_C.DATA_SOURCE_COL, STAN_C.DATA_YEAR_COL], kind="stable"
+    )
+    util.save_df(
+        df=updated_cube_df,
+        file_name=STAN_C.AGGREGATION_CUBE_CSV,
+        save_dir=save_dir,
+    )
+
+
+def rollup(
+    by: list[str],
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.DataFrame:
+    """Rolls the cube up to totals and counts grouped by the given dimensions.
+
+    The data sources overlap, so the data source must either be one of the
+    dimensions grouped by or be filtered to a single data source, see
+    standardized_data_query.check_single_data_source.
+
+    Parameters
+    ----------
+    by
+        Dimension columns to group by, any of CUBE_DIMENSION_COLS.
+    filters
+        Optional (column, operator, value) filters on the dimension columns,
+        as in standardized_data_query.
+    save_dir
+        The directory the cube is saved in.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per group with the summed measure columns.
+
+    Raises
+    ------
+    ValueError
+        If the data source is neither grouped by nor filtered to a single
+        data source.
+    """
+    standardized_data_query.check_single_data_source(by, filters)
+
+    cube_df = load_aggregation_cube(save_dir)
+    match_mask = pd.Series(True, index=cube_df.index)
+    for col, operator, value in filters or []:
+        match_mask &= standardized_data_query.get_filter_mask(
+            cube_df, col, operator, value
+        )
+
+    return (
+        cube_df[match_mask]
+        .groupby(by, dropna=False, sort=True)[CUBE_MEASURE_COLS]
+        .sum()
+        .reset_index()
+    )
@@ -0,0 +1,300 @@
+""" This module builds the lifecycle of each case from the FOIA tables. The
+pending police lawsuits, the quarterly police suit dispositions, the matter
+disposition reports and the payment tables each describe part of a case's
+life, and they all have the canonical case number standardize_case_num_info
+gives every standardized row.
+
+Every row of those tables becomes one or more dated events (the incident,
+the disposition or a payment) of its case. The events of every table are
+sorted together once by canonical case number and date, and each lifecycle
+column is then a single pass over the sorted events, so building the
+lifecycles scales with the number of events rather than joining the tables
+pairwise. The lifecycles are saved in case_lifecycles.csv with one row per
+case:
+
+    filing year -> incident date -> first disposition date -> first and last
+    payment dates
+
+along with the days between each step.
+"""
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import date_parsing
+import partitioned_dataset
+import util
+
+# events of a case's lifecycle
+INCIDENT_EVENT = "incident"
+DISPOSITION_EVENT = "disposition"
+PAYMENT_EVENT = "payment"
+
+# list of tuples of (data_source, event, date_col) where every row of the
+# data source is an event of its case dated by date_col
+LIFECYCLE_EVENT_SOURCES = [
+    (
+        STAN_C.PENDING_POLICE_SUITS_FOIA_DATA_SOURCE,
+        INCIDENT_EVENT,
+        STAN_C.INCIDENT_DATE_COL,
+    ),
+    (
+        STAN_C.QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_SOURCE,
+        INCIDENT_EVENT,
+        STAN_C.INCIDENT_DATE_COL,
+    ),
+    (
+        STAN_C.QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_SOURCE,
+        DISPOSITION_EVENT,
+        STAN_C.DISPOSITION_DATE_COL,
+    ),
+    *(
+        (matter_disp_report_data_source, event, date_col)
+        for matter_disp_report_data_source in [
+            STAN_C.MATTER_DISP_REPORT_BY_DIVISION_FOIA_DATA_SOURCE,
+            STAN_C.MATTER_DISP_REPORT_BY_DEPARTMENT_FOIA_DATA_SOURCE,
+            STAN_C.MATTER_DISP_REPORT_BY_ASSIGNEE_FOIA_DATA_SOURCE,
+        ]
+        for event, date_col in [
+            (INCIDENT_EVENT, STAN_C.INCIDENT_DATE_COL),
+            (DISPOSITION_EVENT, STAN_C.DISPOSITION_DATE_COL),
+        ]
+    ),
+    (
+        STAN_C.CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_SOURCE,
+        PAYMENT_EVENT,
+        STAN_C.DATE_TO_COMPTROLLER_COL,
+    ),
+    (
+        STAN_C.TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_SOURCE,
+        PAYMENT_EVENT,
+        STAN_C.DATE_TO_COMPTROLLER_COL,
+    ),
+]
+# columns of the standardized data the events are made from
+LIFECYCLE_INPUT_COLS = [
+    STAN_C.CANONICAL_CASE_NUM_COL,
+    STAN_C.YEAR_FILED_COL,
+    STAN_C.CASE_TYPE_COL,
+    STAN_C.DATA_SOURCE_COL,
+    STAN_C.INCIDENT_DATE_COL,
+    STAN_C.DISPOSITION_DATE_COL,
+    STAN_C.DATE_TO_COMPTROLLER_COL,
+    STAN_C.DISPOSITION_COL,
+    STAN_C.PAYMENT_RECIPIENT_COL,
+    STAN_C.PAYMENT_AMOUNT_COL,
+]
+# columns of the events
+EVENT_COL = "event"
+EVENT_DATE_COL = "event_date"
+# payment columns which identify the same payment listed in both payment
+# tables
+PAYMENT_KEY_COLS = [
+    STAN_C.CANONICAL_CASE_NUM_COL,
+    EVENT_DATE_COL,
+    STAN_C.PAYMENT_RECIPIENT_COL,
+    STAN_C.PAYMENT_AMOUNT_COL,
+]
+
+# columns of the lifecycles
+IS_PENDING_COL = "is_pending"
+FIRST_DISPOSITION_DATE_COL = "first_disposition_date"
+FIRST_PAYMENT_DATE_COL = "first_payment_date"
+LAST_PAYMENT_DATE_COL = "last_payment_date"
+NUM_PAYMENTS_COL = "num_payments"
+DAYS_INCIDENT_TO_DISPOSITION_COL = "days_incident_to_disposition"
+DAYS_DISPOSITION_TO_PAYMENT_COL = "days_disposition_to_first_payment"
+DAYS_INCIDENT_TO_PAYMENT_COL = "days_incident_to_first_payment"
+YEARS_FILED_TO_DISPOSITION_COL = "years_filed_to_disposition"
+
+
+def get_case_events(df: pd.DataFrame) -> pd.DataFrame:
+    """Gets the lifecycle events of the rows of the FOIA tables.
+
+    Rows without a canonical case number and special rows, which list more
+    than one case, have no events. A payment listed in both payment tables
+    is only one event.
+
+    Parameters
+    ----------
+    df
+        Standardized data with the LIFECYCLE_INPUT_COLS it has.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per event with the canonical case number, the event, its
+        date and the other LIFECYCLE_INPUT_COLS.
+    """
+    df = df.reindex(columns=LIFECYCLE_INPUT_COLS)
+    df = df[
+        df[STAN_C.CANONICAL_CASE_NUM_COL].notna()
+        & df[STAN_C.CASE_TYPE_COL].ne(STAN_C.SPECIAL_CASE_TYPE)
+    ]
+    event_dfs = []
+    for data_source, event, date_col in LIFECYCLE_EVENT_SOURCES:
+        source_df = df[df[STAN_C.DATA_SOURCE_COL].eq(data_source).fillna(False)]
+        event_dfs.append(
+            source_df.assign(
+                **{
+                    EVENT_COL: event,
+                    # loaded csvs have the dates as strings
+                    EVENT_DATE_COL: date_parsing.to_datetime(
+                        source_df[date_col], STAN_C.CSV_DATE_FORMATS
+                    ),
+                }
+            )
+        )
+    events_df = pd.concat(event_dfs, ignore_index=True)
+
+    # the nth copy of a payment in one table is the nth copy in the other
+    payment_mask = events_df[EVENT_COL].eq(PAYMENT_EVENT)
+    payments_df = events_df[payment_mask]
+    payment_copy_nums = payments_df.groupby(
+        [STAN_C.DATA_SOURCE_COL] + PAYMENT_KEY_COLS, dropna=False
+    ).cumcount()
+    duplicate_payment_mask = (
+        payments_df[PAYMENT_KEY_COLS]
+        .assign(copy_num=payment_copy_nums)
+        .duplicated()
+        .reindex(events_df.index, fill_value=False)
+    )
+
+    return events_df[~duplicate_payment_mask]
+
+
+def build_case_lifecycles(df: pd.DataFrame) -> pd.DataFrame:
+    """Builds the lifecycle of every case in the FOIA tables.
+
+    Parameters
+    ----------
+    df
+        Standardized data with the LIFECYCLE_INPUT_COLS it has. Rows of
+        other data sources are ignored.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per canonical case number, sorted by it, with the case's
+        filing year, case type, whether it is in the pending lawsuits, its
+        incident date, first disposition date and disposition, first and
+        last payment dates, number of payments and total payment amount,
+        and the days between the steps. Steps a case hasn't reached (or
+        whose tables don't cover it) are missing.
+    """
+    # the one sort, every group below is a contiguous run of sorted events
+    events_df = get_case_events(df).sort_values(
+        [STAN_C.CANONICAL_CASE_NUM_COL, EVENT_DATE_COL], kind="stable"
+    )
+    case_groups = events_df.groupby(STAN_C.CANONICAL_CASE_NUM_COL, sort=False)
+    lifecycle_df = pd.DataFrame(
+        {
+            STAN_C.YEAR_FILED_COL: pd.to_numeric(
+                case_groups[STAN_C.YEAR_FILED_COL].first()
+            ).astype("Int64"),
+            STAN_C.CASE_TYPE_COL: case_groups[STAN_C.CASE_TYPE_COL].first(),
+        }
+    )
+    lifecycle_df[IS_PENDING_COL] = lifecycle_df.index.isin(
+        events_df.loc[
+            events_df[STAN_C.DATA_SOURCE_COL].eq(
+                STAN_C.PENDING_POLICE_SUITS_FOIA_DATA_SOURCE
+            ),
+            STAN_C.CANONICAL_CASE_NUM_COL,
+        ]
+    )
+
+    event_groups = {
+        event: event_df.groupby(STAN_C.CANONICAL_CASE_NUM_COL, sort=False)
+        for event, event_df in events_df.groupby(EVENT_COL, sort=False)
+    }
+    if INCIDENT_EVENT in event_groups:
+        incident_groups = event_groups[INCIDENT_EVENT]
+        lifecycle_df[STAN_C.INCIDENT_DATE_COL] = incident_groups[EVENT_DATE_COL].first()
+    if DISPOSITION_EVENT in event_groups:
+        disposition_groups = event_groups[DISPOSITION_EVENT]
+        lifecycle_df[FIRST_DISPOSITION_DATE_COL] = disposition_groups[
+            EVENT_DATE_COL
+        ].first()
+        lifecycle_df[STAN_C.DISPOSITION_COL] = disposition_groups[
+            STAN_C.DISPOSITION_COL
+        ].first()
+    if PAYMENT_EVENT in event_groups:
+        payment_groups = event_groups[PAYMENT_EVENT]
+        lifecycle_df[FIRST_PAYMENT_DATE_COL] = payment_groups[EVENT_DATE_COL].first()
+        lifecycle_df[LAST_PAYMENT_DATE_COL] = payment_groups[EVENT_DATE_COL].last()
+        lifecycle_df[NUM_PAYMENTS_COL] = payment_groups.size()
+        lifecycle_df[STAN_C.PAYMENT_AMOUNT_COL] = payment_groups[
+            STAN_C.PAYMENT_AMOUNT_COL
+        ].sum(min_count=1)
+    lifecycle_df = lifecycle_df.reindex(
+        columns=[
+            STAN_C.YEAR_FILED_COL,
+            STAN_C.CASE_TYPE_COL,
+            IS_PENDING_COL,
+            STAN_C.INCIDENT_DATE_COL,
+            FIRST_DISPOSITION_DATE_COL,
+            STAN_C.DISPOSITION_COL,
+            FIRST_PAYMENT_DATE_COL,
+            LAST_PAYMENT_DATE_COL,
+            NUM_PAYMENTS_COL,
+            STAN_C.PAYMENT_AMOUNT_COL,
+        ]
+    )
+    lifecycle_df[NUM_PAYMENTS_COL] = (
+        lifecycle_df[NUM_PAYMENTS_COL].fillna(0).astype("Int64")
+    )
+
+    # durations
+    for duration_col, start_col, end_col in [
+        (
+            DAYS_INCIDENT_TO_DISPOSITION_COL,
+            STAN_C.INCIDENT_DATE_COL,
+            FIRST_DISPOSITION_DATE_COL,
+        ),
+        (
+            DAYS_DISPOSITION_TO_PAYMENT_COL,
+            FIRST_DISPOSITION_DATE_COL,
+            FIRST_PAYMENT_DATE_COL,
+        ),
+        (
+            DAYS_INCIDENT_TO_PAYMENT_COL,
+            STAN_C.INCIDENT_DATE_COL,
+            FIRST_PAYMENT_DATE_COL,
+        ),
+    ]:
+        lifecycle_df[duration_col] = (
+            lifecycle_df[end_col] - lifecycle_df[start_col]
+        ).dt.days.astype("Int64")
+    lifecycle_df[YEARS_FILED_TO_DISPOSITION_COL] = (
+        lifecycle_df[FIRST_DISPOSITION_DATE_COL].dt.year.astype("Int64")
+        - lifecycle_df[STAN_C.YEAR_FILED_COL]
+    )
+
+    return lifecycle_df.rename_axis(STAN_C.CANONICAL_CASE_NUM_COL).reset_index()
+
+
+def build_all_case_lifecycles() -> pd.DataFrame:
+    """Builds the lifecycles of every case in the FOIA tables of the
+    partitioned dataset and saves them."""
+    data_sources = {data_source for data_source, _, _ in LIFECYCLE_EVENT_SOURCES}
+    df = partitioned_dataset.load_partition_entries(
+        partitioned_dataset.select_partitions(data_sources=data_sources),
+        columns=LIFECYCLE_INPUT_COLS,
+    )
+    lifecycle_df = build_case_lifecycles(df)
+    util.save_df(
+        df=lifecycle_df,
+        file_name=STAN_C.CASE_LIFECYCLES_CSV,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+    )
+    print(f"Built the lifecycles of {lifecycle_df.shape[0]} cases")
+
+    return lifecycle_df
+
+
+if __name__ == "__main__":
+    build_all_case_lifecycles()
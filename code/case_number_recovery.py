@@ -0,0 +1,347 @@
+""" This module suggests canonical case numbers for rows whose raw case number
+matched none of the patterns in case_number_standardization and so were left
+as unknown_case_type. Many of these are typos or damage from the PDF table
+extraction, e.g. "O9 L 1234" or "09 L1 234".
+
+A character n-gram index is built over the raw case numbers of every row that
+was canonicalized, compacted to upper case with whitespace and dashes removed
+and with the ways of writing the same number normalized (see
+compact_case_num), and mapped to their canonical numbers. Each unknown raw
+number is compacted the same way and looked up in the index. Only the candidates sharing the most
+n-grams with it are scored, and n-grams shared by too many case numbers are
+skipped, so each lookup takes roughly constant time no matter how big the
+index is.
+
+Only edits a typo or the extraction could plausibly make are counted: digits
+can be inserted, deleted or replaced by another digit, and a letter can only
+be swapped with a digit it is commonly misread as (e.g. O and 0). Every
+other letter, so every court designator like L, CH or CV, has to match, since
+a number with another designator is a different case. A number written
+without any designator (e.g. "08-4241") is not given one either, since in the
+data those are often cases from other courts. Candidates needing any other
+edit are never suggested, and neither is anything when the closest candidates
+have different canonical numbers.
+
+The confidence of a candidate is one minus its edit distance to the unknown
+number divided by the longer of their lengths, so a single typo in a ten
+character number has a confidence of 0.9. The best candidate's canonical
+number and its confidence are saved as side columns in case_num_suggestions.csv. They
+never replace the canonical case number column.
+"""
+
+# stdlib imports
+import re
+import math
+import collections
+from typing import Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import partitioned_dataset
+import util
+
+# length of the character n-grams in the index
+NGRAM_LEN = 3
+# n-grams in more than this many indexed case numbers are not looked up
+MAX_POSTINGS_LEN = 2_000
+# number of candidates sharing the most n-grams that are scored per lookup
+NUM_CANDIDATES = 20
+# suggestions with a lower confidence than this are dropped
+MIN_SUGGESTION_CONFIDENCE = 0.85
+
+# letters OCR and the PDF extraction commonly misread as a digit, mapped to
+# that digit. Letters used in court designators (e.g. L, S, D) are left out
+# so a designator is never read as a digit
+OCR_CONFUSABLE_DIGITS = {"O": "0", "I": "1", "Z": "2", "G": "6", "B": "8"}
+
+# case types with a canonical case number that can be suggested
+CANONICALIZED_CASE_TYPES = [
+    STAN_C.FEDERAL_CIVIL_CASE_TYPE,
+    STAN_C.LAW_DIV_CASE_TYPE,
+    STAN_C.MUNICIPAL_DIV_CASE_TYPE,
+    STAN_C.CITY_ADMIN_CLAIM_CASE_TYPE,
+]
+
+COMPACT_PAT = re.compile(r"[\s\-]+")
+# (pattern, replacement) pairs normalizing the ways a compacted case number
+# can be written, applied in order
+CASE_NUM_NORMALIZATIONS = [
+    # the 182 prefix of admin claim numbers, which is often left out
+    (re.compile(r"^182(?=A\d)"), ""),
+    # CV and C both denote the federal district court
+    (re.compile(r"(?<=\d)CV(?=\d)"), "C"),
+    # four digit filing years
+    (re.compile(r"^(?:19|20)(?=\d{2}[A-Z])"), ""),
+    # zero padding of the number after a court designator
+    (re.compile(r"(\d[A-Z]+)0+(?=\d)"), r"\1"),
+]
+
+
+def compact_case_num(raw_case_num: str) -> str:
+    """Upper cases a raw case number, removes its whitespace and dashes and
+    normalizes it with CASE_NUM_NORMALIZATIONS, so e.g. "2005 CH 009493" and
+    "05-CH-9493" are the same compacted number."""
+    compact_num = COMPACT_PAT.sub("", raw_case_num.upper())
+    for normalization_pat, replacement in CASE_NUM_NORMALIZATIONS:
+        compact_num = normalization_pat.sub(replacement, compact_num)
+    return compact_num
+
+
+def get_ngrams(compact_num: str) -> set[str]:
+    """Returns the set of character n-grams of a compacted case number padded
+    with spaces so its start and end are their own n-grams."""
+    padded_num = f" {compact_num} "
+    return {
+        padded_num[i : i + NGRAM_LEN]
+        for i in range(max(len(padded_num) - NGRAM_LEN + 1, 1))
+    }
+
+
+def get_misread_digits(compact_num: str) -> list[Optional[str]]:
+    """Returns the digit each character of a compacted case number may be a
+    misreading of: the digit itself for a digit, the digit a letter is
+    commonly misread as for a letter between digits, and None otherwise.
+
+    A letter next to another letter is part of a court designator (e.g. the
+    I of CI), so it is never treated as a misread digit.
+    """
+    misread_digits = []
+    for i, char in enumerate(compact_num):
+        if char.isdigit():
+            misread_digits.append(char)
+        elif not any(
+            0 <= neighbor_i < len(compact_num) and compact_num[neighbor_i].isalpha()
+            for neighbor_i in [i - 1, i + 1]
+        ):
+            misread_digits.append(OCR_CONFUSABLE_DIGITS.get(char))
+        else:
+            misread_digits.append(None)
+    return misread_digits
+
+
+def get_edit_distance(compact_num: str, other_compact_num: str) -> float:
+    """Returns the edit distance between two compacted case numbers.
+
+    Like the Levenshtein distance, but only digits can be inserted, deleted
+    or replaced by another digit, and a letter can only be replaced by the
+    digit it is commonly misread as (see get_misread_digits). The distance
+    is infinite if the numbers differ in any other way, so their court
+    designators always match.
+    """
+    misread_digits = get_misread_digits(compact_num)
+    other_misread_digits = get_misread_digits(other_compact_num)
+
+    def get_indel_cost(char: str) -> float:
+        return 1 if char.isdigit() else math.inf
+
+    def get_substitution_cost(i: int, j: int) -> float:
+        char, other_char = compact_num[i], other_compact_num[j]
+        if char == other_char:
+            return 0
+        if (char.isdigit() and other_char.isdigit()) or (
+            misread_digits[i] is not None
+            and misread_digits[i] == other_misread_digits[j]
+        ):
+            return 1
+        return math.inf
+
+    prev_row = [0]
+    for other_char in other_compact_num:
+        prev_row.append(prev_row[-1] + get_indel_cost(other_char))
+    for i, char in enumerate(compact_num):
+        row = [prev_row[0] + get_indel_cost(char)]
+        for j, other_char in enumerate(other_compact_num):
+            row.append(
+                min(
+                    prev_row[j + 1] + get_indel_cost(char),
+                    row[j] + get_indel_cost(other_char),
+                    prev_row[j] + get_substitution_cost(i, j),
+                )
+            )
+        prev_row = row
+    return prev_row[-1]
+
+
+class CaseNumIndex:
+    """Character n-gram index over compacted raw case numbers.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe. Rows with a canonicalized case type are
+        indexed.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        canonicalized_df = df[
+            df[STAN_C.CASE_TYPE_COL].isin(CANONICALIZED_CASE_TYPES)
+            & df[STAN_C.RAW_CASE_NUM_COL].notna()
+        ]
+        compact_nums = (
+            canonicalized_df[STAN_C.RAW_CASE_NUM_COL].astype(str).map(compact_case_num)
+        )
+        # the most common canonical number of each compacted raw number
+        self.canonical_nums = (
+            pd.DataFrame(
+                {
+                    "compact_num": compact_nums,
+                    "canonical_num": canonicalized_df[STAN_C.CANONICAL_CASE_NUM_COL],
+                }
+            )
+            .groupby("compact_num")["canonical_num"]
+            .agg(lambda canonical_nums: canonical_nums.mode().iloc[0])
+            .to_dict()
+        )
+        self.compact_nums = sorted(self.canonical_nums)
+        postings = collections.defaultdict(list)
+        for num_id, compact_num in enumerate(self.compact_nums):
+            for ngram in get_ngrams(compact_num):
+                postings[ngram].append(num_id)
+        self.postings = {
+            ngram: num_ids
+            for ngram, num_ids in postings.items()
+            if len(num_ids) <= MAX_POSTINGS_LEN
+        }
+
+    def suggest(self, raw_case_num: str) -> tuple[Optional[str], float]:
+        """Suggests the canonical number closest to a raw case number.
+
+        Parameters
+        ----------
+        raw_case_num
+            A raw case number which matched no case number pattern.
+
+        Returns
+        -------
+        tuple[Optional[str], float]
+            The suggested canonical number and its confidence from 0 to 1,
+            or None and 0 if no number in the index is within plausible
+            edits of it or the closest ones have different canonical numbers.
+        """
+        compact_num = compact_case_num(raw_case_num)
+        shared_ngram_counts = collections.Counter()
+        for ngram in get_ngrams(compact_num):
+            shared_ngram_counts.update(self.postings.get(ngram, []))
+
+        best_canonical_nums, best_confidence = set(), 0.0
+        for num_id, _ in shared_ngram_counts.most_common(NUM_CANDIDATES):
+            candidate_num = self.compact_nums[num_id]
+            confidence = 1 - get_edit_distance(compact_num, candidate_num) / max(
+                len(compact_num), len(candidate_num)
+            )
+            if confidence > best_confidence:
+                best_canonical_nums, best_confidence = set(), confidence
+            if confidence == best_confidence and confidence > 0:
+                best_canonical_nums.add(self.canonical_nums[candidate_num])
+
+        if len(best_canonical_nums) != 1:
+            return None, 0.0
+        return best_canonical_nums.pop(), best_confidence
+
+
+def suggest_case_nums(df: pd.DataFrame) -> pd.DataFrame:
+    """Suggests canonical numbers for every unknown case type row.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe, used both to build the index and as the rows
+        to suggest numbers for.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per data source and unknown raw case number with a suggestion
+        at least as confident as MIN_SUGGESTION_CONFIDENCE.
+    """
+    case_num_index = CaseNumIndex(df)
+    unknown_df = df.loc[
+        df[STAN_C.CASE_TYPE_COL].eq(STAN_C.OTHER_CASE_TYPE)
+        & df[STAN_C.RAW_CASE_NUM_COL].notna(),
+        [STAN_C.DATA_SOURCE_COL, STAN_C.RAW_CASE_NUM_COL],
+    ].drop_duplicates()
+    unknown_df[STAN_C.RAW_CASE_NUM_COL] = unknown_df[STAN_C.RAW_CASE_NUM_COL].astype(
+        str
+    )
+    # each distinct number is only looked up once
+    suggestions = {
+        raw_case_num: case_num_index.suggest(raw_case_num)
+        for raw_case_num in unknown_df[STAN_C.RAW_CASE_NUM_COL].unique()
+    }
+    unknown_df[STAN_C.SUGGESTED_CANONICAL_CASE_NUM_COL] = unknown_df[
+        STAN_C.RAW_CASE_NUM_COL
+    ].map(lambda raw_case_num: suggestions[raw_case_num][0])
+    unknown_df[STAN_C.SUGGESTED_CASE_NUM_CONFIDENCE_COL] = unknown_df[
+        STAN_C.RAW_CASE_NUM_COL
+    ].map(lambda raw_case_num: round(suggestions[raw_case_num][1], 3))
+
+    return unknown_df[
+        unknown_df[STAN_C.SUGGESTED_CASE_NUM_CONFIDENCE_COL]
+        >= MIN_SUGGESTION_CONFIDENCE
+    ].reset_index(drop=True)
+
+
+def suggest_all_case_nums() -> pd.DataFrame:
+    """Suggests canonical numbers for the unknown case numbers of every
+    partition of the standardized data and saves them."""
+    suggestions_df = suggest_case_nums(partitioned_dataset.load_partitions())
+    util.save_df(
+        df=suggestions_df,
+        file_name=STAN_C.CASE_NUM_SUGGESTIONS_CSV,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+    )
+    print(f"Suggested canonical numbers for {suggestions_df.shape[0]} case numbers")
+
+    return suggestions_df
+
+
+def add_case_num_suggestions(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds the saved case number suggestions to a dataframe as side columns.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe with data source and raw case number columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataframe with the suggested canonical case number and confidence
+        columns, missing for rows without a suggestion.
+    """
+    suggestions_df = util.load_df(
+        file_name=STAN_C.CASE_NUM_SUGGESTIONS_CSV,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+    )
+    suggestions_df[STAN_C.RAW_CASE_NUM_COL] = suggestions_df[
+        STAN_C.RAW_CASE_NUM_COL
+    ].astype(str)
+    merge_keys = [STAN_C.DATA_SOURCE_COL, STAN_C.RAW_CASE_NUM_COL]
+    suggestion_cols = [
+        STAN_C.SUGGESTED_CANONICAL_CASE_NUM_COL,
+        STAN_C.SUGGESTED_CASE_NUM_CONFIDENCE_COL,
+    ]
+    suggestions = suggestions_df.set_index(merge_keys)[suggestion_cols]
+    row_keys = pd.MultiIndex.from_arrays(
+        [df[STAN_C.DATA_SOURCE_COL], df[STAN_C.RAW_CASE_NUM_COL].astype(str)]
+    )
+    unknown_mask = (
+        df[STAN_C.CASE_TYPE_COL]
+        .eq(STAN_C.OTHER_CASE_TYPE)
+        .fillna(False)
+        .to_numpy(dtype=bool)
+    )
+    for col in suggestion_cols:
+        df[col] = (
+            suggestions[col].reindex(row_keys).where(unknown_mask).set_axis(df.index)
+        )
+
+    return df
+
+
+if __name__ == "__main__":
+    suggest_all_case_nums()
@@ -280,7 +280,7 @@ def standardize_case_num_info(
             rows_to_modify_mask & df[STAN_C.YEAR_FILED_COL].notna(),
             STAN_C.YEAR_FILED_COL,
         ].apply(
-            lambda yr: f"20{yr}" if int(yr) <= 30 else f"19{yr}"
+            lambda yr: str(get_full_year(yr))
         )
 
         modified_rows_masks.append(rows_to_modify_mask)
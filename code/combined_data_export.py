@@ -0,0 +1,69 @@
+""" This module exports all of the cleaned and standardized data, both the
+Law Website data and the FOIA data, into a single uncompressed feather
+(Arrow IPC) file. Unlike the csvs the feather file can be memory mapped with
+util.load_memory_mapped_table, so any number of processes on one machine can
+open it almost instantly while sharing a single copy of the data.
+
+Requires pyarrow.
+"""
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import partitioned_dataset
+import date_parsing
+import payee_resolution
+import case_number_recovery
+import util
+
+# standardized date columns which are saved as strings in the csvs
+STANDARDIZED_DATE_COLS = [
+    STAN_C.DATE_TO_COMPTROLLER_COL,
+    STAN_C.DISPOSITION_DATE_COL,
+    STAN_C.INCIDENT_DATE_COL,
+    STAN_C.DUE_DATE_COL,
+    STAN_C.EFFECTIVE_DATE_COL,
+]
+
+
+def export_combined_data() -> pd.DataFrame:
+    """Loads every partition of the standardized data and saves it as one
+    feather file then returns the combined dataframe. Payee ids and case
+    number suggestions are added if payee_resolution.py and
+    case_number_recovery.py have been run.
+
+    Returns
+    -------
+    pd.DataFrame
+        The combined standardized data that was saved.
+    """
+    combined_df = partitioned_dataset.load_partitions()
+    if (DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR / STAN_C.PAYEE_IDS_CSV).exists():
+        combined_df = payee_resolution.add_payee_ids(combined_df)
+    if (
+        DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR / STAN_C.CASE_NUM_SUGGESTIONS_CSV
+    ).exists():
+        combined_df = case_number_recovery.add_case_num_suggestions(combined_df)
+    # a column can have a different type in each source, e.g. an int case
+    # number in one and a string in another, so make those all strings
+    for col in combined_df.select_dtypes("object").columns:
+        combined_df[col] = combined_df[col].astype("string")
+    for date_col in combined_df.columns.intersection(STANDARDIZED_DATE_COLS):
+        combined_df[date_col] = date_parsing.to_datetime(
+            combined_df[date_col], STAN_C.CSV_DATE_FORMATS
+        )
+
+    util.save_df(
+        df=combined_df,
+        file_name=STAN_C.STANDARDIZED_COMBINED_DATA_FEATHER,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+    )
+
+    return combined_df
+
+
+if __name__ == "__main__":
+    export_combined_data()
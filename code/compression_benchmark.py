@@ -0,0 +1,88 @@
+""" This module benchmarks the write time and file size of the csv compression
+util.save_df supports on the all years law website data, so the format of
+large outputs can be picked knowing the tradeoff. Every format is also loaded
+back with util.load_df and checked against the uncompressed csv.
+
+    python compression_benchmark.py --repeats 5
+"""
+
+# stdlib imports
+import time
+import argparse
+import pathlib
+import tempfile
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import util
+
+# file name of each benchmarked format, compression is picked by the ending
+BENCHMARK_FILE_NAMES = {
+    "csv": "benchmark.csv",
+    "gzip": "benchmark.csv.gz",
+    "zstd": "benchmark.csv.zst",
+}
+
+
+def time_call(func, num_repeats: int) -> float:
+    """Returns the fastest time in seconds of calling a function."""
+    times = []
+    for _ in range(num_repeats):
+        start_time = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def run_benchmark(format_names: list[str], num_repeats: int) -> None:
+    """Saves and loads the all years law website data in each format and
+    prints the times and file sizes."""
+    df = util.load_df(
+        file_name=STAN_C.STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_CSV,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR,
+    )
+    print(f"{df.shape[0]} rows, {df.shape[1]} columns")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_dir = pathlib.Path(temp_dir)
+        csv_size = None
+        for format_name in format_names:
+            file_name = BENCHMARK_FILE_NAMES[format_name]
+            try:
+                write_time = time_call(
+                    lambda: util.save_df(df, file_name, save_dir), num_repeats
+                )
+            except ImportError as e:
+                print(f"{format_name}: skipped, {e}")
+                continue
+            read_time = time_call(
+                lambda: util.load_df(file_name, save_dir), num_repeats
+            )
+            pd.testing.assert_frame_equal(util.load_df(file_name, save_dir), df)
+
+            size = (save_dir / file_name).stat().st_size
+            ratio = ""
+            if format_name == "csv":
+                csv_size = size
+            elif csv_size:
+                ratio = f", {csv_size / size:.1f}x smaller than csv"
+            print(
+                f"{format_name}: write {write_time:.3f}s, read {read_time:.3f}s, "
+                f"{size / 1e6:.2f} MB{ratio}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(BENCHMARK_FILE_NAMES),
+        default=list(BENCHMARK_FILE_NAMES),
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.formats, args.repeats)
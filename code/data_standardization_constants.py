@@ -14,9 +14,10 @@ YEAR_CASE_NUMBER_COL = "year_specific_case_num"
 CASE_TYPE_COL = "case_type"
 CASE_GOV_LEVEL_COL = "gov_level"
 PAYMENT_RECIPIENT_COL = "payment_recipient"
-PAYMENT_AMOUNT_COL = "payment_amount"
+# the money columns are exact integer cents, see money_parsing
+PAYMENT_AMOUNT_COL = "payment_amount_cents"
 PAYMENT_FUND_COL = "payment_fund"
-FEES_AND_COSTS_COL = "fees_and_costs"
+FEES_AND_COSTS_COL = "fees_and_costs_cents"
 PRIMARY_CAUSE_COL = "primary_cause"
 CITY_DEPARTMENT_INVOLVED_COL = "city_department"
 DISPOSITION_COL = "disposition"
@@ -29,6 +30,12 @@ PDF_PAGE_NUM_COL = "original_pdf_page_num"
 ORIGINALLY_HIDDEN_COL = "hidden_in_raw_data"
 CLIENT_DEPARTMENT_PAYMENT_COL = "client_department_payment"
 DATA_SOURCE_COL = "data_source"
+DATA_YEAR_COL = "data_year"
+RECORD_ID_COL = "record_id"
+DUPLICATE_RECORD_COL = "is_duplicate_record"
+PAYEE_ID_COL = "payee_id"
+SUGGESTED_CANONICAL_CASE_NUM_COL = "suggested_canonical_case_num"
+SUGGESTED_CASE_NUM_CONFIDENCE_COL = "suggested_case_num_confidence"
 CASE_NAME_COL = "case_name"
 INCIDENT_DATE_COL = "incident_date"
 EXTENDED_DESCRIPTION_COL = "extended_description"
@@ -81,6 +88,18 @@ LAW_WEBSITE_DATA_COL_STANDARDIZATION_RENAME_DICT = {
     "Description": ALTERNATE_DISP_DESCRIPTION_COL,
 }
 
+# ------------------------------------------------------------
+# FOIA Data Column Rename Overrides
+# - The matter disposition reports by division and department have both a
+#   "Disposition" and a "Disposition Description" column. The latter is the
+#   same free text the by assignee report calls "Description" so it is
+#   renamed to the alternate disposition description instead.
+# ------------------------------------------------------------
+
+MATTER_DISP_REPORT_COL_STANDARDIZATION_RENAME_OVERRIDES = {
+    "Disposition Description": ALTERNATE_DISP_DESCRIPTION_COL,
+}
+
 # ------------------------------------------------------------
 # Standardized special column values
 # ------------------------------------------------------------
@@ -101,6 +120,34 @@ CITY_LEVEL_TYPE = "city_of_chicago_body"
 OTHER_LEVEL = "unknown_gov_level"
 SPECIAL_LEVEL = "special"
 
+# ------------------------------------------------------------
+# Date Formats
+# - Formats dates are written in by to_csv, which adds the time only if a
+#   column has one. Some csvs were written with milliseconds.
+# ------------------------------------------------------------
+
+CSV_DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f"]
+
+# ------------------------------------------------------------
+# Data Source Names
+# - Values of the data source column for each standardized file
+# ------------------------------------------------------------
+
+# FOIA related
+CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_SOURCE = "foia_cpd_payments_2004_to_2018"
+TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_SOURCE = "foia_tort_payments_2001_to_2007"
+PENDING_POLICE_SUITS_FOIA_DATA_SOURCE = "foia_pending_police_lawsuits"
+QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_SOURCE = "foia_quarterly_police_suit_dispositions"
+MATTER_DISP_REPORT_BY_DIVISION_FOIA_DATA_SOURCE = (
+    "foia_matter_disposition_reports_by_division"
+)
+MATTER_DISP_REPORT_BY_DEPARTMENT_FOIA_DATA_SOURCE = (
+    "foia_matter_disposition_reports_by_department"
+)
+MATTER_DISP_REPORT_BY_ASSIGNEE_FOIA_DATA_SOURCE = (
+    "foia_matter_disposition_reports_by_assignee"
+)
+
 # ------------------------------------------------------------
 # File Names
 # - Dicts used to rename the columns of the raw csv formatted law
@@ -108,24 +155,50 @@ SPECIAL_LEVEL = "special"
 # ------------------------------------------------------------
 
 # Law website related
-STANDARDIZED_2008_LAW_WEBSITE_DATA_CSV = "standardized_2008_law_website_data.csv"
-STANDARDIZED_2009_LAW_WEBSITE_DATA_CSV = "standardized_2009_law_website_data.csv"
-STANDARDIZED_2010_LAW_WEBSITE_DATA_CSV = "standardized_2010_law_website_data.csv"
-STANDARDIZED_2011_LAW_WEBSITE_DATA_CSV = "standardized_2011_law_website_data.csv"
-STANDARDIZED_2012_LAW_WEBSITE_DATA_CSV = "standardized_2012_law_website_data.csv"
-STANDARDIZED_2013_LAW_WEBSITE_DATA_CSV = "standardized_2013_law_website_data.csv"
-STANDARDIZED_2014_LAW_WEBSITE_DATA_CSV = "standardized_2014_law_website_data.csv"
-STANDARDIZED_2015_LAW_WEBSITE_DATA_CSV = "standardized_2015_law_website_data.csv"
-STANDARDIZED_2016_LAW_WEBSITE_DATA_CSV = "standardized_2016_law_website_data.csv"
-STANDARDIZED_2017_LAW_WEBSITE_DATA_CSV = "standardized_2017_law_website_data.csv"
-STANDARDIZED_2018_LAW_WEBSITE_DATA_CSV = "standardized_2018_law_website_data.csv"
-STANDARDIZED_2019_LAW_WEBSITE_DATA_CSV = "standardized_2019_law_website_data.csv"
-STANDARDIZED_2020_LAW_WEBSITE_DATA_CSV = "standardized_2020_law_website_data.csv"
-STANDARDIZED_2021_LAW_WEBSITE_DATA_CSV = "standardized_2021_law_website_data.csv"
-
 STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_CSV = (
     "standardized_2008_to_2021_law_website_data.csv"
 )
+STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_INDEX_JSON = (
+    "standardized_2008_to_2021_law_website_data_index.json"
+)
+
+# Combined data related
+STANDARDIZED_COMBINED_DATA_FEATHER = "standardized_combined_data.feather"
+
+# Payee resolution related
+PAYEE_IDS_CSV = "payee_ids.csv"
+
+# Case number recovery related
+CASE_NUM_SUGGESTIONS_CSV = "case_num_suggestions.csv"
+
+# Case lifecycle related
+CASE_LIFECYCLES_CSV = "case_lifecycles.csv"
+
+# Validation related
+VALIDATION_CACHE_JSON = "validation_cache.json"
+
+# Pipeline checkpoint related
+CHECKPOINT_STATE_JSON = "state.json"
+
+# Aggregation cube related
+AGGREGATION_CUBE_CSV = "aggregation_cube.csv"
+
+# String dictionary related
+STRING_DICTIONARY_CSV = "string_dictionary.csv"
+
+# Text search index related
+# ending of the postings file of each data source
+TEXT_SEARCH_POSTINGS_CSV_ENDING = ".csv.gz"
+
+# Payment time series related
+MONTHLY_PAYMENT_SERIES_CSV = "monthly_payment_series.csv"
+
+# Output diff related
+OUTPUT_SNAPSHOT_MANIFEST_JSON = "manifest.json"
+
+# Partitioned dataset related
+PARTITION_DATA_CSV = "part.csv"
+PARTITION_METADATA_JSON = "partitions.json"
 
 # FOIA related
 STANDARDIZED_CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_CSV = (
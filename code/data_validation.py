@@ -0,0 +1,319 @@
+""" This module contains a small declarative validation layer for the raw and
+standardized tables. A table's checks are written as a list of
+ValidationRule tuples instead of scattered asserts, e.g.
+
+    validate_df(
+        raw_2010_df,
+        rules=get_shape_rules(957, 8) + [ValidationRule(NOT_NULL, "CASE #")],
+        table_name="2010 law website data",
+    )
+
+Every rule is evaluated with vectorized operations in a single pass over the
+table and all the violations are reported together in one ValidationError,
+which unlike an assert is still raised when python runs with -O.
+
+When the table was loaded from a file, passing that file lets a successful
+validation be cached under the hash of the file and the hash of the rule set
+so re-runs on unchanged files skip validating again.
+"""
+
+# stdlib imports
+import json
+import pathlib
+import hashlib
+from typing import Any, NamedTuple, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import util
+
+# rule kinds
+NUM_ROWS = "num_rows"  # expected is the number of rows
+NUM_COLS = "num_cols"  # expected is the number of columns
+REQUIRED_COLUMNS = "required_columns"  # expected is a list of column names
+NOT_NULL = "not_null"  # every value of the column is non-missing
+ALL_NULL = "all_null"  # every value of the column is missing
+CONSTANT = "constant"  # every value of the column is the same
+VALUE_IN = "value_in"  # expected is the allowed values, missing are allowed
+VALUE_NOT_IN = "value_not_in"  # expected is the values which aren't allowed
+VALUE_AT = "value_at"  # expected is a (row label, value) tuple
+VALUE_RANGE = "value_range"  # expected is an inclusive (min, max) tuple
+
+TABLE_RULE_KINDS = [NUM_ROWS, NUM_COLS, REQUIRED_COLUMNS]
+COLUMN_RULE_KINDS = [
+    NOT_NULL,
+    ALL_NULL,
+    CONSTANT,
+    VALUE_IN,
+    VALUE_NOT_IN,
+    VALUE_AT,
+    VALUE_RANGE,
+]
+
+# number of example row labels listed for each violated column rule
+NUM_EXAMPLE_ROWS = 5
+
+# range in cents every standardized money amount must be in
+STANDARDIZED_MONEY_RANGE = (-10_000_000_00, 100_000_000_00)
+STANDARDIZED_MONEY_COLS = [STAN_C.PAYMENT_AMOUNT_COL, STAN_C.FEES_AND_COSTS_COL]
+
+
+class ValidationRule(NamedTuple):
+    """A single check on a table. Column rules apply to col, table rules
+    leave it as None."""
+
+    kind: str
+    col: Optional[Any] = None
+    expected: Any = None
+
+
+class ValidationError(Exception):
+    """Raised with every violation found when a table fails validation."""
+
+
+def get_shape_rules(num_rows: int, num_cols: int) -> list[ValidationRule]:
+    """Returns the rules checking a table has exactly the given shape."""
+    return [
+        ValidationRule(NUM_ROWS, None, num_rows),
+        ValidationRule(NUM_COLS, None, num_cols),
+    ]
+
+
+def get_standardized_data_rules(columns: list[str]) -> list[ValidationRule]:
+    """Returns the rules every standardized table must pass.
+
+    Parameters
+    ----------
+    columns
+        The columns of the standardized table. Money range rules are only
+        added for the money columns it has.
+
+    Returns
+    -------
+    list[ValidationRule]
+        The rules for the table.
+    """
+    rules = [
+        ValidationRule(
+            REQUIRED_COLUMNS,
+            None,
+            [
+                STAN_C.RAW_CASE_NUM_COL,
+                STAN_C.CANONICAL_CASE_NUM_COL,
+                STAN_C.CASE_TYPE_COL,
+                STAN_C.CASE_GOV_LEVEL_COL,
+                STAN_C.DATA_SOURCE_COL,
+                STAN_C.DATA_YEAR_COL,
+            ],
+        ),
+        ValidationRule(NOT_NULL, STAN_C.DATA_SOURCE_COL),
+        ValidationRule(NOT_NULL, STAN_C.CASE_TYPE_COL),
+        ValidationRule(NOT_NULL, STAN_C.CASE_GOV_LEVEL_COL),
+        ValidationRule(
+            VALUE_IN,
+            STAN_C.CASE_TYPE_COL,
+            [
+                STAN_C.FEDERAL_CIVIL_CASE_TYPE,
+                STAN_C.LAW_DIV_CASE_TYPE,
+                STAN_C.MUNICIPAL_DIV_CASE_TYPE,
+                STAN_C.CITY_ADMIN_CLAIM_CASE_TYPE,
+                STAN_C.SPECIAL_CASE_TYPE,
+                STAN_C.OTHER_CASE_TYPE,
+            ],
+        ),
+        ValidationRule(
+            VALUE_IN,
+            STAN_C.CASE_GOV_LEVEL_COL,
+            [
+                STAN_C.FEDERAL_LEVEL_TYPE,
+                STAN_C.MUNICIPAL_LEVEL_TYPE,
+                STAN_C.CITY_LEVEL_TYPE,
+                STAN_C.SPECIAL_LEVEL,
+                STAN_C.OTHER_LEVEL,
+            ],
+        ),
+    ]
+    for money_col in STANDARDIZED_MONEY_COLS:
+        if money_col in columns:
+            rules.append(
+                ValidationRule(VALUE_RANGE, money_col, STANDARDIZED_MONEY_RANGE)
+            )
+
+    return rules
+
+
+def get_rule_set_hash(rules: list[ValidationRule]) -> str:
+    """Returns a hash of a rule set which changes whenever any rule does."""
+    rules_json = json.dumps([list(rule) for rule in rules], default=str)
+    return hashlib.sha256(rules_json.encode()).hexdigest()
+
+
+def get_table_violations(df: pd.DataFrame, rules: list[ValidationRule]) -> list[str]:
+    """Evaluates the table rules, which only look at the table's shape and
+    column names."""
+    violations = []
+    for rule in rules:
+        if rule.kind == NUM_ROWS and df.shape[0] != rule.expected:
+            violations.append(f"has {df.shape[0]} rows, expected {rule.expected}")
+        elif rule.kind == NUM_COLS and df.shape[1] != rule.expected:
+            violations.append(f"has {df.shape[1]} columns, expected {rule.expected}")
+        elif rule.kind == REQUIRED_COLUMNS:
+            missing_cols = [col for col in rule.expected if col not in df.columns]
+            if missing_cols:
+                violations.append(f"is missing the columns {missing_cols}")
+    return violations
+
+
+def get_column_violation_mask(df: pd.DataFrame, rule: ValidationRule) -> pd.Series:
+    """Returns the mask of the rows violating a column rule."""
+    values = df[rule.col]
+    if rule.kind == NOT_NULL:
+        mask = values.isna()
+    elif rule.kind == ALL_NULL:
+        mask = values.notna()
+    elif rule.kind == CONSTANT:
+        mask = values.ne(values.iloc[0]) if not values.empty else values.isna()
+    elif rule.kind == VALUE_IN:
+        mask = ~values.isin(list(rule.expected)) & values.notna()
+    elif rule.kind == VALUE_NOT_IN:
+        mask = values.isin(list(rule.expected))
+    elif rule.kind == VALUE_AT:
+        row_label, value = rule.expected
+        mask = pd.Series(False, index=df.index)
+        if row_label in df.index:
+            mask[row_label] = values[row_label] != value
+    else:
+        low, high = rule.expected
+        mask = ~values.between(low, high) & values.notna()
+    return mask.fillna(True).astype(bool)
+
+
+def get_violations(df: pd.DataFrame, rules: list[ValidationRule]) -> list[str]:
+    """Evaluates every rule against a table.
+
+    The column rules are evaluated into one boolean frame of violation masks
+    so the violations of every rule are counted in a single reduction.
+
+    Parameters
+    ----------
+    df
+        The table to validate.
+    rules
+        The rules to check.
+
+    Returns
+    -------
+    list[str]
+        A description of each rule which failed, empty if the table is valid.
+    """
+    for rule in rules:
+        if rule.kind not in TABLE_RULE_KINDS + COLUMN_RULE_KINDS:
+            raise ValueError(f"Unknown validation rule kind {rule.kind}!")
+    violations = get_table_violations(df, rules)
+
+    column_rules = [rule for rule in rules if rule.kind in COLUMN_RULE_KINDS]
+    missing_col_rules = [rule for rule in column_rules if rule.col not in df.columns]
+    for rule in missing_col_rules:
+        violations.append(f"has no column {rule.col!r} for its {rule.kind} rule")
+    for rule in column_rules:
+        if rule.kind == VALUE_AT and rule.expected[0] not in df.index:
+            violations.append(
+                f"has no row {rule.expected[0]!r} for its {rule.kind} rule"
+            )
+    checked_rules = [rule for rule in column_rules if rule not in missing_col_rules]
+    if not checked_rules:
+        return violations
+
+    violation_masks_df = pd.concat(
+        [get_column_violation_mask(df, rule) for rule in checked_rules],
+        axis=1,
+        keys=range(len(checked_rules)),
+    )
+    num_violating_rows = violation_masks_df.sum()
+    for rule_num, rule in enumerate(checked_rules):
+        if num_violating_rows[rule_num] == 0:
+            continue
+        violation_mask = violation_masks_df[rule_num]
+        example_rows = df.index[violation_mask][:NUM_EXAMPLE_ROWS].tolist()
+        expected = "" if rule.expected is None else f" {rule.expected}"
+        violations.append(
+            f"column {rule.col!r} fails {rule.kind}{expected} in "
+            f"{num_violating_rows[rule_num]} rows, e.g. rows {example_rows}"
+        )
+
+    return violations
+
+
+def load_validation_cache() -> dict[str, list[str]]:
+    """Loads the dict of file hash to the hashes of the rule sets that file
+    passed."""
+    cache_path = DIR_C.VALIDATION_CACHE_DIR / STAN_C.VALIDATION_CACHE_JSON
+    if not cache_path.exists():
+        return {}
+    with open(cache_path) as cache_file:
+        return json.load(cache_file)
+
+
+def save_validation_cache(validation_cache: dict[str, list[str]]) -> None:
+    """Saves the dict of file hash to the hashes of the rule sets that file
+    passed."""
+    DIR_C.VALIDATION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path = DIR_C.VALIDATION_CACHE_DIR / STAN_C.VALIDATION_CACHE_JSON
+    with util.atomic_write_path(cache_path) as temp_path, open(
+        temp_path, "w"
+    ) as cache_file:
+        json.dump(validation_cache, cache_file, indent=2, sort_keys=True)
+
+
+def validate_df(
+    df: pd.DataFrame,
+    rules: list[ValidationRule],
+    table_name: str,
+    source_file: Optional[pathlib.Path] = None,
+) -> None:
+    """Validates a table and raises with every violation if any rule fails.
+
+    Parameters
+    ----------
+    df
+        The table to validate.
+    rules
+        The rules to check.
+    table_name
+        Name of the table used in the error message.
+    source_file
+        Optional file the table was loaded from. If this file already passed
+        the same rule set validation is skipped, and a pass is cached.
+
+    Raises
+    ------
+    ValidationError
+        If any rule fails, listing every violation.
+    """
+    validation_key = None
+    if source_file is not None:
+        file_hash = util.get_file_hash(source_file)
+        rule_set_hash = get_rule_set_hash(rules)
+        validation_cache = load_validation_cache()
+        if rule_set_hash in validation_cache.get(file_hash, []):
+            return
+        validation_key = file_hash, rule_set_hash
+
+    violations = get_violations(df, rules)
+    if violations:
+        raise ValidationError(
+            f"{table_name} failed {len(violations)} validation rules:\n- "
+            + "\n- ".join(violations)
+        )
+
+    if validation_key is not None:
+        file_hash, rule_set_hash = validation_key
+        validation_cache = load_validation_cache()
+        validation_cache[file_hash] = sorted(
+            set(validation_cache.get(file_hash, [])) | {rule_set_hash}
+        )
+        save_validation_cache(validation_cache)
@@ -0,0 +1,92 @@
+""" Module for parsing date columns with declared formats.
+
+Calling pd.to_datetime without a format makes pandas guess the format of the
+strings one row at a time, even though a date column has only a few hundred
+distinct dates. This module parses each distinct string once, trying only the
+formats declared for the data source, and broadcasts the parsed dates back to
+every row. Values which are already dates (e.g. excel date cells) are kept as
+they are and values none of the formats match are reported instead of
+guessed at.
+"""
+
+# stdlib imports
+from typing import Sequence
+
+# 3rd party imports
+import pandas as pd
+import numpy as np
+
+
+def parse_dates(
+    date_col: pd.Series, date_formats: Sequence[str]
+) -> tuple[pd.Series, pd.Series]:
+    """Parses a column of dates with the declared formats.
+
+    Each distinct string, with leading and trailing whitespace stripped, is
+    parsed with the first of the formats it matches. Values which are
+    already dates are kept and blank values are left missing.
+
+    Parameters
+    ----------
+    date_col
+        Column of dates, date strings or a mix of both.
+    date_formats
+        The strftime formats the strings of the column can be in.
+
+    Returns
+    -------
+    tuple[pd.Series, pd.Series]
+        The dates (datetime64 dtype, NaT where blank or unparseable) and the
+        original values which could not be parsed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(date_col):
+        return date_col, date_col[[]]
+
+    dates = np.full(date_col.shape[0], np.datetime64("NaT"), dtype="datetime64[ns]")
+    if isinstance(date_col.dtype, pd.StringDtype):
+        date_str_mask = date_col.notna().to_numpy(dtype=bool)
+    else:
+        date_str_mask = date_col.map(lambda value: isinstance(value, str)).to_numpy(
+            dtype=bool
+        )
+    # dates from excel cells and the like
+    date_value_mask = ~date_str_mask & date_col.notna().to_numpy(dtype=bool)
+    dates[date_value_mask] = pd.to_datetime(date_col[date_value_mask]).to_numpy()
+
+    # strip the distinct strings rather than every row's
+    codes, unique_date_strs = pd.factorize(date_col[date_str_mask].to_numpy())
+    unique_date_strs = pd.Index(unique_date_strs, dtype=object).str.strip()
+    unique_dates = np.full(
+        unique_date_strs.shape[0], np.datetime64("NaT"), dtype="datetime64[ns]"
+    )
+    # blank strings are missing, not unparsed
+    blank_mask = unique_date_strs == ""
+    for date_format in date_formats:
+        to_parse_mask = np.isnat(unique_dates) & ~blank_mask
+        if not to_parse_mask.any():
+            break
+        unique_dates[to_parse_mask] = pd.to_datetime(
+            unique_date_strs[to_parse_mask], format=date_format, errors="coerce"
+        ).to_numpy()
+    dates[date_str_mask] = unique_dates[codes]
+
+    unparsed_mask = np.zeros(date_col.shape[0], dtype=bool)
+    unparsed_mask[date_str_mask] = (np.isnat(unique_dates) & ~blank_mask)[codes]
+    dates = pd.Series(dates, index=date_col.index, name=date_col.name)
+    unparsed = date_col[unparsed_mask]
+
+    return dates, unparsed
+
+
+def to_datetime(date_col: pd.Series, date_formats: Sequence[str]) -> pd.Series:
+    """Parses a column of dates with the declared formats, see parse_dates,
+    and raises a ValueError listing the values which could not be parsed."""
+    dates, unparsed = parse_dates(date_col, date_formats)
+    if not unparsed.empty:
+        raise ValueError(
+            f"Could not parse {unparsed.nunique()} distinct values of "
+            f"{date_col.name} with the formats {list(date_formats)}: "
+            f"{unparsed.unique().tolist()}"
+        )
+
+    return dates
@@ -83,3 +83,31 @@ CLEANED_AND_STANDARDIZED_FOIA_DATA_FOLDER = "foia_data"
 CLEANED_AND_STANDARDIZED_FOIA_DATA_DIR = CLEANED_AND_STANDARDIZED_DATA_DIR.joinpath(
     CLEANED_AND_STANDARDIZED_FOIA_DATA_FOLDER
 )
+
+# Cleaned and standardized partitioned data directory
+CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_FOLDER = "partitioned_data"
+CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR = (
+    CLEANED_AND_STANDARDIZED_DATA_DIR.joinpath(
+        CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_FOLDER
+    )
+)
+
+# Cleaned and standardized text search index directory
+CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_FOLDER = "text_search_index"
+CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_DIR = (
+    CLEANED_AND_STANDARDIZED_DATA_DIR.joinpath(
+        CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_FOLDER
+    )
+)
+
+# cache of the files which already passed validation
+VALIDATION_CACHE_FOLDER = ".validation_cache"
+VALIDATION_CACHE_DIR = REPO_DIR / VALIDATION_CACHE_FOLDER
+
+# snapshots of the hashes of the pipeline outputs compared by output_diff
+OUTPUT_SNAPSHOTS_FOLDER = ".output_snapshots"
+OUTPUT_SNAPSHOTS_DIR = REPO_DIR / OUTPUT_SNAPSHOTS_FOLDER
+
+# checkpoints of the completed units of interrupted pipeline runs
+CHECKPOINTS_FOLDER = ".checkpoints"
+CHECKPOINTS_DIR = REPO_DIR / CHECKPOINTS_FOLDER
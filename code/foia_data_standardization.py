@@ -0,0 +1,302 @@
+""" This module contains code to standarize and clean the csv formatted raw
+FOIA data. Specifically it standardizes
+- Column names
+- Case Numbers
+- Date columns to datetimes and payment amount and fee columns to numeric
+
+The seven FOIA tables are independent of each other so they are standardized
+in one batch with each table handled by a separate worker process. Each
+standardized table is checkpointed, so an interrupted run started again with
+--resume only standardizes the unfinished tables.
+"""
+
+# stdlib imports
+import re
+import argparse
+import concurrent.futures
+from typing import Any, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import raw_data_constants as RAW_C
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import case_number_standardization as case_num_parsing
+import money_parsing
+import date_parsing
+import aggregation_cube
+import data_validation
+import partitioned_dataset
+import payment_time_series
+import pipeline_checkpoints
+import record_ids
+import string_dictionary
+import text_search_index
+import util
+
+# standardized columns in the FOIA tables that should be typed on output
+FOIA_DATE_COLS = [
+    STAN_C.DATE_TO_COMPTROLLER_COL,
+    STAN_C.INCIDENT_DATE_COL,
+    STAN_C.DISPOSITION_DATE_COL,
+]
+FOIA_MONEY_COLS = [STAN_C.PAYMENT_AMOUNT_COL, STAN_C.FEES_AND_COSTS_COL]
+
+# pattern for docket numbers that list more than one case, e.g.
+# "2009 C 0001 / 11M1501481". These are treated as special case numbers.
+MULTIPLE_CASE_NUM_PAT = re.compile(r"\s/\s*\d")
+
+# name of the checkpoint stage of the standardized tables
+FOIA_STANDARDIZATION_CHECKPOINT_STAGE = "foia_data_standardization"
+
+# list of tuples with
+# (raw_csv, output_csv, data_source, data_year_col, rename_overrides)
+# where the data year of each row is the year of its data_year_col date
+FOIA_PROCESSING_LIST = [
+    (
+        RAW_C.RAW_CSV_FORMATTED_TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_CSV,
+        STAN_C.STANDARDIZED_TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_CSV,
+        STAN_C.TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_SOURCE,
+        STAN_C.DATE_TO_COMPTROLLER_COL,
+        {},
+    ),
+    (
+        RAW_C.RAW_CSV_FORMATTED_CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_CSV,
+        STAN_C.STANDARDIZED_CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_CSV,
+        STAN_C.CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_SOURCE,
+        STAN_C.DATE_TO_COMPTROLLER_COL,
+        {},
+    ),
+    (
+        RAW_C.RAW_CSV_FORMATTED_PENDING_POLICE_SUITS_FOTA_DATA_CSV,
+        STAN_C.STANDARDIZED_PENDING_POLICE_SUITS_FOTA_DATA_CSV,
+        STAN_C.PENDING_POLICE_SUITS_FOIA_DATA_SOURCE,
+        STAN_C.INCIDENT_DATE_COL,
+        {},
+    ),
+    (
+        RAW_C.RAW_CSV_FORMATTED_QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_CSV,
+        STAN_C.STANDARDIZED_QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_CSV,
+        STAN_C.QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_SOURCE,
+        STAN_C.DISPOSITION_DATE_COL,
+        {},
+    ),
+    (
+        RAW_C.RAW_CSV_FORMATTED_MATTER_DISP_REPORT_BY_DIVISION_FOIA_DATA_CSV,
+        STAN_C.STANDARDIZED_MATTER_DISP_REPORT_BY_DIVISION_FOIA_DATA_CSV,
+        STAN_C.MATTER_DISP_REPORT_BY_DIVISION_FOIA_DATA_SOURCE,
+        STAN_C.DISPOSITION_DATE_COL,
+        STAN_C.MATTER_DISP_REPORT_COL_STANDARDIZATION_RENAME_OVERRIDES,
+    ),
+    (
+        RAW_C.RAW_CSV_FORMATTED_MATTER_DISP_REPORT_BY_DEPARTMENT_FOIA_DATA_CSV,
+        STAN_C.STANDARDIZED_MATTER_DISP_REPORT_BY_DEPARTMENT_FOIA_DATA_CSV,
+        STAN_C.MATTER_DISP_REPORT_BY_DEPARTMENT_FOIA_DATA_SOURCE,
+        STAN_C.DISPOSITION_DATE_COL,
+        STAN_C.MATTER_DISP_REPORT_COL_STANDARDIZATION_RENAME_OVERRIDES,
+    ),
+    (
+        RAW_C.RAW_CSV_FORMATTED_MATTER_DISP_REPORT_BY_ASSIGNEE_FOIA_DATA_CSV,
+        STAN_C.STANDARDIZED_MATTER_DISP_REPORT_BY_ASSIGNEE_FOIA_DATA_CSV,
+        STAN_C.MATTER_DISP_REPORT_BY_ASSIGNEE_FOIA_DATA_SOURCE,
+        STAN_C.DISPOSITION_DATE_COL,
+        {},
+    ),
+]
+
+
+def standardize_foia_data(
+    raw_csv: str,
+    output_csv: str,
+    data_source: str,
+    data_year_col: str,
+    rename_overrides: Optional[dict[str, str]] = None,
+) -> tuple[
+    int, list[dict[str, Any]], pd.DataFrame, pd.DataFrame, pd.DataFrame, set[str]
+]:
+    """Cleans, standardizes and saves a single csv formatted FOIA table.
+
+    The table is saved both as a single csv and as partitions of the
+    partitioned dataset, and its aggregation cube cells, monthly payment
+    series cells, text search postings and the strings it adds to the string
+    dictionary are returned.
+
+    Parameters
+    ----------
+    raw_csv
+        Name of the csv formatted raw FOIA file to standardize.
+    output_csv
+        Name of the file to save the standardized data as.
+    data_source
+        Value to put in the data source column for every row.
+    data_year_col
+        Standardized date column whose year is used as the data year.
+    rename_overrides
+        Optional column renames which take precedence over the shared
+        rename dict for this table only.
+
+    Returns
+    -------
+    tuple[int, list, pd.DataFrame, pd.DataFrame, pd.DataFrame, set[str]]
+        The number of rows saved, the metadata entries of the partitions
+        saved, the table's aggregation cube cells, its monthly payment series
+        cells, the postings of its text columns and the distinct strings of
+        its dictionary encoded columns.
+    """
+    rename_dict = {
+        **STAN_C.LAW_WEBSITE_DATA_COL_STANDARDIZATION_RENAME_DICT,
+        **(rename_overrides or {}),
+    }
+    raw_df = util.load_df(
+        file_name=raw_csv,
+        save_dir=DIR_C.RAW_CSV_FORMATTED_FOIA_DATA_DIR,
+    )
+    assert raw_df.columns.isin(
+        rename_dict.keys()
+    ).all(), f"Not all keys in {raw_csv} are in the rename dict!"
+    # rename
+    standardized_df = raw_df.rename(columns=rename_dict)
+    assert (
+        not standardized_df.columns.duplicated().any()
+    ), f"Renaming {raw_csv} results in duplicate column names!"
+    # standardize case number and extract relevant info
+    multiple_case_num_mask = (
+        standardized_df[STAN_C.RAW_CASE_NUM_COL]
+        .str.contains(MULTIPLE_CASE_NUM_PAT)
+        .fillna(False)
+    )
+    standardized_df = case_num_parsing.standardize_case_num_info(
+        standardized_df,
+        special_rows=standardized_df.index[multiple_case_num_mask].tolist(),
+    )
+    # type the date and money columns, money as integer cents. The payment
+    # tables have a few fees with fractions of a cent (e.g. 0.009), which are
+    # rounded to the nearest cent
+    for date_col in standardized_df.columns.intersection(FOIA_DATE_COLS):
+        standardized_df[date_col] = date_parsing.to_datetime(
+            standardized_df[date_col], STAN_C.CSV_DATE_FORMATS
+        )
+    for money_col in standardized_df.columns.intersection(FOIA_MONEY_COLS):
+        standardized_df[money_col] = money_parsing.to_cents(
+            standardized_df[money_col], round_fractions=True
+        )
+    # add data source
+    standardized_df[STAN_C.DATA_SOURCE_COL] = data_source
+    standardized_df[STAN_C.DATA_YEAR_COL] = standardized_df[
+        data_year_col
+    ].dt.year.astype("Int64")
+    standardized_df = record_ids.add_record_ids(standardized_df, data_source)
+    data_validation.validate_df(
+        standardized_df,
+        rules=data_validation.get_standardized_data_rules(standardized_df.columns),
+        table_name=f"standardized {raw_csv}",
+    )
+    # save output
+    util.save_df(
+        df=standardized_df,
+        file_name=output_csv,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_FOIA_DATA_DIR,
+    )
+    partition_entries = partitioned_dataset.save_partitions(standardized_df)
+
+    cube_cells_df = aggregation_cube.get_cube_cells(standardized_df)
+    monthly_cells_df = payment_time_series.get_monthly_cells(standardized_df)
+    postings_df = text_search_index.get_postings(standardized_df)
+    distinct_strings = string_dictionary.get_distinct_strings(standardized_df)
+
+    return (
+        standardized_df.shape[0],
+        partition_entries,
+        cube_cells_df,
+        monthly_cells_df,
+        postings_df,
+        distinct_strings,
+    )
+
+
+def clean_and_standardize_all_foia_data(
+    max_workers: Optional[int] = None, resume: bool = False
+) -> None:
+    """Cleans, standardizes, and saves every FOIA table in parallel.
+
+    Each table is checkpointed once it is standardized. If a table fails the
+    other tables still finish and are checkpointed before the error is
+    raised, so a resumed run only standardizes the tables left.
+
+    Parameters
+    ----------
+    max_workers
+        Maximum number of worker processes. Defaults to one per CPU.
+    resume
+        If True the tables an interrupted run already standardized are
+        loaded from its checkpoint instead.
+    """
+    DIR_C.CLEANED_AND_STANDARDIZED_FOIA_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    checkpoint = pipeline_checkpoints.PipelineCheckpoint(
+        FOIA_STANDARDIZATION_CHECKPOINT_STAGE, resume
+    )
+    # dict of output csv to the result of standardizing its table
+    table_results = {
+        processing_args[1]: checkpoint.load_result(processing_args[1])
+        for processing_args in FOIA_PROCESSING_LIST
+        if checkpoint.is_completed(processing_args[1])
+    }
+    failed_futures = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        future_to_csv = {
+            executor.submit(standardize_foia_data, *processing_args): processing_args[1]
+            for processing_args in FOIA_PROCESSING_LIST
+            if processing_args[1] not in table_results
+        }
+        for future in concurrent.futures.as_completed(future_to_csv):
+            output_csv = future_to_csv[future]
+            if future.exception() is not None:
+                failed_futures.append(future)
+                continue
+            table_results[output_csv] = future.result()
+            checkpoint.complete(output_csv, table_results[output_csv])
+            print(f"Saved {table_results[output_csv][0]} rows to {output_csv}")
+    if failed_futures:
+        failed_futures[0].result()
+
+    partition_entries = []
+    cube_cells_dfs = []
+    monthly_cells_dfs = []
+    postings_dfs = []
+    distinct_strings = set()
+    for processing_args in FOIA_PROCESSING_LIST:
+        (
+            _,
+            table_partition_entries,
+            cube_cells_df,
+            monthly_cells_df,
+            postings_df,
+            table_distinct_strings,
+        ) = table_results[processing_args[1]]
+        partition_entries += table_partition_entries
+        cube_cells_dfs.append(cube_cells_df)
+        monthly_cells_dfs.append(monthly_cells_df)
+        postings_dfs.append(postings_df)
+        distinct_strings |= table_distinct_strings
+
+    # only the parent process writes the partition metadata, the cube, the
+    # monthly payment series, the text search index and the string dictionary
+    partitioned_dataset.update_partition_metadata(partition_entries)
+    aggregation_cube.update_aggregation_cube(pd.concat(cube_cells_dfs))
+    payment_time_series.update_monthly_cells(pd.concat(monthly_cells_dfs))
+    text_search_index.update_text_search_index(pd.concat(postings_dfs))
+    string_dictionary.update_string_dictionary(distinct_strings)
+    checkpoint.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip the tables an interrupted run already standardized",
+    )
+    args = parser.parse_args()
+    clean_and_standardize_all_foia_data(resume=args.resume)
@@ -7,7 +7,26 @@ law department website data accross all years. Specifically it standardizes
 The standardized version of the data can be appended together accross any
 year. Note that this data is all lawsuits filed against the City, not just
 those involving the Chicago police.
+
+When only some years' raw data changed the incremental mode re-standardizes
+just those years and patches their rows into the all years csv. The years are
+independent so with --workers they are standardized in separate processes.
+
+The fused mode (--fused) processes each year's unmodified raw data and passes
+the dataframe straight into standardization instead of re-reading it from the
+csv formatted raw data. The csv formatted raw data is still written, in the
+background, unless --skip-raw-csv is given.
+
+Each standardized year is checkpointed, so an interrupted run started again
+with --resume and the same arguments only standardizes the unfinished years.
 """
+# stdlib imports
+import json
+import argparse
+import functools
+import concurrent.futures
+from typing import Any, Iterable, Iterator, Optional
+
 # 3rd party imports
 import pandas as pd
 
@@ -16,125 +35,564 @@ import raw_data_constants as RAW_C
 import directory_constants as DIR_C
 import data_standardization_constants as STAN_C
 import case_number_standardization as case_num_parsing
+import money_parsing
+import aggregation_cube
+import data_validation
+import partitioned_dataset
+import payment_time_series
+import pipeline_checkpoints
+import raw_law_website_data_processing
+import record_ids
+import string_dictionary
+import text_search_index
 import util
 
+# dict of data year to its csv formatted raw data
+LAW_WEBSITE_PROCESSING_DICT = {
+    2008: RAW_C.RAW_CSV_FORMATTED_2008_LAW_WEBSITE_DATA_CSV,
+    2009: RAW_C.RAW_CSV_FORMATTED_2009_LAW_WEBSITE_DATA_CSV,
+    2010: RAW_C.RAW_CSV_FORMATTED_2010_LAW_WEBSITE_DATA_CSV,
+    2011: RAW_C.RAW_CSV_FORMATTED_2011_LAW_WEBSITE_DATA_CSV,
+    2012: RAW_C.RAW_CSV_FORMATTED_2012_LAW_WEBSITE_DATA_CSV,
+    2013: RAW_C.RAW_CSV_FORMATTED_2013_LAW_WEBSITE_DATA_CSV,
+    2014: RAW_C.RAW_CSV_FORMATTED_2014_LAW_WEBSITE_DATA_CSV,
+    2015: RAW_C.RAW_CSV_FORMATTED_2015_LAW_WEBSITE_DATA_CSV,
+    2016: RAW_C.RAW_CSV_FORMATTED_2016_LAW_WEBSITE_DATA_CSV,
+    2017: RAW_C.RAW_CSV_FORMATTED_2017_LAW_WEBSITE_DATA_CSV,
+    2018: RAW_C.RAW_CSV_FORMATTED_2018_LAW_WEBSITE_DATA_CSV,
+    2019: RAW_C.RAW_CSV_FORMATTED_2019_LAW_WEBSITE_DATA_CSV,
+    2020: RAW_C.RAW_CSV_FORMATTED_2020_LAW_WEBSITE_DATA_CSV,
+    2021: RAW_C.RAW_CSV_FORMATTED_2021_LAW_WEBSITE_DATA_CSV,
+}
 
-def clean_and_standardize_all_data() -> None:
-    """Cleans, standardizes, and saves Law Website data from each year.
+# name of the checkpoint stage of the standardized years
+LAW_WEBSITE_STANDARDIZATION_CHECKPOINT_STAGE = "law_website_data_standardization"
 
-    Cleans, standardizes and saves the Law Website data for each year.
-    It also saves a single file with all the years combined into one."""
-    # list of tuples with (raw_csv, output_csv)
-    processing_list = [
-        (
-            RAW_C.RAW_CSV_FORMATTED_2008_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2008_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2009_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2009_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2010_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2010_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2011_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2011_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2012_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2012_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2013_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2013_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2014_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2014_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2015_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2015_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2016_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2016_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2017_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2017_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2018_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2018_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2019_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2019_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2020_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2020_LAW_WEBSITE_DATA_CSV,
-        ),
-        (
-            RAW_C.RAW_CSV_FORMATTED_2021_LAW_WEBSITE_DATA_CSV,
-            STAN_C.STANDARDIZED_2021_LAW_WEBSITE_DATA_CSV,
-        ),
-    ]
 
-    rename_dict = STAN_C.LAW_WEBSITE_DATA_COL_STANDARDIZATION_RENAME_DICT
-    output_dfs = []
+def load_raw_law_website_data(
+    data_year: int, fused: bool, save_raw_csv: bool
+) -> tuple[pd.DataFrame, Optional[concurrent.futures.Future]]:
+    """Loads the csv formatted raw data of a year, or processes it from the
+    unmodified raw data in fused mode.
 
-    doc_yr = 2008
-    for raw_csv, output_csv in processing_list:
+    Parameters
+    ----------
+    data_year
+        The year of the Law Website data to load.
+    fused
+        If True the year is processed from the unmodified raw data and the
+        dataframe is given the values and dtypes it would have if it was
+        loaded from the csv formatted raw data, without the csv round trip.
+    save_raw_csv
+        In fused mode, whether to still save the csv formatted raw data. It
+        is saved in a background thread so the year can be standardized
+        while it is written.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, Optional[concurrent.futures.Future]]
+        The raw dataframe and the future of the csv write if one was started.
+    """
+    raw_csv = LAW_WEBSITE_PROCESSING_DICT[data_year]
+    if not fused:
         raw_df = util.load_df(
             file_name=raw_csv,
             save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
         )
-        assert raw_df.columns.isin(
-            rename_dict.keys()
-        ).all(), f"Not all keys in {raw_csv} are in the rename dict!"
-        # rename
-        standardized_df = raw_df.rename(columns=rename_dict)
-        # standardize case number and extract relevant info
-        standardized_df = case_num_parsing.standardize_case_num_info(standardized_df)
-        # remove 0931 from department name (included one year for some reason)
-        standardized_df[STAN_C.CITY_DEPARTMENT_INVOLVED_COL] = standardized_df[
-            STAN_C.CITY_DEPARTMENT_INVOLVED_COL
-        ].str.rstrip(" 0931")
-        # if any numeric columns not numeric then fix them
-        already_numeric_cols = standardized_df.select_dtypes("number").columns
-        # remove and dollar signs or commas from payment column
-        for money_col in [STAN_C.PAYMENT_AMOUNT_COL, STAN_C.FEES_AND_COSTS_COL]:
-            # skip if already numberic
-            if money_col in already_numeric_cols:
-                continue
-
-            standardized_df[money_col] = pd.to_numeric(
-                standardized_df[money_col].str.replace(
-                    pat=r"[\,\$\s]+", repl="", regex=True
-                )
+        return raw_df, None
+
+    process_law_website_data = (
+        raw_law_website_data_processing.LAW_WEBSITE_PROCESSING_FUNCS[data_year]
+    )
+    raw_df = process_law_website_data(save_csv=False)
+    raw_csv_write = None
+    if save_raw_csv:
+        csv_writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        raw_csv_write = csv_writer.submit(
+            util.save_df,
+            df=raw_df,
+            file_name=raw_csv,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
+        # the write still finishes, shutting down only stops new ones
+        csv_writer.shutdown(wait=False)
+
+    return util.get_csv_round_trip_df(raw_df), raw_csv_write
+
+
+def standardize_law_website_data(
+    data_year: int,
+    fused: bool = False,
+    save_raw_csv: bool = True,
+) -> tuple[pd.DataFrame, list[dict[str, Any]]]:
+    """Cleans, standardizes and saves the Law Website data for a single year.
+
+    The standardized year is saved as a partition of the partitioned dataset,
+    which is where a single year's standardized data is loaded from.
+
+    Parameters
+    ----------
+    data_year
+        The year of the Law Website data to standardize.
+    fused
+        If True the year is processed from the unmodified raw data and
+        standardized in memory, see load_raw_law_website_data.
+    save_raw_csv
+        In fused mode, whether to still save the csv formatted raw data.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, list[dict[str, Any]]]
+        The standardized dataframe and the metadata entries of the partitions
+        saved.
+    """
+    raw_csv = LAW_WEBSITE_PROCESSING_DICT[data_year]
+    rename_dict = STAN_C.LAW_WEBSITE_DATA_COL_STANDARDIZATION_RENAME_DICT
+
+    raw_df, raw_csv_write = load_raw_law_website_data(data_year, fused, save_raw_csv)
+    assert raw_df.columns.isin(
+        rename_dict.keys()
+    ).all(), f"Not all keys in {raw_csv} are in the rename dict!"
+    # rename
+    standardized_df = raw_df.rename(columns=rename_dict)
+    # standardize case number and extract relevant info
+    standardized_df = case_num_parsing.standardize_case_num_info(standardized_df)
+    # remove 0931 from department name (included one year for some reason)
+    standardized_df[STAN_C.CITY_DEPARTMENT_INVOLVED_COL] = standardized_df[
+        STAN_C.CITY_DEPARTMENT_INVOLVED_COL
+    ].str.rstrip(" 0931")
+    # convert the money columns to integer cents, parsing dollar signs,
+    # commas etc. out of those which aren't numeric. A few amounts have
+    # fractions of a cent (e.g. 3800.043 in 2013), which are rounded to the
+    # nearest cent
+    for money_col in [STAN_C.PAYMENT_AMOUNT_COL, STAN_C.FEES_AND_COSTS_COL]:
+        standardized_df[money_col] = money_parsing.to_cents(
+            standardized_df[money_col], round_fractions=True
+        )
+    # add data source
+    data_source = f"law_dept_website_{data_year}"
+    standardized_df[STAN_C.DATA_SOURCE_COL] = data_source
+    standardized_df[STAN_C.DATA_YEAR_COL] = data_year
+    standardized_df = record_ids.add_record_ids(standardized_df, data_source)
+    data_validation.validate_df(
+        standardized_df,
+        rules=data_validation.get_standardized_data_rules(standardized_df.columns),
+        table_name=f"standardized {data_year} law website data",
+    )
+    # save output
+    partition_entries = partitioned_dataset.save_partitions(standardized_df)
+    # wait for the raw csv to be written, raising any error from writing it
+    if raw_csv_write is not None:
+        raw_csv_write.result()
+
+    return standardized_df, partition_entries
+
+
+def render_csv_chunk(df: pd.DataFrame, columns: list[str]) -> bytes:
+    """Renders the rows of a dataframe as csv bytes with the given columns.
+
+    Columns the dataframe does not have are left empty. Rendering every year
+    with the same columns lets the years be written one after the other into
+    the all years csv and lets a single year be spliced back in later.
+
+    Parameters
+    ----------
+    df
+        The dataframe to render.
+    columns
+        The columns of the all years csv in order.
+
+    Returns
+    -------
+    bytes
+        The utf-8 encoded csv rows without a header.
+    """
+    return (
+        df.reindex(columns=columns)
+        .to_csv(index=False, header=False, lineterminator="\n")
+        .encode("utf-8")
+    )
+
+
+def load_all_years_index() -> dict[str, Any]:
+    """Loads the index of the all years csv.
+
+    The index has the all years csv column names and, for each year, the
+    hash of the raw csv it was standardized from and the byte offsets of the
+    year's rows in the all years csv.
+
+    Returns
+    -------
+    dict[str, Any]
+        The index, or an empty dict if there is no index yet.
+    """
+    index_path = DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR.joinpath(
+        STAN_C.STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_INDEX_JSON
+    )
+    if not index_path.exists():
+        return {}
+    with open(index_path) as index_file:
+        return json.load(index_file)
+
+
+def save_all_years_index(all_years_index: dict[str, Any]) -> None:
+    """Saves the index of the all years csv.
+
+    Parameters
+    ----------
+    all_years_index
+        The index to save, see load_all_years_index.
+    """
+    index_path = DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR.joinpath(
+        STAN_C.STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_INDEX_JSON
+    )
+    with util.atomic_write_path(index_path) as temp_path, open(
+        temp_path, "w"
+    ) as index_file:
+        json.dump(all_years_index, index_file, indent=2)
+
+
+def get_raw_csv_hash(data_year: int) -> str:
+    """Returns the hash of the csv formatted raw data for a year."""
+    raw_csv = LAW_WEBSITE_PROCESSING_DICT[data_year]
+    return util.get_file_hash(DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR / raw_csv)
+
+
+def save_all_years_data(
+    standardized_dfs: dict[int, pd.DataFrame], raw_csvs_saved: bool = True
+) -> None:
+    """Saves every year into the all years csv and rebuilds its index.
+
+    Parameters
+    ----------
+    standardized_dfs
+        Dict of data year to that year's standardized dataframe.
+    raw_csvs_saved
+        Whether the csv formatted raw data is what the years were
+        standardized from. If not, no raw csv hashes are recorded so the
+        next incremental run standardizes every year again.
+    """
+    # same column order pd.concat would give
+    all_years_cols = list(
+        dict.fromkeys(
+            col
+            for data_year in sorted(standardized_dfs)
+            for col in standardized_dfs[data_year].columns
+        )
+    )
+    all_years_index = {"columns": all_years_cols, "years": {}}
+    all_years_path = DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR.joinpath(
+        STAN_C.STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_CSV
+    )
+    with util.atomic_write_path(all_years_path) as temp_path, open(
+        temp_path, "wb"
+    ) as all_years_file:
+        all_years_file.write(
+            pd.DataFrame(columns=all_years_cols)
+            .to_csv(index=False, lineterminator="\n")
+            .encode("utf-8")
+        )
+        for data_year in sorted(standardized_dfs):
+            start = all_years_file.tell()
+            all_years_file.write(
+                render_csv_chunk(standardized_dfs[data_year], all_years_cols)
             )
-        # add data source
-        standardized_df[STAN_C.DATA_SOURCE_COL] = f"law_dept_website_{doc_yr}"
-        doc_yr += 1
-        # save output
-        util.save_df(
-            df=standardized_df,
-            file_name=output_csv,
-            save_dir=DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR,
+            all_years_index["years"][str(data_year)] = {
+                "raw_csv_hash": (
+                    get_raw_csv_hash(data_year) if raw_csvs_saved else None
+                ),
+                "start": start,
+                "end": all_years_file.tell(),
+            }
+
+    save_all_years_index(all_years_index)
+
+
+def patch_all_years_data(
+    standardized_dfs: dict[int, pd.DataFrame],
+    all_years_index: dict[str, Any],
+) -> None:
+    """Replaces the rows of the given years in the all years csv.
+
+    Uses the byte offsets in the index to copy the unchanged years' rows
+    as is, so only the given years are rendered again.
+
+    Parameters
+    ----------
+    standardized_dfs
+        Dict of data year to that year's newly standardized dataframe. Every
+        year must already be in the index and only use its columns.
+    all_years_index
+        The index of the current all years csv. Updated in place and saved.
+    """
+    all_years_path = DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR.joinpath(
+        STAN_C.STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_CSV
+    )
+    year_entries = all_years_index["years"]
+    with util.atomic_write_path(all_years_path) as temp_path, open(
+        all_years_path, "rb"
+    ) as old_file, open(temp_path, "wb") as new_file:
+        # copy the header
+        new_file.write(
+            old_file.read(min(entry["start"] for entry in year_entries.values()))
         )
-        output_dfs.append(standardized_df)
+        for data_year_str in sorted(year_entries, key=int):
+            entry = year_entries[data_year_str]
+            start = new_file.tell()
+            if int(data_year_str) in standardized_dfs:
+                new_file.write(
+                    render_csv_chunk(
+                        standardized_dfs[int(data_year_str)],
+                        all_years_index["columns"],
+                    )
+                )
+                entry["raw_csv_hash"] = get_raw_csv_hash(int(data_year_str))
+            else:
+                old_file.seek(entry["start"])
+                new_file.write(old_file.read(entry["end"] - entry["start"]))
+            entry["start"], entry["end"] = start, new_file.tell()
+
+    save_all_years_index(all_years_index)
+
+
+def standardize_years(
+    data_years: list[int],
+    max_workers: int,
+    fused: bool = False,
+    save_raw_csv: bool = True,
+) -> Iterator[tuple[int, pd.DataFrame, list[dict[str, Any]]]]:
+    """Standardizes the given years and yields the results in year order.
 
-    all_yrs_output_df = pd.concat(output_dfs)
-    util.save_df(
-        df=all_yrs_output_df,
-        file_name=STAN_C.STANDARDIZED_ALL_YEARS_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_LAW_WEBSITE_DATA_DIR,
+    Parameters
+    ----------
+    data_years
+        The sorted years to standardize.
+    max_workers
+        Number of worker processes standardizing years at once. With 1 the
+        years are standardized one at a time in this process.
+    fused
+        If True the years are processed from the unmodified raw data and
+        standardized in memory.
+    save_raw_csv
+        In fused mode, whether to still save the csv formatted raw data.
+
+    Yields
+    ------
+    tuple[int, pd.DataFrame, list[dict[str, Any]]]
+        The year, its standardized dataframe and the metadata entries of its
+        partitions.
+    """
+    standardize_year = functools.partial(
+        standardize_law_website_data, fused=fused, save_raw_csv=save_raw_csv
     )
+    if max_workers == 1:
+        for data_year in data_years:
+            yield (data_year, *standardize_year(data_year))
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # map hands back the results in the order of the years even though
+        # later years can finish first
+        for data_year, (standardized_df, partition_entries) in zip(
+            data_years, executor.map(standardize_year, data_years)
+        ):
+            yield data_year, standardized_df, partition_entries
+
+
+def clean_and_standardize_all_data(
+    data_years: Optional[Iterable[int]] = None,
+    incremental: bool = False,
+    max_workers: int = 1,
+    fused: bool = False,
+    save_raw_csv: bool = True,
+    resume: bool = False,
+) -> None:
+    """Cleans, standardizes, and saves Law Website data from each year.
+
+    Cleans and standardizes the Law Website data for each year and saves
+    each year as a partition of the partitioned dataset. It also saves a
+    single file with all the years combined into one. Finally the
+    aggregation cube cells, monthly payment series cells and text search
+    postings of the standardized years are refreshed and their strings are
+    added to the string dictionary.
+
+    Parameters
+    ----------
+    data_years
+        Years to standardize in incremental mode. Defaults to the years whose
+        csv formatted raw data changed since the last run. Every year is
+        standardized when not in incremental mode, since the all years csv is
+        rebuilt from scratch.
+    incremental
+        If True only the selected years are standardized and their rows are
+        patched into the existing all years csv instead of rebuilding it.
+    max_workers
+        Number of worker processes standardizing years at once. The years
+        are independent so the output is the same for any number of workers.
+    fused
+        If True each year is processed from the unmodified raw data and
+        standardized in memory instead of being loaded from the csv
+        formatted raw data. Can not be combined with incremental, which
+        finds the changed years from the csv formatted raw data.
+    save_raw_csv
+        In fused mode, whether to still save the csv formatted raw data.
+    resume
+        If True the years an interrupted run with the same arguments already
+        standardized are loaded from its checkpoint instead.
+    """
+    if fused and incremental:
+        raise ValueError("The fused mode can not be run incrementally")
+    if data_years is not None and not incremental:
+        raise ValueError("Years can only be selected in incremental mode")
+
+    all_years_index = load_all_years_index() if incremental else {}
+    if incremental and not all_years_index:
+        print("No all years index found, standardizing every year")
+        incremental = False
+        data_years = None
+
+    if data_years is None and incremental:
+        data_years = [
+            data_year
+            for data_year in LAW_WEBSITE_PROCESSING_DICT
+            if all_years_index["years"].get(str(data_year), {}).get("raw_csv_hash")
+            != get_raw_csv_hash(data_year)
+        ]
+    elif data_years is None:
+        data_years = LAW_WEBSITE_PROCESSING_DICT.keys()
+
+    if not data_years:
+        print("No years changed, nothing to standardize")
+        return
+
+    data_years = sorted(data_years)
+    checkpoint = pipeline_checkpoints.PipelineCheckpoint(
+        LAW_WEBSITE_STANDARDIZATION_CHECKPOINT_STAGE,
+        resume,
+        run_args={
+            "data_years": data_years,
+            "incremental": incremental,
+            "fused": fused,
+            "save_raw_csv": save_raw_csv,
+        },
+    )
+    year_results = {
+        data_year: checkpoint.load_result(data_year)
+        for data_year in data_years
+        if checkpoint.is_completed(data_year)
+    }
+    for data_year, standardized_df, year_partition_entries in standardize_years(
+        [data_year for data_year in data_years if data_year not in year_results],
+        max_workers,
+        fused,
+        save_raw_csv,
+    ):
+        year_results[data_year] = (standardized_df, year_partition_entries)
+        checkpoint.complete(data_year, year_results[data_year])
+
+    standardized_dfs = {}
+    partition_entries = []
+    for data_year in data_years:
+        standardized_dfs[data_year], year_partition_entries = year_results[data_year]
+        partition_entries += year_partition_entries
+
+    if incremental:
+        # patching only works if every year is already in the all years
+        # csv and no new columns showed up
+        can_patch = all(
+            str(data_year) in all_years_index["years"]
+            and standardized_df.columns.isin(all_years_index["columns"]).all()
+            for data_year, standardized_df in standardized_dfs.items()
+        )
+        if can_patch:
+            patch_all_years_data(standardized_dfs, all_years_index)
+        else:
+            print("Changed years can not be patched, standardizing every year")
+            clean_and_standardize_all_data(
+                max_workers=max_workers, save_raw_csv=save_raw_csv, resume=resume
+            )
+            return
+    else:
+        save_all_years_data(standardized_dfs, raw_csvs_saved=not fused or save_raw_csv)
+
+    partitioned_dataset.update_partition_metadata(partition_entries)
+    aggregation_cube.update_aggregation_cube(
+        pd.concat(
+            aggregation_cube.get_cube_cells(standardized_df)
+            for standardized_df in standardized_dfs.values()
+        )
+    )
+    payment_time_series.update_monthly_cells(
+        pd.concat(
+            payment_time_series.get_monthly_cells(standardized_df)
+            for standardized_df in standardized_dfs.values()
+        )
+    )
+    text_search_index.update_text_search_index(
+        pd.concat(
+            text_search_index.get_postings(standardized_df)
+            for standardized_df in standardized_dfs.values()
+        )
+    )
+    string_dictionary.update_string_dictionary(
+        set().union(
+            *(
+                string_dictionary.get_distinct_strings(standardized_df)
+                for standardized_df in standardized_dfs.values()
+            )
+        )
+    )
+    checkpoint.clear()
 
 
 if __name__ == "__main__":
-    clean_and_standardize_all_data()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only standardize years whose raw data changed and patch them "
+        "into the existing all years csv",
+    )
+    parser.add_argument(
+        "--years",
+        nargs="+",
+        type=int,
+        choices=LAW_WEBSITE_PROCESSING_DICT.keys(),
+        help="years to standardize in incremental mode",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes standardizing years at once",
+    )
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="process the unmodified raw data and standardize it in memory "
+        "instead of re-reading the csv formatted raw data",
+    )
+    parser.add_argument(
+        "--skip-raw-csv",
+        action="store_true",
+        help="in fused mode, don't save the csv formatted raw data",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip the years an interrupted run with the same arguments "
+        "already standardized",
+    )
+    args = parser.parse_args()
+    if args.fused and args.incremental:
+        parser.error("--fused can not be combined with --incremental")
+    if args.years and not args.incremental:
+        parser.error("--years can only be used with --incremental")
+    clean_and_standardize_all_data(
+        data_years=args.years,
+        incremental=args.incremental,
+        max_workers=args.workers,
+        fused=args.fused,
+        save_raw_csv=not args.skip_raw_csv,
+        resume=args.resume,
+    )
@@ -0,0 +1,195 @@
+""" Module for parsing money strings into exact integer cent amounts.
+
+The raw data writes money in many ways: with dollar signs and thousands
+separators ("$2,499.15"), as parenthesized negatives ("(2,374)"), with stray
+characters picked up by the PDF table extraction ("A \\n5,694") and as the
+word NONE for no payment. This module parses all of them with a single
+compiled pattern applied to a whole column at once. Strings are parsed
+exactly, without going through a float, and numbers are converted through
+the decimal they print as, so 1.005 and "1.005" are the same amount. Amounts
+which aren't a whole number of cents are reported as unparsed unless the
+caller asks for them to be rounded, half away from zero.
+
+The standardized money columns are kept in integer cents (CENTS_DTYPE) so
+sums over any number of rows and years are exact and use integer arithmetic.
+Amounts are only converted to dollars for display, with cents_to_dollars.
+"""
+
+# stdlib imports
+import re
+import decimal
+import numbers
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+
+# values which mean no money was paid
+ZERO_MONEY_VALUES = ["NONE"]
+# dtype of integer cent amounts, nullable so blank amounts stay missing
+CENTS_DTYPE = "Int64"
+# one cent as a decimal number of dollars
+DECIMAL_CENT = decimal.Decimal("0.01")
+
+# pattern to match a money string
+MONEY_PAT = re.compile(
+    r"""^\s* # leading whitespace to ignore
+    (?:[A-Z]\s+)? # stray letter picked up from the PDF, e.g. "A \n5,694"
+    (?P<open_paren>\()?\s* # an opening parenthesis denotes a negative
+    (?P<minus>-)?\s* # as does a minus sign
+    \$?\s* # optional dollar sign
+    (?P<dollars>\d{1,3}(?:,\s*\d{3})+|\d+)? # whole dollars, optional separators
+    (?:\.(?P<cents>\d{1,2})(?P<fraction>\d*))? # optional cents and fraction of a cent
+    \s*(?P<close_paren>\))? # closing parenthesis
+    \s*$ # trailing whitespace to ignore
+    """,
+    flags=re.VERBOSE,
+)
+
+
+def get_decimal_cents(amount: float) -> tuple[int, bool]:
+    """Converts a finite dollar amount into cents through the decimal it
+    prints as, returning the cents rounded half away from zero and whether
+    the amount was a whole number of cents."""
+    decimal_amount = decimal.Decimal(repr(float(amount)))
+    rounded_amount = decimal_amount.quantize(DECIMAL_CENT, decimal.ROUND_HALF_UP)
+    return int(rounded_amount / DECIMAL_CENT), rounded_amount == decimal_amount
+
+
+def get_number_cents(
+    amounts: pd.Series, round_fractions: bool = False
+) -> tuple[pd.Series, pd.Index]:
+    """Converts numeric dollar amounts into cents.
+
+    Each distinct amount is converted once with get_decimal_cents, so a
+    number is rounded the same way as the string it prints as.
+
+    Parameters
+    ----------
+    amounts
+        Column of numeric dollar amounts.
+    round_fractions
+        If True amounts with fractions of a cent are rounded half away from
+        zero to the nearest cent instead of being unparseable.
+
+    Returns
+    -------
+    tuple[pd.Series, pd.Index]
+        The amounts in float cents, missing where missing or unparseable, and
+        the index of the amounts which aren't finite or have fractions of a
+        cent.
+    """
+    amounts = amounts.astype("float64")
+    finite_mask = pd.Series(np.isfinite(amounts), index=amounts.index)
+    decimal_cents = {
+        amount: get_decimal_cents(amount) for amount in amounts[finite_mask].unique()
+    }
+    cents = amounts[finite_mask].map(lambda amount: decimal_cents[amount][0])
+    exact_mask = amounts[finite_mask].map(lambda amount: decimal_cents[amount][1])
+    parsed_mask = amounts.isna() | (
+        finite_mask
+        & (round_fractions | exact_mask.reindex(amounts.index, fill_value=False))
+    )
+    return (
+        cents.reindex(amounts.index).astype("float64").where(parsed_mask),
+        amounts.index[~parsed_mask],
+    )
+
+
+def parse_money(
+    money_col: pd.Series, round_fractions: bool = False
+) -> tuple[pd.Series, pd.Series]:
+    """Parses a column of money values into integer cents.
+
+    Values which are already numbers are converted directly and every string
+    is parsed with MONEY_PAT, so "1.234" is unparsed like "$1.234" is and
+    "1.005" isn't rounded through a float. Blank values are left missing and
+    the values in ZERO_MONEY_VALUES become 0.
+
+    Parameters
+    ----------
+    money_col
+        Column of money values, either numeric or strings.
+    round_fractions
+        If True amounts with fractions of a cent, which a few source tables
+        have, are rounded half away from zero to the nearest cent instead of
+        being unparsed.
+
+    Returns
+    -------
+    tuple[pd.Series, pd.Series]
+        The amounts in integer cents (Int64 dtype, missing where blank or
+        unparseable) and the original values which could not be parsed,
+        including non-finite numbers and numbers with fractions of a cent.
+    """
+    if pd.api.types.is_numeric_dtype(money_col):
+        cents, unparsed_index = get_number_cents(money_col, round_fractions)
+        return cents.astype(CENTS_DTYPE), money_col[unparsed_index]
+
+    # columns read from excel can mix numbers and strings
+    number_mask = (
+        money_col.map(lambda value: isinstance(value, numbers.Real), na_action="ignore")
+        .fillna(False)
+        .astype(bool)
+    )
+    cents = pd.Series(np.nan, index=money_col.index, dtype="float64")
+    number_cents, unparsed_number_index = get_number_cents(
+        money_col[number_mask], round_fractions
+    )
+    cents[number_mask] = number_cents
+
+    money_str = money_col[~number_mask].astype("string").str.strip().str.upper()
+    blank_mask = money_str.isna() | money_str.eq("")
+    zero_mask = money_str.isin(ZERO_MONEY_VALUES)
+    to_parse_mask = ~blank_mask & ~zero_mask
+
+    parts_df = money_str[to_parse_mask].str.extract(MONEY_PAT)
+    has_fraction_mask = parts_df["fraction"].fillna("").ne("")
+    parsed_mask = (
+        (parts_df["dollars"].notna() | parts_df["cents"].notna())
+        & (parts_df["open_paren"].notna() == parts_df["close_paren"].notna())
+        & (round_fractions | ~has_fraction_mask)
+    )
+    dollars = pd.to_numeric(parts_df["dollars"].str.replace(r"[,\s]", "", regex=True))
+    extra_cents = pd.to_numeric(parts_df["cents"].str.ljust(2, "0"))
+    parsed_cents = dollars.fillna(0).mul(100) + extra_cents.fillna(0)
+    # round half away from zero on the first digit of the fraction of a cent
+    parsed_cents += parts_df["fraction"].str[:1].fillna("0").ge("5").astype(int)
+    negative_mask = parts_df["open_paren"].notna() | parts_df["minus"].notna()
+    parsed_cents = parsed_cents.where(~negative_mask, -parsed_cents)
+
+    cents[parsed_cents.index] = parsed_cents.where(parsed_mask)
+    cents[zero_mask.index[zero_mask]] = 0
+    unparsed_index = unparsed_number_index.union(parsed_mask.index[~parsed_mask])
+    unparsed = money_col[money_col.index.isin(unparsed_index)]
+
+    return cents.astype(CENTS_DTYPE), unparsed
+
+
+def to_cents(money_col: pd.Series, round_fractions: bool = False) -> pd.Series:
+    """Parses a column of money values into integer cents, see parse_money,
+    and raises a ValueError listing the values which could not be parsed."""
+    cents, unparsed = parse_money(money_col, round_fractions)
+    if not unparsed.empty:
+        raise ValueError(
+            f"Could not parse {unparsed.nunique()} distinct values of "
+            f"{money_col.name} as money: {unparsed.unique().tolist()}"
+        )
+
+    return cents
+
+
+def cents_to_dollars(cents: pd.Series) -> pd.Series:
+    """Converts integer cents into float dollars for display.
+
+    Parameters
+    ----------
+    cents
+        Column of integer cent amounts.
+
+    Returns
+    -------
+    pd.Series
+        The amounts in dollars, NaN where missing.
+    """
+    return cents.astype("float64") / 100
@@ -0,0 +1,378 @@
+""" This module diffs the outputs of two pipeline runs, the raw csv formatted
+data and the cleaned and standardized data, so a change to the pipeline can be
+checked against the previous output without comparing csvs by hand.
+
+A snapshot of a run stores, for every output file, the hash of each cell
+(computed column by column with pd.util.hash_pandas_object), a key for each
+row and a hash of each column. Diffing two snapshots, or a snapshot and the
+current outputs, matches the rows on their key with hash lookups so it takes
+linear time. Files whose bytes are unchanged are skipped without being parsed.
+
+    python output_diff.py snapshot before
+    (change and rerun the pipeline)
+    python output_diff.py diff before
+
+Rows are keyed on their data source and their position among the rows of
+that data source, which is their row in the source file, if the file has a
+data source column and on their position in the file otherwise. The key
+doesn't depend on the content of the row (unlike the record id, which hashes
+the key fields), so an edited cell shows up as a changed cell of the same
+row. Added, removed and changed rows are counted by key, and the rows whose
+content is new or gone are also counted by hash, which tells reordered rows
+apart from changed ones.
+"""
+
+# stdlib imports
+import json
+import time
+import pathlib
+import hashlib
+import argparse
+from typing import Any, Optional
+
+# 3rd party imports
+import pandas as pd
+import numpy as np
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import util
+
+# directories with the outputs of the pipeline
+OUTPUT_DIRS = [
+    DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+    DIR_C.RAW_CSV_FORMATTED_FOIA_DATA_DIR,
+    DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+]
+OUTPUT_FILE_ENDINGS = (*util.CSV_FILE_ENDINGS, ".feather")
+
+ROW_KEY_COL = "__row_key"
+# odd multiplier used to combine the cell hashes of a row into its row hash
+ROW_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+# number of changed columns listed for each file
+NUM_LISTED_CHANGED_COLS = 10
+
+
+def get_output_files() -> dict[str, pathlib.Path]:
+    """Returns every output file keyed on its path relative to the repo."""
+    output_files = {}
+    for output_dir in OUTPUT_DIRS:
+        for file_path in sorted(output_dir.rglob("*")):
+            if file_path.name.endswith(OUTPUT_FILE_ENDINGS):
+                output_files[
+                    file_path.relative_to(DIR_C.REPO_DIR).as_posix()
+                ] = file_path
+    return output_files
+
+
+def load_output_file(file_path: pathlib.Path) -> pd.DataFrame:
+    """Loads an output file. csvs are loaded as their exact text so the hashes
+    don't depend on dtype inference."""
+    if file_path.name.endswith(util.CSV_FILE_ENDINGS):
+        return pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    return pd.read_feather(file_path)
+
+
+def get_cell_hashes(df: pd.DataFrame) -> pd.DataFrame:
+    """Hashes every cell of a dataframe and adds the key of each row.
+
+    Parameters
+    ----------
+    df
+        An output dataframe.
+
+    Returns
+    -------
+    pd.DataFrame
+        A uint64 hash for every cell, with the same column names, and the
+        row key column, the hash of the data source and the row's position
+        among its rows, or the row position.
+    """
+    cell_hashes_df = pd.DataFrame(
+        {
+            col: pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+            for col in df.columns
+        },
+        index=pd.RangeIndex(df.shape[0]),
+    )
+    if STAN_C.DATA_SOURCE_COL in df.columns:
+        data_sources = df[STAN_C.DATA_SOURCE_COL].reset_index(drop=True)
+        cell_hashes_df[ROW_KEY_COL] = pd.util.hash_pandas_object(
+            pd.DataFrame(
+                {
+                    STAN_C.DATA_SOURCE_COL: data_sources,
+                    "source_row_num": data_sources.groupby(
+                        data_sources, dropna=False
+                    ).cumcount(),
+                }
+            ),
+            index=False,
+        ).to_numpy()
+    else:
+        cell_hashes_df[ROW_KEY_COL] = np.arange(df.shape[0], dtype=np.uint64)
+    return cell_hashes_df
+
+
+def get_row_hashes(cell_hashes_df: pd.DataFrame, cols: pd.Index) -> np.ndarray:
+    """Combines the cell hashes of the given columns of each row into a row
+    hash."""
+    row_hashes = np.zeros(cell_hashes_df.shape[0], dtype=np.uint64)
+    for col in cols:
+        row_hashes = row_hashes * ROW_HASH_MULTIPLIER ^ cell_hashes_df[col].to_numpy()
+    return row_hashes
+
+
+def get_column_hashes(cell_hashes_df: pd.DataFrame) -> dict[str, str]:
+    """Hashes the cell hashes of each column, in row order."""
+    return {
+        col: hashlib.blake2b(cell_hashes_df[col].to_numpy().tobytes()).hexdigest()[:32]
+        for col in cell_hashes_df.columns.drop(ROW_KEY_COL)
+    }
+
+
+def get_snapshot_file_name(output_name: str) -> str:
+    """Returns the name of the file a snapshot keeps an output's hashes in."""
+    return output_name.replace("/", "__") + ".feather"
+
+
+class Snapshot:
+    """The hashes of the outputs of a pipeline run, either saved or computed
+    from the current outputs.
+
+    Parameters
+    ----------
+    name
+        Name of a saved snapshot, or None for the current outputs.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.cell_hashes = {}
+        if name is None:
+            self.output_files = get_output_files()
+            self.manifest = {
+                output_name: {"file_hash": util.get_file_hash(file_path)}
+                for output_name, file_path in self.output_files.items()
+            }
+        else:
+            self.snapshot_dir = DIR_C.OUTPUT_SNAPSHOTS_DIR / name
+            manifest_path = self.snapshot_dir / STAN_C.OUTPUT_SNAPSHOT_MANIFEST_JSON
+            if not manifest_path.exists():
+                raise FileNotFoundError(f"There is no snapshot named {name}")
+            with open(manifest_path) as manifest_file:
+                self.manifest = json.load(manifest_file)
+
+    def get_cell_hashes(self, output_name: str) -> pd.DataFrame:
+        """Returns the cell hashes of an output file."""
+        if output_name not in self.cell_hashes:
+            if self.name is None:
+                self.cell_hashes[output_name] = get_cell_hashes(
+                    load_output_file(self.output_files[output_name])
+                )
+            else:
+                self.cell_hashes[output_name] = pd.read_feather(
+                    self.snapshot_dir / get_snapshot_file_name(output_name)
+                )
+        return self.cell_hashes[output_name]
+
+    def save(self, name: str) -> None:
+        """Saves the hashes of the current outputs as a named snapshot."""
+        snapshot_dir = DIR_C.OUTPUT_SNAPSHOTS_DIR / name
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        for output_name, output_info in self.manifest.items():
+            cell_hashes_df = self.get_cell_hashes(output_name)
+            output_info["num_rows"] = cell_hashes_df.shape[0]
+            output_info["column_hashes"] = get_column_hashes(cell_hashes_df)
+            cell_hashes_df.to_feather(
+                snapshot_dir / get_snapshot_file_name(output_name)
+            )
+        with open(snapshot_dir / STAN_C.OUTPUT_SNAPSHOT_MANIFEST_JSON, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+
+def diff_cell_hashes(
+    old_hashes_df: pd.DataFrame, new_hashes_df: pd.DataFrame
+) -> dict[str, Any]:
+    """Diffs the cell hashes of two versions of an output file.
+
+    Parameters
+    ----------
+    old_hashes_df
+        The cell hashes of the old version.
+    new_hashes_df
+        The cell hashes of the new version.
+
+    Returns
+    -------
+    dict[str, Any]
+        The added, removed and changed columns, the counts of added, removed
+        and changed rows, the number of changed cells in each column and the
+        number of rows whose content is new or gone.
+    """
+    old_cols = old_hashes_df.columns.drop(ROW_KEY_COL)
+    new_cols = new_hashes_df.columns.drop(ROW_KEY_COL)
+    common_cols = old_cols.intersection(new_cols, sort=False)
+    old_column_hashes = get_column_hashes(old_hashes_df)
+    new_column_hashes = get_column_hashes(new_hashes_df)
+
+    # match the rows on their keys
+    new_to_old = pd.Index(old_hashes_df[ROW_KEY_COL]).get_indexer(
+        new_hashes_df[ROW_KEY_COL]
+    )
+    matched_new_mask = new_to_old >= 0
+    matched_old_positions = new_to_old[matched_new_mask]
+    old_matched_df = old_hashes_df.iloc[matched_old_positions]
+    new_matched_df = new_hashes_df[matched_new_mask]
+    # rows with a changed cell in a column both versions have
+    changed_row_mask = np.zeros(len(matched_old_positions), dtype=bool)
+    changed_cells = {}
+    for col in common_cols:
+        changed_cell_mask = (
+            old_matched_df[col].to_numpy() != new_matched_df[col].to_numpy()
+        )
+        changed_row_mask |= changed_cell_mask
+        changed_cells[col] = int(np.count_nonzero(changed_cell_mask))
+
+    # content of the common columns that only appears in one version
+    # regardless of position
+    old_row_hash_index = pd.Index(get_row_hashes(old_hashes_df, common_cols))
+    new_row_hash_index = pd.Index(get_row_hashes(new_hashes_df, common_cols))
+
+    return {
+        "added_cols": new_cols.difference(old_cols, sort=False).tolist(),
+        "removed_cols": old_cols.difference(new_cols, sort=False).tolist(),
+        "changed_cols": [
+            col
+            for col in common_cols
+            if old_column_hashes[col] != new_column_hashes[col]
+        ],
+        "num_old_rows": old_hashes_df.shape[0],
+        "num_new_rows": new_hashes_df.shape[0],
+        "num_added_rows": int(np.count_nonzero(~matched_new_mask)),
+        "num_removed_rows": old_hashes_df.shape[0] - len(matched_old_positions),
+        "num_changed_rows": int(np.count_nonzero(changed_row_mask)),
+        "changed_cells": {col: num for col, num in changed_cells.items() if num},
+        "num_new_content_rows": int(
+            np.count_nonzero(~new_row_hash_index.isin(old_row_hash_index))
+        ),
+        "num_gone_content_rows": int(
+            np.count_nonzero(~old_row_hash_index.isin(new_row_hash_index))
+        ),
+    }
+
+
+def print_file_diff(output_name: str, file_diff: dict[str, Any]) -> None:
+    """Prints the diff of one output file."""
+    print(
+        f"{output_name}: {file_diff['num_old_rows']} -> {file_diff['num_new_rows']} "
+        f"rows, {file_diff['num_added_rows']} added, "
+        f"{file_diff['num_removed_rows']} removed, "
+        f"{file_diff['num_changed_rows']} changed"
+    )
+    print(
+        f"  {file_diff['num_new_content_rows']} rows with new content, "
+        f"{file_diff['num_gone_content_rows']} rows with removed content"
+    )
+    for key in ["added_cols", "removed_cols"]:
+        if file_diff[key]:
+            print(f"  {key.replace('_', ' ')}: {file_diff[key]}")
+    changed_cells = sorted(
+        file_diff["changed_cells"].items(), key=lambda col_num: -col_num[1]
+    )
+    if file_diff["changed_cols"]:
+        print(
+            "  changed columns (changed cells): "
+            + ", ".join(
+                f"{col} ({num})" for col, num in changed_cells[:NUM_LISTED_CHANGED_COLS]
+            )
+            + (", ..." if len(changed_cells) > NUM_LISTED_CHANGED_COLS else "")
+        )
+        # a column can change without a matched cell changing if rows were
+        # only added or removed
+        unlisted_cols = set(file_diff["changed_cols"]).difference(
+            file_diff["changed_cells"]
+        )
+        if unlisted_cols:
+            print(f"  changed by added or removed rows: {sorted(unlisted_cols)}")
+
+
+def diff_snapshots(old_snapshot: Snapshot, new_snapshot: Snapshot) -> dict[str, Any]:
+    """Diffs every output file of two snapshots and prints the differences.
+
+    Parameters
+    ----------
+    old_snapshot
+        The snapshot of the earlier run.
+    new_snapshot
+        The snapshot of the later run, or of the current outputs.
+
+    Returns
+    -------
+    dict[str, Any]
+        The diff of each output file that changed, keyed on its name.
+    """
+    old_names = set(old_snapshot.manifest)
+    new_names = set(new_snapshot.manifest)
+    for output_name in sorted(new_names - old_names):
+        print(f"{output_name}: added")
+    for output_name in sorted(old_names - new_names):
+        print(f"{output_name}: removed")
+
+    file_diffs = {}
+    num_unchanged_files = 0
+    for output_name in sorted(old_names & new_names):
+        if (
+            old_snapshot.manifest[output_name]["file_hash"]
+            == new_snapshot.manifest[output_name]["file_hash"]
+        ):
+            num_unchanged_files += 1
+            continue
+        file_diff = diff_cell_hashes(
+            old_snapshot.get_cell_hashes(output_name),
+            new_snapshot.get_cell_hashes(output_name),
+        )
+        if (
+            file_diff["num_changed_rows"] == 0
+            and not any(
+                file_diff[key] for key in ["added_cols", "removed_cols", "changed_cols"]
+            )
+            and file_diff["num_old_rows"] == file_diff["num_new_rows"]
+        ):
+            # only the bytes differ, e.g. the quoting
+            num_unchanged_files += 1
+            continue
+        file_diffs[output_name] = file_diff
+        print_file_diff(output_name, file_diff)
+
+    print(
+        f"{len(file_diffs)} files changed, {num_unchanged_files} unchanged, "
+        f"{len(new_names - old_names)} added, {len(old_names - new_names)} removed"
+    )
+    return file_diffs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="save the hashes of the current outputs"
+    )
+    snapshot_parser.add_argument("name")
+    diff_parser = subparsers.add_parser(
+        "diff", help="diff a snapshot with the current outputs or another snapshot"
+    )
+    diff_parser.add_argument("name")
+    diff_parser.add_argument(
+        "--against", help="name of a later snapshot to diff with instead"
+    )
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    if args.command == "snapshot":
+        Snapshot().save(args.name)
+    else:
+        diff_snapshots(Snapshot(args.name), Snapshot(args.against))
+    print(f"Took {time.perf_counter() - start_time:.2f}s")
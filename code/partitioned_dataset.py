@@ -0,0 +1,329 @@
+""" This module contains code to save and load the cleaned and standardized
+data as a partitioned dataset. Each partition holds the rows for a single
+data source and data year and is saved under
+
+    <dataset dir>/data_source=<data source>/data_year=<data year>/part.csv
+
+A small metadata file in the dataset directory lists every partition along
+with its row count and per column statistics so readers only need to load
+the partitions a query actually uses.
+
+The Law Website years are only saved per year as partitions, the all years
+standardized csv being their one other copy.
+"""
+
+# stdlib imports
+import json
+import shutil
+import pathlib
+from typing import Any, Iterable, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import string_dictionary
+import util
+
+# partition value used for rows without a data year
+UNKNOWN_DATA_YEAR = "unknown"
+
+# string columns with at most this many distinct values in a partition have
+# their values saved in the partition statistics
+MAX_STATS_DISTINCT_VALUES = 64
+
+
+def get_partition_path(data_source: str, data_year: Any) -> pathlib.Path:
+    """Returns the path of a partition relative to the dataset directory.
+
+    Parameters
+    ----------
+    data_source
+        The data source of the partition.
+    data_year
+        The data year of the partition. Missing years map to the unknown
+        partition.
+
+    Returns
+    -------
+    pathlib.Path
+        The relative directory the partition is saved in.
+    """
+    if pd.isna(data_year):
+        data_year = UNKNOWN_DATA_YEAR
+    return pathlib.Path(
+        f"{STAN_C.DATA_SOURCE_COL}={data_source}",
+        f"{STAN_C.DATA_YEAR_COL}={data_year}",
+    )
+
+
+def get_partition_stats(partition_df: pd.DataFrame) -> dict[str, dict[str, Any]]:
+    """Gets the statistics saved in the metadata for each column of a partition.
+
+    Every column gets its number of non-missing values. Numeric columns also
+    get their min and max and low cardinality string columns get their set of
+    values, which lets queries skip partitions without reading them. The
+    statistics are of the values as they load from the saved csv (e.g. a
+    year_filed of "2015" loads as the number 2015) and integer columns keep
+    integer min and max, so large record ids aren't rounded.
+
+    Parameters
+    ----------
+    partition_df
+        The rows of a single partition, as they are passed to save_df.
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        Dict of column name to that column's statistics.
+    """
+    partition_stats = {}
+    round_trip_df = util.get_csv_round_trip_df(partition_df)
+    for col in round_trip_df.columns:
+        values = round_trip_df[col].dropna()
+        col_stats = {"num_non_null": int(values.shape[0])}
+        if values.empty:
+            pass
+        elif pd.api.types.is_numeric_dtype(values) and not (
+            pd.api.types.is_bool_dtype(values)
+        ):
+            col_stats["min"], col_stats["max"] = values.agg(["min", "max"]).tolist()
+        elif pd.api.types.is_string_dtype(values):
+            distinct_values = values.unique()
+            if len(distinct_values) <= MAX_STATS_DISTINCT_VALUES:
+                col_stats["values"] = sorted(str(value) for value in distinct_values)
+        partition_stats[col] = col_stats
+
+    return partition_stats
+
+
+def save_partitions(
+    df: pd.DataFrame,
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+) -> list[dict[str, Any]]:
+    """Splits a dataframe by data source and data year and saves each piece.
+
+    Does not update the metadata file so it is safe to call from multiple
+    worker processes at once. Pass the returned entries to
+    update_partition_metadata once all the partitions are saved.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe with data source and data year columns.
+    dataset_dir
+        The directory of the partitioned dataset.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        A metadata entry for each partition saved.
+    """
+    partition_entries = []
+    partition_groups = df.groupby(
+        [STAN_C.DATA_SOURCE_COL, STAN_C.DATA_YEAR_COL],
+        dropna=False,
+        sort=True,
+    )
+    for (data_source, data_year), partition_df in partition_groups:
+        partition_path = get_partition_path(data_source, data_year)
+        (dataset_dir / partition_path).mkdir(parents=True, exist_ok=True)
+        util.save_df(
+            df=partition_df,
+            file_name=STAN_C.PARTITION_DATA_CSV,
+            save_dir=dataset_dir / partition_path,
+        )
+        partition_entries.append(
+            {
+                STAN_C.DATA_SOURCE_COL: data_source,
+                STAN_C.DATA_YEAR_COL: None if pd.isna(data_year) else int(data_year),
+                "path": (partition_path / STAN_C.PARTITION_DATA_CSV).as_posix(),
+                "num_rows": partition_df.shape[0],
+                "stats": get_partition_stats(partition_df),
+            }
+        )
+
+    return partition_entries
+
+
+def load_partition_metadata(
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+) -> list[dict[str, Any]]:
+    """Loads the list of partition entries from the metadata file.
+
+    Parameters
+    ----------
+    dataset_dir
+        The directory of the partitioned dataset.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The metadata entries for every partition, empty if there is no
+        metadata file yet.
+    """
+    metadata_path = dataset_dir / STAN_C.PARTITION_METADATA_JSON
+    if not metadata_path.exists():
+        return []
+    with open(metadata_path) as metadata_file:
+        return json.load(metadata_file)["partitions"]
+
+
+def update_partition_metadata(
+    partition_entries: list[dict[str, Any]],
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+) -> None:
+    """Replaces the metadata for each data source in the given entries.
+
+    Every existing partition of a data source in partition_entries is
+    replaced, and partitions which no longer exist for that source are
+    deleted. Partitions of other data sources are left alone.
+
+    Parameters
+    ----------
+    partition_entries
+        Metadata entries returned by save_partitions.
+    dataset_dir
+        The directory of the partitioned dataset.
+    """
+    updated_sources = {entry[STAN_C.DATA_SOURCE_COL] for entry in partition_entries}
+    new_paths = {entry["path"] for entry in partition_entries}
+    kept_entries = []
+    for entry in load_partition_metadata(dataset_dir):
+        if entry[STAN_C.DATA_SOURCE_COL] not in updated_sources:
+            kept_entries.append(entry)
+        elif entry["path"] not in new_paths:
+            # stale partition from a previous run
+            shutil.rmtree(dataset_dir / pathlib.Path(entry["path"]).parent)
+
+    all_entries = sorted(
+        kept_entries + partition_entries,
+        key=lambda entry: (
+            entry[STAN_C.DATA_SOURCE_COL],
+            entry[STAN_C.DATA_YEAR_COL] is None,
+            entry[STAN_C.DATA_YEAR_COL] or 0,
+        ),
+    )
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    metadata_path = dataset_dir / STAN_C.PARTITION_METADATA_JSON
+    with util.atomic_write_path(metadata_path) as temp_path, open(
+        temp_path, "w"
+    ) as metadata_file:
+        json.dump({"partitions": all_entries}, metadata_file, indent=2)
+
+
+def select_partitions(
+    data_sources: Optional[Iterable[str]] = None,
+    data_years: Optional[Iterable[int]] = None,
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+) -> list[dict[str, Any]]:
+    """Returns the metadata entries of partitions matching the given keys.
+
+    Parameters
+    ----------
+    data_sources
+        Data sources to keep. Keeps all sources if None.
+    data_years
+        Data years to keep. Keeps all years if None.
+    dataset_dir
+        The directory of the partitioned dataset.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The matching metadata entries.
+    """
+    data_sources = None if data_sources is None else set(data_sources)
+    data_years = None if data_years is None else set(data_years)
+    return [
+        entry
+        for entry in load_partition_metadata(dataset_dir)
+        if (data_sources is None or entry[STAN_C.DATA_SOURCE_COL] in data_sources)
+        and (data_years is None or entry[STAN_C.DATA_YEAR_COL] in data_years)
+    ]
+
+
+def load_partition_entries(
+    partition_entries: list[dict[str, Any]],
+    columns: Optional[list[str]] = None,
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+    encode_strings: bool = False,
+) -> pd.DataFrame:
+    """Loads the partitions with the given metadata entries.
+
+    Parameters
+    ----------
+    partition_entries
+        Metadata entries of the partitions to load.
+    columns
+        Only load these columns. Loads every column if None.
+    dataset_dir
+        The directory of the partitioned dataset.
+    encode_strings
+        If True the repetitive string columns are encoded with the global
+        string dictionary, see string_dictionary.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows of every partition appended together.
+    """
+    partition_dfs = [
+        util.load_df(
+            file_name=STAN_C.PARTITION_DATA_CSV,
+            save_dir=dataset_dir / pathlib.Path(entry["path"]).parent,
+            columns=columns,
+        )
+        for entry in partition_entries
+    ]
+    if not partition_dfs:
+        return pd.DataFrame(columns=columns)
+    if not encode_strings:
+        return pd.concat(partition_dfs, ignore_index=True)
+
+    # every partition is encoded with one dictionary and appended as codes,
+    # appending categoricals would compare their categories partition by
+    # partition
+    dictionary = string_dictionary.get_string_dictionary(partition_dfs)
+    partition_dfs = [
+        string_dictionary.get_string_codes(partition_df, dictionary)
+        for partition_df in partition_dfs
+    ]
+    return string_dictionary.codes_to_categoricals(
+        pd.concat(partition_dfs, ignore_index=True), dictionary
+    )
+
+
+def load_partitions(
+    data_sources: Optional[Iterable[str]] = None,
+    data_years: Optional[Iterable[int]] = None,
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+    encode_strings: bool = False,
+) -> pd.DataFrame:
+    """Loads only the partitions matching the given data sources and years.
+
+    Parameters
+    ----------
+    data_sources
+        Data sources to load. Loads all sources if None.
+    data_years
+        Data years to load. Loads all years if None.
+    dataset_dir
+        The directory of the partitioned dataset.
+    encode_strings
+        If True the repetitive string columns are encoded with the global
+        string dictionary, see string_dictionary.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows of every matching partition appended together.
+    """
+    partition_entries = select_partitions(data_sources, data_years, dataset_dir)
+    if not partition_entries:
+        return pd.DataFrame()
+    return load_partition_entries(
+        partition_entries, dataset_dir=dataset_dir, encode_strings=encode_strings
+    )
@@ -0,0 +1,369 @@
+""" This module resolves the different spellings of the same payee in the
+payment recipient column, e.g. "ENTERRPISE RENT-A-CAR" and "ENTERPRISE RENT A
+CAR", into a single stable payee id.
+
+Payee names are first normalized (upper case, punctuation removed and words
+sorted so "JAMES CARPENTER" and "CARPENTER, JAMES" are the same). Scoring
+every pair of the ~18k distinct normalized names is far too slow, so pairs are
+blocked with an inverted index of character trigrams: each name's rarest
+trigrams (its prefix) are indexed and only names sharing a prefix trigram are
+scored. The prefix is long enough that no pair with a trigram Jaccard
+similarity of at least MIN_NGRAM_JACCARD is missed. Candidate pairs over that
+similarity are matched if their edit similarity is at least
+MIN_MATCH_SIMILARITY, and matched names are grouped with union find.
+
+Payee ids are kept from run to run so joins on them keep working.
+payee_ids.csv lists the names in the order they were first seen, and the
+earliest seen name of a group is its root. A group whose root already has a
+saved payee id keeps that id, so when groups merge the merged group keeps the
+id of the earliest seen one. A new group's id is a hash of its root.
+"""
+
+# stdlib imports
+import math
+import time
+import bisect
+import difflib
+import hashlib
+import argparse
+import collections
+import itertools
+import random
+from typing import Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import partitioned_dataset
+import util
+
+# length of the character n-grams used for blocking
+NGRAM_LEN = 3
+# pairs with a lower n-gram Jaccard similarity than this are never scored
+MIN_NGRAM_JACCARD = 0.6
+# pairs with at least this difflib similarity ratio are the same payee
+MIN_MATCH_SIMILARITY = 0.93
+# shorter names are only matched exactly, one letter is too big a difference
+# in short person names, e.g. "ALBERT JONES" and "ALBERTA JONES"
+MIN_FUZZY_MATCH_LEN = 15
+
+NORMALIZED_PAYEE_COL = "normalized_payee"
+
+
+def normalize_payees(payee_col: pd.Series) -> pd.Series:
+    """Normalizes payee names so trivially different spellings are equal.
+
+    Parameters
+    ----------
+    payee_col
+        Column of raw payee names.
+
+    Returns
+    -------
+    pd.Series
+        Upper case names with punctuation removed and their words sorted.
+    """
+    return (
+        payee_col.astype("string")
+        .str.upper()
+        .str.replace(r"[^A-Z0-9]+", " ", regex=True)
+        .str.split()
+        .map(lambda words: " ".join(sorted(words)), na_action="ignore")
+    )
+
+
+def get_ngrams(name: str) -> set[str]:
+    """Returns the set of character n-grams of a name padded with spaces."""
+    padded_name = f" {name} "
+    return {
+        padded_name[i : i + NGRAM_LEN]
+        for i in range(max(len(padded_name) - NGRAM_LEN + 1, 1))
+    }
+
+
+def is_match(
+    name: str, other_name: str, ngrams: set[str], other_ngrams: set[str]
+) -> bool:
+    """Checks if two normalized names are the same payee."""
+    total_len = len(name) + len(other_name)
+    if (
+        min(len(name), len(other_name)) < MIN_FUZZY_MATCH_LEN
+        # the similarity ratio can't be higher than this
+        or 2 * min(len(name), len(other_name)) / total_len < MIN_MATCH_SIMILARITY
+    ):
+        return False
+    num_shared_ngrams = len(ngrams & other_ngrams)
+    ngram_jaccard = num_shared_ngrams / (
+        len(ngrams) + len(other_ngrams) - num_shared_ngrams
+    )
+    return (
+        ngram_jaccard >= MIN_NGRAM_JACCARD
+        and difflib.SequenceMatcher(None, name, other_name).ratio()
+        >= MIN_MATCH_SIMILARITY
+    )
+
+
+def find_blocked_matches(names: list[str]) -> tuple[list[tuple[int, int]], int]:
+    """Finds the matching pairs of names, only scoring pairs blocked together.
+
+    Parameters
+    ----------
+    names
+        Distinct normalized names.
+
+    Returns
+    -------
+    tuple[list[tuple[int, int]], int]
+        The index pairs of the names which match and the number of pairs
+        scored.
+    """
+    ngram_sets = [get_ngrams(name) for name in names]
+    ngram_freqs = collections.Counter(itertools.chain.from_iterable(ngram_sets))
+    # name ids sorted by size so the size filter can stop early
+    name_ids = sorted(range(len(names)), key=lambda name_id: len(ngram_sets[name_id]))
+    name_sizes = [len(ngram_sets[name_id]) for name_id in name_ids]
+
+    inverted_index = collections.defaultdict(list)
+    matches = []
+    num_pairs_scored = 0
+    for position, name_id in enumerate(name_ids):
+        ngrams = ngram_sets[name_id]
+        # any name with a high enough Jaccard similarity shares at least one
+        # of this prefix of the rarest n-grams
+        prefix_len = len(ngrams) - math.ceil(MIN_NGRAM_JACCARD * len(ngrams)) + 1
+        prefix = sorted(ngrams, key=lambda ngram: (ngram_freqs[ngram], ngram))
+        prefix = prefix[:prefix_len]
+        # smaller names can only be similar enough if they aren't too small
+        min_position = bisect.bisect_left(
+            name_sizes, MIN_NGRAM_JACCARD * len(ngrams), hi=position
+        )
+        candidate_positions = {
+            other_position
+            for ngram in prefix
+            for other_position in inverted_index[ngram]
+            if other_position >= min_position
+        }
+        for other_position in candidate_positions:
+            other_id = name_ids[other_position]
+            num_pairs_scored += 1
+            if is_match(names[name_id], names[other_id], ngrams, ngram_sets[other_id]):
+                matches.append((min(name_id, other_id), max(name_id, other_id)))
+        for ngram in prefix:
+            inverted_index[ngram].append(position)
+
+    return matches, num_pairs_scored
+
+
+def find_brute_force_matches(names: list[str]) -> tuple[list[tuple[int, int]], int]:
+    """Finds the matching pairs of names by scoring every pair. Only used to
+    benchmark find_blocked_matches."""
+    ngram_sets = [get_ngrams(name) for name in names]
+    matches = [
+        (name_id, other_id)
+        for name_id, other_id in itertools.combinations(range(len(names)), 2)
+        if is_match(
+            names[name_id], names[other_id], ngram_sets[name_id], ngram_sets[other_id]
+        )
+    ]
+    return matches, len(names) * (len(names) - 1) // 2
+
+
+def get_payee_id(name: str) -> str:
+    """Returns the payee id of a new group from its earliest seen name."""
+    return hashlib.sha1(name.encode()).hexdigest()[:16]
+
+
+def resolve_payees(
+    payee_col: pd.Series, saved_payee_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Assigns a payee id to every distinct payee name.
+
+    Parameters
+    ----------
+    payee_col
+        Column of raw payee names.
+    saved_payee_df
+        The payee ids saved by the last run, in the order the names were
+        first seen. Groups keep the saved id of their earliest seen name.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per distinct raw name with its normalized name and payee id,
+        in the order the names were first seen: the names of saved_payee_df
+        still in payee_col and then the new names in the order of payee_col.
+    """
+    if saved_payee_df is None:
+        saved_payee_df = pd.DataFrame(
+            columns=[
+                STAN_C.PAYMENT_RECIPIENT_COL,
+                NORMALIZED_PAYEE_COL,
+                STAN_C.PAYEE_ID_COL,
+            ]
+        )
+    raw_names = pd.Index(payee_col.dropna().unique())
+    saved_raw_names = saved_payee_df[STAN_C.PAYMENT_RECIPIENT_COL]
+    payee_df = pd.DataFrame(
+        {
+            STAN_C.PAYMENT_RECIPIENT_COL: saved_raw_names[
+                saved_raw_names.isin(raw_names)
+            ].tolist()
+            + raw_names[~raw_names.isin(saved_raw_names)].tolist()
+        }
+    )
+    payee_df[NORMALIZED_PAYEE_COL] = normalize_payees(
+        payee_df[STAN_C.PAYMENT_RECIPIENT_COL]
+    )
+    payee_df = payee_df[payee_df[NORMALIZED_PAYEE_COL] != ""]
+    # the normalized names in the order they were first seen
+    names = payee_df[NORMALIZED_PAYEE_COL].unique().tolist()
+    # saved ids are looked up by raw name so they survive normalization changes,
+    # each normalized name keeping the id of its earliest seen raw name
+    saved_raw_name_ids = saved_payee_df.drop_duplicates(
+        STAN_C.PAYMENT_RECIPIENT_COL
+    ).set_index(STAN_C.PAYMENT_RECIPIENT_COL)[STAN_C.PAYEE_ID_COL]
+    payee_df[STAN_C.PAYEE_ID_COL] = payee_df[STAN_C.PAYMENT_RECIPIENT_COL].map(
+        saved_raw_name_ids
+    )
+    saved_payee_ids = (
+        payee_df.dropna(subset=[STAN_C.PAYEE_ID_COL])
+        .drop_duplicates(NORMALIZED_PAYEE_COL)
+        .set_index(NORMALIZED_PAYEE_COL)[STAN_C.PAYEE_ID_COL]
+        .to_dict()
+    )
+    matches, _ = find_blocked_matches(names)
+
+    # union find, always keeping the smaller id as the root so each group's
+    # root is its earliest seen name
+    parents = list(range(len(names)))
+
+    def find_root(name_id: int) -> int:
+        while parents[name_id] != name_id:
+            parents[name_id] = parents[parents[name_id]]
+            name_id = parents[name_id]
+        return name_id
+
+    for name_id, other_id in matches:
+        root, other_root = sorted([find_root(name_id), find_root(other_id)])
+        parents[other_root] = root
+
+    # roots are visited in the order they were first seen, so when a saved
+    # group splits the earliest seen part keeps its id
+    root_payee_ids = {}
+    for name_id in range(len(names)):
+        root = find_root(name_id)
+        if root in root_payee_ids:
+            continue
+        payee_id = saved_payee_ids.get(names[root])
+        if payee_id is None or payee_id in root_payee_ids.values():
+            payee_id = get_payee_id(names[root])
+        root_payee_ids[root] = payee_id
+
+    name_to_payee_id = {
+        name: root_payee_ids[find_root(name_id)] for name_id, name in enumerate(names)
+    }
+    payee_df[STAN_C.PAYEE_ID_COL] = payee_df[NORMALIZED_PAYEE_COL].map(name_to_payee_id)
+
+    return payee_df.reset_index(drop=True)
+
+
+def resolve_all_payees() -> pd.DataFrame:
+    """Resolves the payees of every partition of the standardized data and
+    saves the payee id of each raw name, keeping the ids of the last run."""
+    payee_col = partitioned_dataset.load_partitions()[STAN_C.PAYMENT_RECIPIENT_COL]
+    saved_payee_df = None
+    if (DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR / STAN_C.PAYEE_IDS_CSV).exists():
+        saved_payee_df = util.load_df(
+            file_name=STAN_C.PAYEE_IDS_CSV,
+            save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+        )
+    payee_df = resolve_payees(payee_col, saved_payee_df)
+    util.save_df(
+        df=payee_df,
+        file_name=STAN_C.PAYEE_IDS_CSV,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+    )
+    print(
+        f"Resolved {payee_df.shape[0]} payee names into "
+        f"{payee_df[STAN_C.PAYEE_ID_COL].nunique()} payees"
+    )
+
+    return payee_df
+
+
+def add_payee_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds the saved payee id of each row's payment recipient to a dataframe.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe with a payment recipient column.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataframe with a payee id column, missing for unknown names.
+    """
+    payee_df = util.load_df(
+        file_name=STAN_C.PAYEE_IDS_CSV,
+        save_dir=DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+        columns=[STAN_C.PAYMENT_RECIPIENT_COL, STAN_C.PAYEE_ID_COL],
+    )
+    payee_ids = payee_df.set_index(STAN_C.PAYMENT_RECIPIENT_COL)[STAN_C.PAYEE_ID_COL]
+    df[STAN_C.PAYEE_ID_COL] = df[STAN_C.PAYMENT_RECIPIENT_COL].map(payee_ids)
+
+    return df
+
+
+def benchmark_blocking(sample_size: int) -> None:
+    """Compares blocked matching against brute force on a sample of names.
+
+    Parameters
+    ----------
+    sample_size
+        Number of distinct normalized names to sample for the comparison.
+    """
+    payee_col = partitioned_dataset.load_partitions()[STAN_C.PAYMENT_RECIPIENT_COL]
+    all_names = sorted(set(normalize_payees(payee_col.dropna())) - {""})
+    names = random.Random(0).sample(all_names, min(sample_size, len(all_names)))
+
+    for method, find_matches in [
+        ("blocked", find_blocked_matches),
+        ("brute force", find_brute_force_matches),
+    ]:
+        start_time = time.perf_counter()
+        matches, num_pairs_scored = find_matches(names)
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"{method}: {num_pairs_scored} pairs scored, {len(matches)} matches "
+            f"in {elapsed:.2f}s"
+        )
+        if method == "blocked":
+            blocked_matches = set(matches)
+    if matches:
+        recall = len(blocked_matches & set(matches)) / len(matches)
+        print(f"blocked recall: {recall:.1%}")
+
+    start_time = time.perf_counter()
+    find_blocked_matches(all_names)
+    elapsed = time.perf_counter() - start_time
+    print(f"blocked on all {len(all_names)} names in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="SAMPLE_SIZE",
+        help="compare blocking against brute force on a sample of names "
+        "instead of resolving payees",
+    )
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark_blocking(args.benchmark)
+    else:
+        resolve_all_payees()
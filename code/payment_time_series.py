@@ -0,0 +1,248 @@
+""" This module contains code to build and query monthly time series of the
+payments in the standardized data. Payments are bucketed into the month of
+their date to comptroller, and each cell of the saved series is one
+combination of data source, month, city department and case type with the
+sum and count of the payment amount and fees and costs columns and the
+number of rows.
+
+The cells are saved as a small csv and refreshed one data source at a time
+like the aggregation cube, so re-standardizing a year only recomputes the
+months that year's payments fall in. Series, with the months without
+payments filled in and rolling 12 month totals, are computed from the cells
+in milliseconds, e.g. the monthly POLICE payments of each case type in the
+FOIA payments data is
+
+    get_monthly_series(
+        by=["case_type"],
+        filters=[
+            ("city_department", "==", "POLICE"),
+            ("data_source", "==", "foia_cpd_payments_2004_to_2018"),
+        ],
+    )
+"""
+
+# stdlib imports
+import pathlib
+from typing import Any, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import date_parsing
+import standardized_data_query
+import util
+
+# month column of the series, the first day of the month
+MONTH_COL = "month"
+# columns the cells are grouped by besides the month
+SERIES_DIMENSION_COLS = [
+    STAN_C.DATA_SOURCE_COL,
+    STAN_C.CITY_DEPARTMENT_INVOLVED_COL,
+    STAN_C.CASE_TYPE_COL,
+]
+# columns summed and counted in each cell
+SERIES_MONEY_COLS = [STAN_C.PAYMENT_AMOUNT_COL, STAN_C.FEES_AND_COSTS_COL]
+NUM_ROWS_COL = "num_rows"
+SERIES_MEASURE_COLS = [
+    f"{money_col}_{agg}" for money_col in SERIES_MONEY_COLS for agg in ["sum", "count"]
+] + [NUM_ROWS_COL]
+# number of months in the rolling windows and the suffix of their columns
+ROLLING_NUM_MONTHS = 12
+ROLLING_COL_SUFFIX = f"_rolling_{ROLLING_NUM_MONTHS}_months"
+# columns of the series returned by get_monthly_series
+SERIES_COLS = SERIES_MEASURE_COLS + [
+    f"{measure_col}{ROLLING_COL_SUFFIX}" for measure_col in SERIES_MEASURE_COLS
+]
+
+# cells loaded by load_monthly_cells along with the path and modified time of
+# the file they were loaded from
+_loaded_cells = {"file_key": None, "cells_df": None}
+
+
+def get_monthly_cells(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregates standardized rows into monthly cells.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe. Rows without a date to comptroller are left
+        out and dimension and money columns it doesn't have are treated as
+        missing.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per cell with the month, dimension and measure columns.
+    """
+    if STAN_C.DATE_TO_COMPTROLLER_COL not in df.columns:
+        return pd.DataFrame(
+            columns=[MONTH_COL] + SERIES_DIMENSION_COLS + SERIES_MEASURE_COLS
+        )
+
+    series_input_df = df.reindex(columns=SERIES_DIMENSION_COLS + SERIES_MONEY_COLS)
+    # loaded csvs have the dates as strings
+    payment_dates = date_parsing.to_datetime(
+        df[STAN_C.DATE_TO_COMPTROLLER_COL], STAN_C.CSV_DATE_FORMATS
+    )
+    series_input_df[MONTH_COL] = payment_dates.dt.to_period("M").dt.start_time
+    series_input_df = series_input_df[payment_dates.notna()]
+    cell_groups = series_input_df.groupby(
+        [MONTH_COL] + SERIES_DIMENSION_COLS, dropna=False, sort=True
+    )
+    cells_df = cell_groups[SERIES_MONEY_COLS].agg(["sum", "count"])
+    cells_df.columns = [f"{money_col}_{agg}" for money_col, agg in cells_df.columns]
+    cells_df[NUM_ROWS_COL] = cell_groups.size()
+
+    return cells_df.reset_index()
+
+
+def load_monthly_cells(
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.DataFrame:
+    """Loads the monthly cells, reusing the last load if the file is
+    unchanged.
+
+    Parameters
+    ----------
+    save_dir
+        The directory the cells are saved in.
+
+    Returns
+    -------
+    pd.DataFrame
+        The cells, empty if they haven't been built yet.
+    """
+    cells_path = save_dir / STAN_C.MONTHLY_PAYMENT_SERIES_CSV
+    if not cells_path.exists():
+        return pd.DataFrame(
+            columns=[MONTH_COL] + SERIES_DIMENSION_COLS + SERIES_MEASURE_COLS
+        )
+
+    file_key = (cells_path, cells_path.stat().st_mtime_ns)
+    if _loaded_cells["file_key"] != file_key:
+        cells_df = util.load_df(
+            file_name=STAN_C.MONTHLY_PAYMENT_SERIES_CSV,
+            save_dir=save_dir,
+        )
+        cells_df[MONTH_COL] = date_parsing.to_datetime(
+            cells_df[MONTH_COL], STAN_C.CSV_DATE_FORMATS
+        )
+        _loaded_cells["cells_df"] = cells_df
+        _loaded_cells["file_key"] = file_key
+
+    return _loaded_cells["cells_df"]
+
+
+def update_monthly_cells(
+    cells_df: pd.DataFrame,
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> None:
+    """Replaces the cells of every data source in cells_df and saves them.
+
+    Cells of other data sources are left as they are.
+
+    Parameters
+    ----------
+    cells_df
+        New cells from get_monthly_cells.
+    save_dir
+        The directory the cells are saved in.
+    """
+    saved_cells_df = load_monthly_cells(save_dir)
+    kept_cells_df = saved_cells_df[
+        ~saved_cells_df[STAN_C.DATA_SOURCE_COL].isin(cells_df[STAN_C.DATA_SOURCE_COL])
+    ]
+    updated_cells_df = pd.concat([kept_cells_df, cells_df], ignore_index=True).reindex(
+        columns=[MONTH_COL] + SERIES_DIMENSION_COLS + SERIES_MEASURE_COLS
+    )
+    updated_cells_df = updated_cells_df.sort_values(
+        [STAN_C.DATA_SOURCE_COL, MONTH_COL], kind="stable"
+    )
+    util.save_df(
+        df=updated_cells_df,
+        file_name=STAN_C.MONTHLY_PAYMENT_SERIES_CSV,
+        save_dir=save_dir,
+    )
+
+
+def get_monthly_series(
+    by: Optional[list[str]] = None,
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.DataFrame:
+    """Gets monthly series of the payment totals and counts with rolling 12
+    month totals.
+
+    The data sources overlap, so the data source must either be one of the
+    dimensions of the series or be filtered to a single data source, see
+    standardized_data_query.check_single_data_source.
+
+    Parameters
+    ----------
+    by
+        Dimension columns to get a series for each combination of, any of
+        SERIES_DIMENSION_COLS. A single series of everything matching the
+        filters if None.
+    filters
+        Optional (column, operator, value) filters on the dimension columns,
+        as in standardized_data_query.
+    save_dir
+        The directory the cells are saved in.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per month and group from the first to the last month with
+        payments, with the summed measure columns and a rolling column for
+        each of them. Months without payments have zero totals.
+
+    Raises
+    ------
+    ValueError
+        If the data source is neither a dimension of the series nor filtered
+        to a single data source.
+    """
+    by = by or []
+    standardized_data_query.check_single_data_source(by, filters)
+    cells_df = load_monthly_cells(save_dir)
+    match_mask = pd.Series(True, index=cells_df.index)
+    for col, operator, value in filters or []:
+        match_mask &= standardized_data_query.get_filter_mask(
+            cells_df, col, operator, value
+        )
+    cells_df = cells_df[match_mask]
+    if cells_df.empty:
+        return pd.DataFrame(columns=by + [MONTH_COL] + SERIES_COLS)
+
+    # one column per group and measure with a row for every month, so the
+    # months without payments are filled in and every series is rolled at once
+    wide_df = cells_df.groupby([MONTH_COL] + by, dropna=False)[
+        SERIES_MEASURE_COLS
+    ].sum()
+    if by:
+        wide_df = wide_df.unstack(by)
+    wide_df = wide_df.reindex(
+        pd.date_range(wide_df.index.min(), wide_df.index.max(), freq="MS").rename(
+            MONTH_COL
+        )
+    ).fillna(0)
+    rolling_wide_df = wide_df.rolling(ROLLING_NUM_MONTHS, min_periods=1).sum()
+
+    series_df = wide_df.join(
+        rolling_wide_df.rename(
+            columns=lambda measure_col: f"{measure_col}{ROLLING_COL_SUFFIX}",
+            level=0 if by else None,
+        )
+    )
+    if by:
+        series_df = series_df.stack(by)
+
+    return (
+        series_df.astype("Int64")
+        .reset_index()
+        .reindex(columns=by + [MONTH_COL] + SERIES_COLS)
+        .sort_values(by + [MONTH_COL], ignore_index=True)
+    )
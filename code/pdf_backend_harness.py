@@ -0,0 +1,155 @@
+""" This module compares the pdf table backends in pdf_table_backends on the
+2008 and 2009 law website pdfs. Each backend's data is compared cell by cell
+with the current raw csv formatted data and the number of pages extracted per
+second is reported, so the default backend can be switched once a faster one
+matches.
+
+    python pdf_backend_harness.py --backends camelot pdfplumber
+"""
+
+# stdlib imports
+import io
+import time
+import argparse
+from typing import Any, Callable
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import raw_data_constants as RAW_C
+import directory_constants as DIR_C
+import raw_law_website_data_processing
+import pdf_table_backends
+import data_validation
+import util
+
+# number of example mismatched cells printed for each column
+NUM_EXAMPLE_MISMATCHES = 3
+
+# the pdf, pages, loader and current csv of each pdf year
+PDF_YEARS = {
+    2008: (
+        RAW_C.RAW_2008_LAW_WEBSITE_DATA_PDF,
+        55,
+        raw_law_website_data_processing.load_2008_law_website_pdf_data,
+        RAW_C.RAW_CSV_FORMATTED_2008_LAW_WEBSITE_DATA_CSV,
+    ),
+    2009: (
+        RAW_C.RAW_2009_LAW_WEBSITE_DATA_PDF,
+        21,
+        raw_law_website_data_processing.load_2009_law_website_pdf_data,
+        RAW_C.RAW_CSV_FORMATTED_2009_LAW_WEBSITE_DATA_CSV,
+    ),
+}
+
+
+def get_cell_mismatches(
+    df: pd.DataFrame, expected_df: pd.DataFrame
+) -> dict[str, list[tuple[int, Any, Any]]]:
+    """Compares a loaded dataframe with the current csv cell by cell.
+
+    The loaded dataframe is written to csv text and read back first so both
+    have the dtypes the csv round trip gives.
+
+    Parameters
+    ----------
+    df
+        The dataframe loaded with a backend.
+    expected_df
+        The dataframe loaded from the current csv.
+
+    Returns
+    -------
+    dict[str, list[tuple[int, Any, Any]]]
+        The row, backend value and csv value of every mismatched cell of each
+        column with a mismatch.
+    """
+    df = pd.read_csv(io.StringIO(df.to_csv(index=False)))
+    num_rows = max(df.shape[0], expected_df.shape[0])
+    mismatches = {}
+    for col in expected_df.columns.union(df.columns, sort=False):
+        values = df[col] if col in df.columns else pd.Series(dtype=object)
+        expected_values = (
+            expected_df[col] if col in expected_df.columns else pd.Series(dtype=object)
+        )
+        values = values.reindex(range(num_rows)).astype(object)
+        expected_values = expected_values.reindex(range(num_rows)).astype(object)
+        mismatch_mask = values.ne(expected_values) & ~(
+            values.isna() & expected_values.isna()
+        )
+        if mismatch_mask.any():
+            mismatches[col] = list(
+                zip(
+                    values.index[mismatch_mask],
+                    values[mismatch_mask],
+                    expected_values[mismatch_mask],
+                )
+            )
+    return mismatches
+
+
+def run_harness_year(
+    backend_name: str,
+    num_pages: int,
+    load_pdf_data: Callable[[str], pd.DataFrame],
+    csv_file_name: str,
+) -> None:
+    """Loads one year's pdf with a backend and prints its speed and how its
+    data differs from the current csv."""
+    start_time = time.perf_counter()
+    try:
+        df = load_pdf_data(backend_name)
+    except (ImportError, data_validation.ValidationError, AssertionError) as e:
+        print(f"  failed: {type(e).__name__}: {e}")
+        return
+    elapsed = time.perf_counter() - start_time
+    print(f"  {num_pages} pages in {elapsed:.2f}s, {num_pages / elapsed:.2f} pages/sec")
+
+    expected_df = util.load_df(
+        file_name=csv_file_name,
+        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+    )
+    mismatches = get_cell_mismatches(df, expected_df)
+    num_cells = max(df.shape[0], expected_df.shape[0]) * expected_df.shape[1]
+    num_mismatches = sum(len(col_mismatches) for col_mismatches in mismatches.values())
+    print(
+        f"  {df.shape[0]} rows ({expected_df.shape[0]} in the csv), "
+        f"{num_mismatches} of {num_cells} cells differ"
+    )
+    for col, col_mismatches in mismatches.items():
+        print(f"    {col!r}: {len(col_mismatches)} cells, e.g.")
+        for row, value, expected_value in col_mismatches[:NUM_EXAMPLE_MISMATCHES]:
+            print(f"      row {row}: {value!r}, csv has {expected_value!r}")
+
+
+def run_harness(backend_names: list[str], years: list[int]) -> None:
+    """Runs the comparison for every backend on each year's pdf that exists."""
+    for year in years:
+        pdf_file_name, num_pages, load_pdf_data, csv_file_name = PDF_YEARS[year]
+        pdf_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR / pdf_file_name
+        if not pdf_path.exists():
+            print(f"{year}: skipped, {pdf_path} does not exist")
+            continue
+        for backend_name in backend_names:
+            print(f"{year} with {backend_name}:")
+            run_harness_year(backend_name, num_pages, load_pdf_data, csv_file_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=sorted(pdf_table_backends.PDF_TABLE_BACKENDS),
+        default=sorted(pdf_table_backends.PDF_TABLE_BACKENDS),
+    )
+    parser.add_argument(
+        "--years",
+        nargs="+",
+        type=int,
+        choices=sorted(PDF_YEARS),
+        default=sorted(PDF_YEARS),
+    )
+    args = parser.parse_args()
+    run_harness(args.backends, args.years)
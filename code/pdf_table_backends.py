@@ -0,0 +1,94 @@
+""" This module contains the pluggable backends used to extract the tables in
+the 2008 and 2009 law website pdfs. Each backend reads the given pages of a
+pdf into one dataframe per page, with string cells ("" for empty cells) and
+integer column labels. The rows are the table rows as the backend sees them,
+including any header, tort status label and total rows, which the loaders in
+raw_law_website_data_processing find by their content.
+
+- camelot finds the table cells from the ruling lines of the page. It needs
+  ghostscript or pdfium and opencv, is slow and misaligns the fees and
+  primary cause columns, which the loaders have to re-split.
+- pdfplumber takes the columns from the ruling lines but the rows from the
+  text positions, so a missing horizontal line (like at the top of page 9 of
+  2009) doesn't merge rows, and the fees and primary cause columns come out
+  aligned.
+
+Compare the backends with pdf_backend_harness.py before changing
+DEFAULT_PDF_TABLE_BACKEND.
+"""
+
+# stdlib imports
+import pathlib
+from typing import Callable, NamedTuple
+
+# 3rd party imports
+import pandas as pd
+
+DEFAULT_PDF_TABLE_BACKEND = "camelot"
+
+# pdfplumber settings using the vertical ruling lines as column boundaries
+# and the text lines as rows
+PDFPLUMBER_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "text",
+}
+
+
+class PdfTableBackend(NamedTuple):
+    """A pdf table extraction backend.
+
+    read_tables takes the pdf path and the numbers of the pages to read,
+    starting from 1, and returns the table on each page.
+    misaligns_fee_and_primary_cause is True if the fees and primary cause
+    cells need to be re-split.
+    """
+
+    read_tables: Callable[[pathlib.Path, list[int]], list[pd.DataFrame]]
+    misaligns_fee_and_primary_cause: bool
+
+
+def read_camelot_tables(
+    pdf_path: pathlib.Path, page_nums: list[int]
+) -> list[pd.DataFrame]:
+    """Reads the table on each of the given pages of a pdf with camelot."""
+    import camelot
+
+    tables = camelot.read_pdf(
+        filepath=str(pdf_path), pages=",".join(map(str, page_nums))
+    )
+    return [table.df.copy() for table in tables]
+
+
+def read_pdfplumber_tables(
+    pdf_path: pathlib.Path, page_nums: list[int]
+) -> list[pd.DataFrame]:
+    """Reads the table on each of the given pages of a pdf with pdfplumber."""
+    import pdfplumber
+
+    table_dfs = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in page_nums:
+            page = pdf.pages[page_num - 1]
+            table = page.extract_table(PDFPLUMBER_TABLE_SETTINGS) or []
+            table_dfs.append(pd.DataFrame(table).fillna(""))
+    return table_dfs
+
+
+PDF_TABLE_BACKENDS = {
+    "camelot": PdfTableBackend(
+        read_tables=read_camelot_tables, misaligns_fee_and_primary_cause=True
+    ),
+    "pdfplumber": PdfTableBackend(
+        read_tables=read_pdfplumber_tables, misaligns_fee_and_primary_cause=False
+    ),
+}
+
+
+def get_pdf_table_backend(backend_name: str) -> PdfTableBackend:
+    """Returns the registered backend with the given name."""
+    if backend_name not in PDF_TABLE_BACKENDS:
+        raise ValueError(
+            f"Unknown pdf table backend {backend_name}, "
+            f"expected one of {sorted(PDF_TABLE_BACKENDS)}"
+        )
+    return PDF_TABLE_BACKENDS[backend_name]
@@ -0,0 +1,126 @@
+""" This module contains the checkpoints which let a long pipeline run resume
+where it stopped instead of starting over, e.g. after the 2008 pdf extraction
+or a FOIA sheet fails partway through.
+
+A stage of the pipeline, like processing the raw law website data, is split
+into units (its years, sheets or pdf pages) which are recorded as completed
+one at a time, along with whatever result the stage needs from a unit it
+skips. A run started with resume skips the units the last run of the stage
+completed, as long as it was run with the same arguments, and a run which
+finishes clears its checkpoint. Resuming assumes the inputs of the completed
+units haven't changed since they were checkpointed.
+
+Every checkpoint file is written through a temporary file, so a crash while
+recording a unit leaves the unit not completed rather than the checkpoint
+corrupted.
+
+    .checkpoints/<stage>/state.json
+    .checkpoints/<stage>/<unit>.pkl
+"""
+
+# stdlib imports
+import json
+import pickle
+import shutil
+import pathlib
+from typing import Any, Optional
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import util
+
+
+class PipelineCheckpoint:
+    """The completed units of a pipeline stage."""
+
+    def __init__(
+        self,
+        stage: str,
+        resume: bool = False,
+        run_args: Optional[dict[str, Any]] = None,
+        checkpoints_dir: pathlib.Path = DIR_C.CHECKPOINTS_DIR,
+    ):
+        """Loads the checkpoint of the last run of the stage if resuming,
+        otherwise clears it.
+
+        Parameters
+        ----------
+        stage
+            Name of the stage, also the name of its checkpoint directory.
+        resume
+            If True units the last run of the stage completed are skipped.
+        run_args
+            Json serializable arguments of the run. The last run's units are
+            only skipped if it was run with the same arguments.
+        checkpoints_dir
+            The directory the checkpoints are saved in.
+        """
+        self.stage = stage
+        self.stage_dir = checkpoints_dir / stage
+        # compared with the saved arguments after the same json round trip
+        self.run_args = json.loads(json.dumps(run_args or {}))
+        self.completed_units = []
+
+        state_path = self.stage_dir / STAN_C.CHECKPOINT_STATE_JSON
+        if resume and state_path.exists():
+            with open(state_path) as state_file:
+                state = json.load(state_file)
+            if state["run_args"] == self.run_args:
+                self.completed_units = state["completed_units"]
+                print(
+                    f"Resuming {stage} after {len(self.completed_units)} "
+                    "completed units"
+                )
+            else:
+                print(f"The last run of {stage} had different arguments, starting over")
+        if not self.completed_units:
+            self.clear()
+
+    def get_result_path(self, unit: Any) -> pathlib.Path:
+        """Returns the path the result of a unit is saved at."""
+        return self.stage_dir / f"{unit}.pkl"
+
+    def is_completed(self, unit: Any) -> bool:
+        """Returns True if the unit was completed by the run being resumed
+        or earlier in this run."""
+        return str(unit) in self.completed_units
+
+    def complete(self, unit: Any, result: Any = None) -> None:
+        """Records a unit as completed, saving its result first if given.
+
+        Parameters
+        ----------
+        unit
+            The unit, e.g. a data year or sheet name.
+        result
+            Picklable result of the unit to load when it is skipped.
+        """
+        self.stage_dir.mkdir(parents=True, exist_ok=True)
+        if result is not None:
+            with util.atomic_write_path(self.get_result_path(unit)) as temp_path, open(
+                temp_path, "wb"
+            ) as result_file:
+                pickle.dump(result, result_file, pickle.HIGHEST_PROTOCOL)
+
+        self.completed_units.append(str(unit))
+        state_path = self.stage_dir / STAN_C.CHECKPOINT_STATE_JSON
+        with util.atomic_write_path(state_path) as temp_path, open(
+            temp_path, "w"
+        ) as state_file:
+            json.dump(
+                {"run_args": self.run_args, "completed_units": self.completed_units},
+                state_file,
+                indent=2,
+            )
+
+    def load_result(self, unit: Any) -> Any:
+        """Loads the result saved when a completed unit was recorded."""
+        with open(self.get_result_path(unit), "rb") as result_file:
+            return pickle.load(result_file)
+
+    def clear(self) -> None:
+        """Clears the checkpoint of the stage, once the stage has finished or
+        when starting it over."""
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
+        self.completed_units = []
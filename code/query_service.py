@@ -0,0 +1,272 @@
+""" This module contains a small local HTTP service for querying the
+standardized data, built only on asyncio from the standard library. It loads
+the partitioned dataset into memory once and answers JSON requests so
+dashboards and notebooks don't each need to load the data themselves.
+
+Endpoints, all GET:
+- /rows returns the rows matching the filters, one page at a time.
+  Parameters: filters, columns (comma separated), offset and limit.
+- /aggregate returns roll-up totals from the aggregation cube.
+  Parameters: by (comma separated dimensions) and filters. The data
+  sources overlap, so data_source must be one of the dimensions or be
+  filtered to a single data source.
+- /version returns the version of the dataset currently loaded.
+
+filters is a JSON list of [column, operator, value] filters using the
+operators of standardized_data_query, e.g.
+
+    /rows?filters=[["city_department","==","POLICE"]]&limit=50
+
+The repetitive string columns are held in memory as codes into the global
+string dictionary (see string_dictionary), so filters on them are evaluated
+once per distinct value.
+
+Responses are kept in an LRU cache keyed on the request target. Before each
+request the service checks the modified times of the partition metadata and
+the aggregation cube. If either changed it reloads the dataset and clears
+the cache.
+"""
+
+# stdlib imports
+import json
+import asyncio
+import pathlib
+import argparse
+import collections
+import urllib.parse
+from typing import Any, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import standardized_data_query
+import partitioned_dataset
+import aggregation_cube
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# paging limits for /rows
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 10_000
+
+# number of responses kept in the LRU cache
+MAX_CACHED_RESPONSES = 256
+
+HTTP_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found"}
+
+
+class QueryServiceError(Exception):
+    """Error caused by a bad request, returned to the client as a 400."""
+
+
+class QueryService:
+    """Holds the loaded dataset and the response cache of the service.
+
+    Parameters
+    ----------
+    dataset_dir
+        The directory of the partitioned dataset.
+    cube_dir
+        The directory the aggregation cube is saved in.
+    """
+
+    def __init__(
+        self,
+        dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+        cube_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+    ):
+        self.dataset_dir = dataset_dir
+        self.cube_dir = cube_dir
+        self.dataset_version = None
+        self.df = pd.DataFrame()
+        self.response_cache = collections.OrderedDict()
+
+    def get_dataset_version(self) -> str:
+        """Returns a version string which changes whenever the partition
+        metadata or the aggregation cube is rewritten."""
+        version_parts = []
+        for file_path in [
+            self.dataset_dir / STAN_C.PARTITION_METADATA_JSON,
+            self.cube_dir / STAN_C.AGGREGATION_CUBE_CSV,
+        ]:
+            version_parts.append(
+                str(file_path.stat().st_mtime_ns) if file_path.exists() else "0"
+            )
+        return "-".join(version_parts)
+
+    def refresh(self) -> None:
+        """Reloads the dataset and clears the cache if its version changed."""
+        dataset_version = self.get_dataset_version()
+        if dataset_version == self.dataset_version:
+            return
+        self.df = partitioned_dataset.load_partitions(
+            dataset_dir=self.dataset_dir, encode_strings=True
+        )
+        self.response_cache.clear()
+        self.dataset_version = dataset_version
+        print(f"Loaded {self.df.shape[0]} rows, dataset version {dataset_version}")
+
+    def get_rows(self, params: dict[str, str]) -> dict[str, Any]:
+        """Returns one page of the rows matching the request's filters."""
+        filters = parse_filters(params)
+        columns = parse_list(params, "columns")
+        offset = parse_int(params, "offset", 0)
+        limit = min(parse_int(params, "limit", DEFAULT_PAGE_LIMIT), MAX_PAGE_LIMIT)
+
+        match_mask = pd.Series(True, index=self.df.index)
+        for col, operator, value in filters:
+            match_mask &= standardized_data_query.get_filter_mask(
+                self.df, col, operator, value
+            )
+        match_df = self.df[match_mask]
+        if columns is not None:
+            match_df = match_df.reindex(columns=columns)
+        page_df = match_df.iloc[offset : offset + limit]
+
+        return {
+            "total_rows": int(match_df.shape[0]),
+            "offset": offset,
+            "limit": limit,
+            "rows": json.loads(page_df.to_json(orient="records", date_format="iso")),
+        }
+
+    def get_aggregate(self, params: dict[str, str]) -> dict[str, Any]:
+        """Returns roll-up totals from the aggregation cube."""
+        by = parse_list(params, "by")
+        if not by:
+            raise QueryServiceError("by is required")
+        unknown_cols = set(by).difference(aggregation_cube.CUBE_DIMENSION_COLS)
+        if unknown_cols:
+            raise QueryServiceError(f"Can not aggregate by {sorted(unknown_cols)}")
+
+        rollup_df = aggregation_cube.rollup(by, parse_filters(params), self.cube_dir)
+        return {"rows": json.loads(rollup_df.to_json(orient="records"))}
+
+    def handle_request(self, target: str) -> tuple[int, bytes]:
+        """Answers a request, from the cache if possible.
+
+        Parameters
+        ----------
+        target
+            The request target, the path and query string.
+
+        Returns
+        -------
+        tuple[int, bytes]
+            The HTTP status code and JSON response body.
+        """
+        self.refresh()
+        if target in self.response_cache:
+            self.response_cache.move_to_end(target)
+            return self.response_cache[target]
+
+        url = urllib.parse.urlsplit(target)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        routes = {
+            "/rows": self.get_rows,
+            "/aggregate": self.get_aggregate,
+            "/version": lambda params: {},
+        }
+        if url.path not in routes:
+            return 404, json.dumps({"error": f"Unknown path {url.path}"}).encode()
+        try:
+            response = routes[url.path](params)
+        # a filter value the column can't be compared with raises a ValueError
+        # or TypeError
+        except (QueryServiceError, ValueError, TypeError) as e:
+            return 400, json.dumps({"error": str(e)}).encode()
+
+        response["version"] = self.dataset_version
+        status_and_body = 200, json.dumps(response).encode()
+        self.response_cache[target] = status_and_body
+        if len(self.response_cache) > MAX_CACHED_RESPONSES:
+            self.response_cache.popitem(last=False)
+
+        return status_and_body
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Reads a single HTTP request from a connection and answers it."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            # skip the headers
+            while (await reader.readline()).strip():
+                pass
+            if len(request_line) != 3 or request_line[0] != "GET":
+                status = 400
+                body = json.dumps({"error": "Only GET is supported"}).encode()
+            else:
+                status, body = self.handle_request(request_line[1])
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_STATUS_TEXT[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Loads the dataset then serves requests until cancelled."""
+        self.refresh()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def parse_filters(params: dict[str, str]) -> list[tuple[str, str, Any]]:
+    """Parses the JSON filters parameter of a request and checks the value
+    of each filter suits its operator."""
+    try:
+        filters = json.loads(params.get("filters", "[]"))
+    except json.JSONDecodeError as e:
+        raise QueryServiceError(f"filters is not valid JSON: {e}")
+    if not isinstance(filters, list) or not all(
+        isinstance(query_filter, list) and len(query_filter) == 3
+        for query_filter in filters
+    ):
+        raise QueryServiceError("filters must be a list of [column, operator, value]")
+    for col, operator, value in filters:
+        if not isinstance(col, str) or not isinstance(operator, str):
+            raise QueryServiceError("filter columns and operators must be strings")
+        try:
+            standardized_data_query.validate_filter(col, operator, value)
+        except ValueError as e:
+            raise QueryServiceError(str(e))
+    return [tuple(query_filter) for query_filter in filters]
+
+
+def parse_list(params: dict[str, str], name: str) -> Optional[list[str]]:
+    """Parses a comma separated parameter, None if it is missing."""
+    if name not in params:
+        return None
+    return [value for value in params[name].split(",") if value]
+
+
+def parse_int(params: dict[str, str], name: str, default: int) -> int:
+    """Parses a non-negative integer parameter."""
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise QueryServiceError(f"{name} must be an integer")
+    if value < 0:
+        raise QueryServiceError(f"{name} must not be negative")
+    return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(QueryService().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
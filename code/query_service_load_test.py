@@ -0,0 +1,115 @@
+""" This module is a load test for the query service in query_service.py. It
+sends a mix of row and aggregate requests to a running service from many
+concurrent connections and reports the p50 and p99 latency.
+
+Start the service first with
+
+    python query_service.py
+
+then run this module in another terminal.
+"""
+
+# stdlib imports
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import urllib.parse
+
+# repo specific imports
+import query_service
+
+# requests sent in a round robin, both filtered row pages and roll-ups
+LOAD_TEST_REQUESTS = [
+    "/rows?limit=100",
+    "/rows?offset=100&limit=100",
+    "/rows?"
+    + urllib.parse.urlencode(
+        {
+            "filters": json.dumps([["city_department", "==", "POLICE"]]),
+            "columns": "canonical_case_num,payment_recipient,payment_amount_cents",
+        }
+    ),
+    "/rows?"
+    + urllib.parse.urlencode(
+        {
+            "filters": json.dumps(
+                [
+                    ["payment_amount_cents", ">", 1_000_000_00],
+                    ["data_year", "between", [2015, 2021]],
+                ]
+            )
+        }
+    ),
+    "/aggregate?by=data_source,data_year",
+    "/aggregate?"
+    + urllib.parse.urlencode(
+        {
+            "by": "city_department,case_type",
+            "filters": json.dumps(
+                [["data_source", "==", "foia_cpd_payments_2004_to_2018"]]
+            ),
+        }
+    ),
+    "/aggregate?"
+    + urllib.parse.urlencode(
+        {
+            "by": "data_source,data_year",
+            "filters": json.dumps([["case_type", "==", "federal_civil_court"]]),
+        }
+    ),
+]
+
+
+async def timed_request(host: str, port: int, target: str) -> float:
+    """Sends a single GET request and returns how long it took in seconds."""
+    start_time = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    assert b" 200 " in status_line, f"{target} failed with {status_line!r}"
+
+    return time.perf_counter() - start_time
+
+
+async def run_load_test(
+    host: str, port: int, num_requests: int, concurrency: int
+) -> list[float]:
+    """Sends num_requests requests using concurrency connections at a time and
+    returns the latency of each one."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_request(target: str) -> float:
+        async with semaphore:
+            return await timed_request(host, port, target)
+
+    return await asyncio.gather(
+        *[
+            limited_request(LOAD_TEST_REQUESTS[i % len(LOAD_TEST_REQUESTS)])
+            for i in range(num_requests)
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=query_service.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=query_service.DEFAULT_PORT)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    latencies = asyncio.run(
+        run_load_test(args.host, args.port, args.requests, args.concurrency)
+    )
+    elapsed = time.perf_counter() - start_time
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requests in {elapsed:.2f}s")
+    print(f"{len(latencies) / elapsed:.0f} requests/sec")
+    print(f"p50 latency: {percentiles[49] * 1000:.2f}ms")
+    print(f"p99 latency: {percentiles[98] * 1000:.2f}ms")
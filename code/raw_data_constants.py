@@ -147,3 +147,17 @@ RAW_CSV_FORMATTED_2021_LAW_WEBSITE_DATA_CSV = (
 # ------------------------------------------------------------
 RAW_ARCHIVAL_SECTION_1983_DATA_EXCEL_FILE = "raw_archival_section_1983_data.xlsx"
 RAW_ARCHIVAL_SECTION_1983_DATA_EXCEL_SHEET = "Round1"
+
+##############################################################
+# ------------------------------------------------------------
+# Date Format Constants
+# - The formats of the date strings in each source, see date_parsing
+# ------------------------------------------------------------
+##############################################################
+
+# the 2008 and 2009 law website pdfs, e.g. "5-Jan-09"
+LAW_WEBSITE_PDF_DATE_FORMATS = ["%d-%b-%y"]
+# dates in the excel files are date cells, except for the odd text cell
+# like " 11/14/2014"
+LAW_WEBSITE_EXCEL_DATE_FORMATS = ["%m/%d/%Y"]
+FOIA_EXCEL_DATE_FORMATS = ["%m/%d/%Y"]
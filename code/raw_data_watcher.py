@@ -0,0 +1,332 @@
+""" This module watches the unmodified raw data directories and rebuilds only
+the outputs that depend on the raw files which changed, e.g. after dropping a
+refreshed 2021 workbook or a new FOIA response in with the same file name.
+
+    python raw_data_watcher.py
+
+Each changed raw file is mapped to the step that formats it as a csv, a
+changed law website year is re-standardized incrementally, any changed FOIA
+table re-standardizes the FOIA data, and the outputs built from all of the
+standardized data are rebuilt after them. Nothing else is rerun.
+
+Changes are found by comparing the modified time and size of the files in
+the watched directories, which only takes a stat of a couple dozen files. If
+the optional watchdog package is installed its native file notifications
+wake the watcher up as soon as a file changes, otherwise the directories are
+polled. Either way a rebuild only starts once no file has changed for the
+debounce time, so copying in several workbooks, or a large one being
+written, causes one rebuild rather than one per file system event.
+"""
+
+# stdlib imports
+import time
+import pathlib
+import argparse
+import functools
+import threading
+import traceback
+from typing import Callable, Optional
+
+# repo specific imports
+import raw_data_constants as RAW_C
+import directory_constants as DIR_C
+import raw_law_website_data_processing
+import raw_foia_data_processing
+import law_website_data_standardization
+import foia_data_standardization
+import case_lifecycle
+import payee_resolution
+import case_number_recovery
+import combined_data_export
+
+# directories which are watched
+WATCHED_DIRS = [
+    DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR,
+    DIR_C.RAW_UNMODIFIED_FOIA_DATA_DIR,
+]
+# seconds between polls, and between checks when notifications wake the
+# watcher up
+POLL_INTERVAL_SECONDS = 2.0
+NOTIFIED_POLL_INTERVAL_SECONDS = 60.0
+# seconds without changes before a rebuild starts
+DEBOUNCE_SECONDS = 5.0
+
+# dict of unmodified raw law website file to its data year
+LAW_WEBSITE_RAW_FILE_YEARS = {
+    RAW_C.RAW_2008_LAW_WEBSITE_DATA_PDF: 2008,
+    RAW_C.RAW_2009_LAW_WEBSITE_DATA_PDF: 2009,
+    RAW_C.RAW_2010_LAW_WEBSITE_DATA_EXCEL_FILE: 2010,
+    RAW_C.RAW_2011_LAW_WEBSITE_DATA_EXCEL_FILE: 2011,
+    RAW_C.RAW_2012_LAW_WEBSITE_DATA_EXCEL_FILE: 2012,
+    RAW_C.RAW_2013_LAW_WEBSITE_DATA_EXCEL_FILE: 2013,
+    RAW_C.RAW_2014_LAW_WEBSITE_DATA_EXCEL_FILE: 2014,
+    RAW_C.RAW_2015_LAW_WEBSITE_DATA_EXCEL_FILE: 2015,
+    RAW_C.RAW_2016_LAW_WEBSITE_DATA_EXCEL_FILE: 2016,
+    RAW_C.RAW_2017_LAW_WEBSITE_DATA_EXCEL_FILE: 2017,
+    RAW_C.RAW_2018_LAW_WEBSITE_DATA_EXCEL_FILE: 2018,
+    RAW_C.RAW_2019_LAW_WEBSITE_DATA_EXCEL_FILE: 2019,
+    RAW_C.RAW_2020_LAW_WEBSITE_DATA_EXCEL_FILE: 2020,
+    RAW_C.RAW_2021_LAW_WEBSITE_DATA_EXCEL_FILE: 2021,
+}
+# dict of unmodified raw FOIA file to the function formatting it as a csv
+FOIA_RAW_FILE_PROCESSING_FUNCS = {
+    RAW_C.RAW_TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_EXCEL_FILE: (
+        raw_foia_data_processing.save_csv_formatted_foia_tort_payments_data
+    ),
+    RAW_C.RAW_CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_EXCEL_FILE: (
+        raw_foia_data_processing.save_csv_formatted_foia_cpd_payments_data
+    ),
+    RAW_C.RAW_PENDING_POLICE_SUITS_FOIA_DATA_EXCEL_FILE: (
+        raw_foia_data_processing.save_csv_formatted_foia_pending_suits_data
+    ),
+    RAW_C.RAW_QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_EXCEL_FILE: (
+        raw_foia_data_processing.save_csv_formatted_quarterly_police_suit_disp_data
+    ),
+    RAW_C.RAW_QUARTERLY_MATTER_DISP_REPORT_FOIA_DATA_EXCEL_FILE: (
+        raw_foia_data_processing.save_csv_formatted_matter_disp_report_data
+    ),
+}
+# outputs built from all of the standardized data, in the order they are
+# rebuilt after any standardization
+ALL_DATA_REBUILD_STEPS = [
+    ("payee ids", payee_resolution.resolve_all_payees),
+    ("case number suggestions", case_number_recovery.suggest_all_case_nums),
+    ("combined data export", combined_data_export.export_combined_data),
+]
+
+
+def get_dir_snapshot(dirs: list[pathlib.Path]) -> dict[pathlib.Path, tuple[int, int]]:
+    """Returns the modified time and size of every file in the directories."""
+    snapshot = {}
+    for watched_dir in dirs:
+        if not watched_dir.exists():
+            continue
+        for file_path in watched_dir.iterdir():
+            # files can be removed between listing and stat-ing them
+            try:
+                file_stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+            if file_path.is_file():
+                snapshot[file_path] = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    return snapshot
+
+
+def get_changed_files(
+    old_snapshot: dict[pathlib.Path, tuple[int, int]],
+    new_snapshot: dict[pathlib.Path, tuple[int, int]],
+) -> set[pathlib.Path]:
+    """Returns the files added, changed or removed between two snapshots."""
+    return {
+        file_path
+        for file_path in old_snapshot.keys() | new_snapshot.keys()
+        if old_snapshot.get(file_path) != new_snapshot.get(file_path)
+    }
+
+
+def get_rebuild_steps(
+    changed_files: set[pathlib.Path],
+) -> list[tuple[str, Callable[[], object]]]:
+    """Maps changed raw files to the steps rebuilding the outputs which
+    depend on them.
+
+    Parameters
+    ----------
+    changed_files
+        Paths of the changed files.
+
+    Returns
+    -------
+    list[tuple[str, Callable[[], object]]]
+        List of (description, function) of the steps to run in order.
+        Empty if no output depends on the changed files.
+    """
+    changed_file_names = {file_path.name for file_path in changed_files}
+    changed_years = sorted(
+        data_year
+        for file_name, data_year in LAW_WEBSITE_RAW_FILE_YEARS.items()
+        if file_name in changed_file_names
+    )
+    changed_foia_files = [
+        file_name
+        for file_name in FOIA_RAW_FILE_PROCESSING_FUNCS
+        if file_name in changed_file_names
+    ]
+
+    rebuild_steps = []
+    law_website_processing_funcs = (
+        raw_law_website_data_processing.LAW_WEBSITE_PROCESSING_FUNCS
+    )
+    for data_year in changed_years:
+        rebuild_steps.append(
+            (
+                f"raw {data_year} law website data",
+                law_website_processing_funcs[data_year],
+            )
+        )
+    for file_name in changed_foia_files:
+        rebuild_steps.append(
+            (f"raw {file_name}", FOIA_RAW_FILE_PROCESSING_FUNCS[file_name])
+        )
+    if changed_years:
+        rebuild_steps.append(
+            (
+                f"standardized {', '.join(map(str, changed_years))} law website data",
+                functools.partial(
+                    law_website_data_standardization.clean_and_standardize_all_data,
+                    data_years=changed_years,
+                    incremental=True,
+                ),
+            )
+        )
+    if changed_foia_files:
+        rebuild_steps.append(
+            (
+                "standardized FOIA data",
+                foia_data_standardization.clean_and_standardize_all_foia_data,
+            )
+        )
+        rebuild_steps.append(
+            ("case lifecycles", case_lifecycle.build_all_case_lifecycles)
+        )
+    if rebuild_steps:
+        rebuild_steps += ALL_DATA_REBUILD_STEPS
+
+    return rebuild_steps
+
+
+def rebuild(changed_files: set[pathlib.Path]) -> None:
+    """Runs the steps rebuilding the outputs which depend on the changed
+    files. A failing step is reported and stops the rebuild but not the
+    watcher, so a half saved workbook can just be saved again."""
+    for file_path in sorted(changed_files):
+        print(f"Changed: {file_path.name}")
+    rebuild_steps = get_rebuild_steps(changed_files)
+    if not rebuild_steps:
+        print("No outputs depend on the changed files")
+        return
+
+    for description, rebuild_step in rebuild_steps:
+        print(f"Rebuilding {description}")
+        start_time = time.perf_counter()
+        try:
+            rebuild_step()
+        except Exception:
+            traceback.print_exc()
+            print(f"Rebuilding {description} failed, skipping the later steps")
+            return
+        print(f"Rebuilt {description} in {time.perf_counter() - start_time:.1f}s")
+
+
+def start_notifications(
+    dirs: list[pathlib.Path], changed_event: threading.Event
+) -> Optional["watchdog.observers.Observer"]:
+    """Starts native file notifications for the directories, which set the
+    event on any change. Returns the observer, or None if the optional
+    watchdog package is not installed."""
+    try:
+        import watchdog.events
+        import watchdog.observers
+    except ImportError:
+        return None
+
+    class ChangedEventHandler(watchdog.events.FileSystemEventHandler):
+        def on_any_event(self, event):
+            changed_event.set()
+
+    observer = watchdog.observers.Observer()
+    for watched_dir in dirs:
+        if watched_dir.exists():
+            observer.schedule(ChangedEventHandler(), str(watched_dir))
+    observer.start()
+
+    return observer
+
+
+def watch(
+    dirs: list[pathlib.Path] = WATCHED_DIRS,
+    poll_interval: float = POLL_INTERVAL_SECONDS,
+    debounce: float = DEBOUNCE_SECONDS,
+    use_notifications: bool = True,
+) -> None:
+    """Watches the directories and rebuilds the outputs which depend on the
+    files that change, until interrupted.
+
+    Parameters
+    ----------
+    dirs
+        The directories to watch.
+    poll_interval
+        Seconds between polls without native notifications.
+    debounce
+        Seconds without changes before a rebuild starts.
+    use_notifications
+        If True native file notifications are used when watchdog is
+        installed.
+    """
+    changed_event = threading.Event()
+    observer = start_notifications(dirs, changed_event) if use_notifications else None
+    if observer is not None:
+        # notifications wake the watcher, the rare poll is a safety net for
+        # file systems which don't send them
+        poll_interval = NOTIFIED_POLL_INTERVAL_SECONDS
+        print("Watching with native file notifications")
+    else:
+        print(f"Polling every {poll_interval}s")
+
+    snapshot = get_dir_snapshot(dirs)
+    # files changed since the last rebuild and when the last change was seen
+    pending_files = set()
+    last_change_time = None
+    try:
+        while True:
+            timeout = poll_interval
+            if pending_files:
+                timeout = min(poll_interval, debounce)
+            changed_event.wait(timeout)
+            changed_event.clear()
+
+            new_snapshot = get_dir_snapshot(dirs)
+            changed_files = get_changed_files(snapshot, new_snapshot)
+            snapshot = new_snapshot
+            if changed_files:
+                pending_files |= changed_files
+                last_change_time = time.monotonic()
+            elif pending_files and time.monotonic() - last_change_time >= debounce:
+                rebuild(pending_files)
+                pending_files = set()
+                # files changed during the rebuild are picked up next poll
+    except KeyboardInterrupt:
+        print("Stopped watching")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLL_INTERVAL_SECONDS,
+        help="seconds between polls when native notifications aren't used",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEBOUNCE_SECONDS,
+        help="seconds without changes before a rebuild starts",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="poll even if watchdog is installed",
+    )
+    args = parser.parse_args()
+    watch(
+        poll_interval=args.interval,
+        debounce=args.debounce,
+        use_notifications=not args.poll,
+    )
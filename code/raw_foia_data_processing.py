@@ -7,6 +7,7 @@ in string columns and column names.
 
 # stdlib imports
 import typing
+import argparse
 
 # 3rd party imports
 import pandas as pd
@@ -14,8 +15,15 @@ import pandas as pd
 # repo specific imports
 import directory_constants as DIR_C
 import raw_data_constants as RAW_C
+import money_parsing
+import date_parsing
+import data_validation
+import pipeline_checkpoints
 import util
 
+# name of the checkpoint stage of the sheets
+RAW_FOIA_CHECKPOINT_STAGE = "raw_foia_data"
+
 
 def save_csv_formatted_foia_tort_payments_data() -> pd.DataFrame:
     """Loads the raw unmodified 2001 to 2007 tort payment data,
@@ -37,26 +45,16 @@ def save_csv_formatted_foia_tort_payments_data() -> pd.DataFrame:
         raw_foia_tort_payments_df,
     )
 
-    # do some value specific replacements
-    payment_replace_dict = {"NONE": 0}
-
-    raw_foia_tort_payments_df["PAYMENT AMOUNT ($)"].replace(
-        to_replace=payment_replace_dict,
-        inplace=True,
-    )
-    raw_foia_tort_payments_df["FEES & COSTS ($)"].replace(
-        to_replace=payment_replace_dict,
-        inplace=True,
-    )
-    # now convert to proper dtypes
-    raw_foia_tort_payments_df["PAYMENT AMOUNT ($)"] = pd.to_numeric(
-        raw_foia_tort_payments_df["PAYMENT AMOUNT ($)"]
-    )
-    raw_foia_tort_payments_df["FEES & COSTS ($)"] = pd.to_numeric(
-        raw_foia_tort_payments_df["FEES & COSTS ($)"]
-    )
-    raw_foia_tort_payments_df["DATE TO COMPTROLLER"] = pd.to_datetime(
-        raw_foia_tort_payments_df["DATE TO COMPTROLLER"]
+    # now convert to proper dtypes, NONE payments become 0 and the few fees
+    # with fractions of a cent (e.g. 0.009) are rounded to the nearest cent
+    for money_col in ["PAYMENT AMOUNT ($)", "FEES & COSTS ($)"]:
+        raw_foia_tort_payments_df[money_col] = money_parsing.cents_to_dollars(
+            money_parsing.to_cents(
+                raw_foia_tort_payments_df[money_col], round_fractions=True
+            )
+        )
+    raw_foia_tort_payments_df["DATE TO COMPTROLLER"] = date_parsing.to_datetime(
+        raw_foia_tort_payments_df["DATE TO COMPTROLLER"], RAW_C.FOIA_EXCEL_DATE_FORMATS
     )
 
     # now save to csv
@@ -90,8 +88,8 @@ def save_csv_formatted_foia_cpd_payments_data() -> pd.DataFrame:
     )
 
     # now convert to proper dtypes
-    raw_foia_cpd_payments_df["DATE TO COMPTROLLER"] = pd.to_datetime(
-        raw_foia_cpd_payments_df["DATE TO COMPTROLLER"]
+    raw_foia_cpd_payments_df["DATE TO COMPTROLLER"] = date_parsing.to_datetime(
+        raw_foia_cpd_payments_df["DATE TO COMPTROLLER"], RAW_C.FOIA_EXCEL_DATE_FORMATS
     )
 
     # now save to csv
@@ -160,21 +158,27 @@ def format_multitable_df(
     unformatted_df.columns = [f"col{num}" for num in range(unformatted_df.shape[1])]
     # now find the columns which correspond to header rows
     header_rows_df = unformatted_df.query("col0 == @header_row_value")
-    # assert all the header row cols have the same values
-    assert header_rows_df.apply(lambda col: col.eq(col.iloc[0]).all()).all(), (
-        "Not All of the columns identified as header rows"
-        f"using {header_row_value} are equal!"
+    # check all the header row cols have the same values
+    data_validation.validate_df(
+        header_rows_df,
+        rules=[
+            data_validation.ValidationRule(data_validation.CONSTANT, col)
+            for col in header_rows_df.columns
+        ],
+        table_name=f"header rows found using {header_row_value}",
     )
     header_cols = header_rows_df.iloc[0].tolist()
     # Now we assume the sub table name is right before the header
     subtable_names_df = unformatted_df.loc[header_rows_df.index - 1]
     # check only first column has values
-    assert subtable_names_df.iloc[:, 1:].isna().all().all(), (
-        "The subtable name rows have at least one non-empty value"
-        "in columns besides the first one"
-    )
-    assert subtable_names_df.iloc[:, 0].notna().all(), (
-        "The subtable name rows have at least one empty value" "in the first column"
+    data_validation.validate_df(
+        subtable_names_df,
+        rules=[data_validation.ValidationRule(data_validation.NOT_NULL, "col0")]
+        + [
+            data_validation.ValidationRule(data_validation.ALL_NULL, col)
+            for col in subtable_names_df.columns[1:]
+        ],
+        table_name="subtable name rows",
     )
     subtable_names = subtable_names_df["col0"].tolist()
     # now get the indices to slice up the unformatted dataframe
@@ -200,9 +204,16 @@ def format_multitable_df(
         formatted_df = formatted_df.append(df_slice, ignore_index=True)
 
     # sanity check that a header value is not in the formatted df
-    assert not formatted_df.iloc[:, 0].isin([header_row_value]).any(), (
-        f"There is still the header row value {header_row_value} in "
-        "the finished formatting dataframe"
+    data_validation.validate_df(
+        formatted_df,
+        rules=[
+            data_validation.ValidationRule(
+                data_validation.VALUE_NOT_IN,
+                formatted_df.columns[0],
+                [header_row_value],
+            )
+        ],
+        table_name="formatted multitable dataframe",
     )
 
     return formatted_df
@@ -242,10 +253,14 @@ def save_csv_formatted_quarterly_police_suit_disp_data() -> pd.DataFrame:
     return raw_foia_police_suits_disp_df
 
 
-def save_csv_formatted_matter_disp_report_data() -> typing.List[pd.DataFrame]:
+def save_csv_formatted_matter_disp_report_data(
+    checkpoint: typing.Optional[pipeline_checkpoints.PipelineCheckpoint] = None,
+) -> typing.List[pd.DataFrame]:
     """Loads the raw unmodified matter disposition data
     changes it into a workable dataframe formats,
-    saves each sheet as a csv then returns a list of the dataframes as well
+    saves each sheet as a csv then returns a list of the dataframes as well.
+    If a checkpoint is given each saved sheet is recorded in it by its csv
+    name, and sheets it already has are loaded from their csv instead
     """
     output_list = []
 
@@ -269,6 +284,15 @@ def save_csv_formatted_matter_disp_report_data() -> typing.List[pd.DataFrame]:
     ]
 
     for sheet_name, subtable_col_name, output_csv_name in sheet_save_list:
+        if checkpoint is not None and checkpoint.is_completed(output_csv_name):
+            print(f"Skipping {output_csv_name}, already saved")
+            output_list.append(
+                util.load_df(
+                    file_name=output_csv_name,
+                    save_dir=DIR_C.RAW_CSV_FORMATTED_FOIA_DATA_DIR,
+                )
+            )
+            continue
 
         unsplit_df = pd.read_excel(
             io=DIR_C.RAW_UNMODIFIED_FOIA_DATA_DIR.joinpath(
@@ -297,20 +321,57 @@ def save_csv_formatted_matter_disp_report_data() -> typing.List[pd.DataFrame]:
             file_name=output_csv_name,
             save_dir=DIR_C.RAW_CSV_FORMATTED_FOIA_DATA_DIR,
         )
+        if checkpoint is not None:
+            checkpoint.complete(output_csv_name)
 
     return output_list
 
 
-def raw_foia_data_processing_main() -> None:
+# dict of csv formatted file to the function saving it from a single sheet
+SINGLE_SHEET_PROCESSING_FUNCS = {
+    RAW_C.RAW_CSV_FORMATTED_TORT_PAYMENTS_2001_TO_2007_FOIA_DATA_CSV: (
+        save_csv_formatted_foia_tort_payments_data
+    ),
+    RAW_C.RAW_CSV_FORMATTED_CPD_PAYMENTS_2004_TO_2018_FOIA_DATA_CSV: (
+        save_csv_formatted_foia_cpd_payments_data
+    ),
+    RAW_C.RAW_CSV_FORMATTED_PENDING_POLICE_SUITS_FOTA_DATA_CSV: (
+        save_csv_formatted_foia_pending_suits_data
+    ),
+    RAW_C.RAW_CSV_FORMATTED_QUARTERLY_POLICE_SUIT_DISP_FOIA_DATA_CSV: (
+        save_csv_formatted_quarterly_police_suit_disp_data
+    ),
+}
+
+
+def raw_foia_data_processing_main(resume: bool = False) -> None:
     """Main function for the raw foia data processing module which
     processes all the unmodified raw data files and saves them in
-    a csv formatted version"""
-    save_csv_formatted_foia_tort_payments_data()
-    save_csv_formatted_foia_cpd_payments_data()
-    save_csv_formatted_foia_pending_suits_data()
-    save_csv_formatted_quarterly_police_suit_disp_data()
-    save_csv_formatted_matter_disp_report_data()
+    a csv formatted version. Each sheet is checkpointed once it is saved,
+    so with resume an interrupted run continues from the first unsaved one"""
+    checkpoint = pipeline_checkpoints.PipelineCheckpoint(
+        RAW_FOIA_CHECKPOINT_STAGE, resume
+    )
+    for (
+        output_csv_name,
+        save_csv_formatted_data,
+    ) in SINGLE_SHEET_PROCESSING_FUNCS.items():
+        if checkpoint.is_completed(output_csv_name):
+            print(f"Skipping {output_csv_name}, already saved")
+            continue
+        save_csv_formatted_data()
+        checkpoint.complete(output_csv_name)
+    save_csv_formatted_matter_disp_report_data(checkpoint)
+
+    checkpoint.clear()
 
 
 if __name__ == "__main__":
-    raw_foia_data_processing_main()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip the sheets an interrupted run already saved",
+    )
+    args = parser.parse_args()
+    raw_foia_data_processing_main(resume=args.resume)
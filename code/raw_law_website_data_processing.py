@@ -8,384 +8,523 @@ trailing whitespace from the values in string columns and column names.
 
 # stdlib imports
 import re
+import pathlib
+import argparse
 import collections
+from typing import Optional
 
 # 3rd party imports
 import pandas as pd
 import numpy as np
-import camelot
 
 # Repo specific
 import raw_data_constants as RAW_C
 import directory_constants as DIR_C
+import money_parsing
+import date_parsing
+import data_validation
+import pdf_table_backends
+import pipeline_checkpoints
 import util
 
 # pattern for splitting fee and primary cause columns in 2008 and 2009
 FEE_AND_PRIM_CASE_PAT = re.compile(r"\s*([,\d]+)\s*(.+)", flags=re.DOTALL)
 
+# text in the header row of the tables in the 2008 and 2009 pdfs
+PDF_HEADER_ROW_TEXT = "CASE #"
+# rows in the 2008 and 2009 pdfs labelling the rows after them as tort or
+# non-tort have one of these in their first cell and nothing else
+PDF_TORT_STATUS_LABELS = ["TORT", "NON-TORT"]
+# the total rows at the end of the 2008 and 2009 pdfs have a cell starting
+# with this
+PDF_TOTAL_ROW_PREFIX = "TOTAL "
+# patterns of the whole dollar totals in the text of the total rows, keyed on
+# the money column they are the total of
+PDF_TOTAL_PATS = {
+    "PAYMENT AMOUNT($)": re.compile(
+        r"TOTAL JUDGMENT/VERDICTS & SETTLEMENTS\s+([,\d]+)"
+    ),
+    "FEES & COSTS($)": re.compile(r"TOTAL FEES AND COSTS\s+([,\d]+)"),
+}
+# the printed totals are of the amounts before they were rounded to the whole
+# dollars most cells show, so the parsed amounts can add up to a few dollars
+# off them (the 2009 payments add up to $5.75 more). Larger differences mean
+# cells were dropped or misread
+PDF_TOTAL_TOLERANCE = 25
+
+# the dtypes of the 2008 and 2009 pdf data
+PDF_DF_COL_TYPES = collections.OrderedDict(
+    {
+        "CASE #": str,
+        "PAYEE": str,
+        "PAYMENT AMOUNT($)": float,
+        "FEES & COSTS($)": float,
+        "PRIMARY CAUSE": str,
+        "CITY DEPARTMENT INVOLVED": str,
+        "DISPOSITION": str,
+        "DATE TO COMPTROLLER": "datetime64[ns]",
+        "Tort Status": str,
+        "pdf_page_num": int,
+    }
+)
+PDF_TABLE_COLS = list(PDF_DF_COL_TYPES.keys())[:8]
+
+
+def get_pdf_table_data_rows(
+    table_df: pd.DataFrame, tort_status: str
+) -> tuple[pd.DataFrame, str, str]:
+    """Drops the header, tort status label, total and empty rows of a table
+    read from a 2008 or 2009 pdf page and adds the tort status of the
+    remaining data rows. The rows are found by their content since each pdf
+    table backend (and version of it) splits and merges them differently.
+
+    Parameters
+    ----------
+    table_df
+        The table read from the page by a pdf table backend.
+    tort_status
+        The tort status of the rows at the start of the page, the status of
+        the last label on the pages before.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, str, str]
+        The data rows with a tort status column and a fresh index, the tort
+        status at the end of the page and the text of the page's total rows,
+        empty if it has none.
+    """
+    cells_df = table_df.astype(str).apply(lambda col: col.str.strip())
+    # everything up to the header row is part of the header
+    header_positions = np.flatnonzero(
+        cells_df.apply(
+            lambda col: col.str.contains(PDF_HEADER_ROW_TEXT, regex=False)
+        ).any(axis=1)
+    )
+    first_body_position = header_positions[0] + 1 if len(header_positions) else 0
+
+    data_positions = []
+    tort_statuses = []
+    total_cells = []
+    for position in range(first_body_position, cells_df.shape[0]):
+        cells = cells_df.iloc[position]
+        if cells.eq("").all():
+            continue
+        if cells.str.startswith(PDF_TOTAL_ROW_PREFIX).any():
+            total_cells += cells[cells.ne("")].tolist()
+            continue
+        if cells.iloc[0] in PDF_TORT_STATUS_LABELS and cells.iloc[1:].eq("").all():
+            tort_status = cells.iloc[0]
+            continue
+        data_positions.append(position)
+        tort_statuses.append(tort_status)
+
+    data_df = table_df.iloc[data_positions].reset_index(drop=True)
+    data_df["Tort Status"] = tort_statuses
+
+    return data_df, tort_status, " ".join(" ".join(total_cells).split())
+
+
+def validate_pdf_totals(raw_df: pd.DataFrame, total_text: str, year: int) -> None:
+    """Checks the money columns of a 2008 or 2009 pdf add up to within
+    PDF_TOTAL_TOLERANCE dollars of the totals printed in its total rows, so
+    cells a pdf table backend dropped or misread don't go unnoticed.
+
+    Parameters
+    ----------
+    raw_df
+        The data from every page, with the money columns in dollars.
+    total_text
+        The text of the total rows of every page.
+    year
+        Year of the data, used in the validation error.
+    """
+    violations = []
+    for money_col, total_pat in PDF_TOTAL_PATS.items():
+        total_match = total_pat.search(total_text)
+        if total_match is None:
+            violations.append(f"no {money_col} total in the total rows")
+            continue
+        printed_total = int(total_match.group(1).replace(",", ""))
+        parsed_total = int(money_parsing.to_cents(raw_df[money_col]).sum()) / 100
+        if abs(parsed_total - printed_total) > PDF_TOTAL_TOLERANCE:
+            violations.append(
+                f"{money_col} adds up to {parsed_total:,.2f}, the pdf total is "
+                f"{printed_total:,}"
+            )
 
-def process_2008_law_website_data() -> pd.DataFrame:
-    """Loads the raw 2008 settlement data from the law department website,
-    converts it from pdf to a pandas dataframe, then saves it as a csv
-    and returns the dataframe from the function
+    if violations:
+        raise data_validation.ValidationError(
+            f"The {year} pdf failed validation:\n" + "\n".join(violations)
+        )
+
+
+def load_law_website_pdf_data(
+    pdf_path: pathlib.Path,
+    year: int,
+    num_pages: int,
+    default_page_num_rows: int,
+    page_num_rows: dict[int, int],
+    first_non_tort_row: tuple[int, int],
+    cell_fixes: dict[tuple[int, int, str], str],
+    pdf_backend: str,
+    page_checkpoint: Optional[pipeline_checkpoints.PipelineCheckpoint] = None,
+) -> pd.DataFrame:
+    """Extracts the tables of a 2008 or 2009 law website pdf into a single
+    dataframe with the given pdf table backend.
+
+    Parameters
+    ----------
+    pdf_path
+        Path to the pdf.
+    year
+        Year of the data, used in validation errors.
+    num_pages
+        The number of pages with settlement tables at the start of the pdf.
+    default_page_num_rows
+        The number of data rows on a page.
+    page_num_rows
+        The number of data rows on the pages which differ from the default.
+    first_non_tort_row
+        The page number and position on that page of the first non-tort row.
+    cell_fixes
+        Values replacing cells the pdf cuts off, keyed on the page number,
+        position on the page and column.
+    pdf_backend
+        The name of the pdf table backend in pdf_table_backends to use.
+    page_checkpoint
+        Optional checkpoint each processed page is recorded in. Pages it
+        already has are loaded from it instead of being read again.
+
+    Returns
+    -------
+    pd.DataFrame
+        The data from every page.
     """
-    # get the path to the pdf
-    raw_2008_pdf_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-        RAW_C.RAW_2008_LAW_WEBSITE_DATA_PDF
-    )
-    # use camelot to convert the first 55 pages tables to dataframes
-    tables = camelot.read_pdf(filepath=str(raw_2008_pdf_path), pages="1-55")
-    first_page_header_string = (
-        "PAYMENT \nFEES & \nCITY \nDATE \nAMOUNT \nCOSTS "
-        "\nDEPARTMENT \nTO \nCASE # \nPAYEE \n($) \n($) \nPRIMARY CAUSE "
-        "\nINVOLVED \nDISPOSITION \nCOMPTROLLER \nTORT"
-    )
-    # expected headers for all pages besides the first
-    non_first_page_header_string = (
-        "PAYMENT \nFEES & \nCITY \nDATE "
-        "\nDEPARTMENT \nTO \nAMOUNT \nCOSTS \nINVOLVED \nDISPOSITION "
-        "\nCOMPTROLLER \nCASE # \nPAYEE \n($) \n($) \nPRIMARY CAUSE"
-    )
-    # define the dtypes
-    raw_2008_df_col_types = collections.OrderedDict(
-        {
-            "CASE #": str,
-            "PAYEE": str,
-            "PAYMENT AMOUNT($)": int,
-            "FEES & COSTS($)": int,
-            "PRIMARY CAUSE": str,
-            "CITY DEPARTMENT INVOLVED": str,
-            "DISPOSITION": str,
-            "DATE TO COMPTROLLER": np.datetime64,
-            "Tort Status": str,
-            "pdf_page_num": int,
-        }
-    )
-    raw_2008_df_cols = raw_2008_df_col_types.keys()
-
-    # special replacements for the payment amount column
-    payment_amount_replacements = {
-        "A \n5,694": "5694",
-        "S \n76,000": "76000",
-        "(181)": "-181",
-        "(2,374)": "-2374",
-    }
-    # create an empty dataframe
-    raw_2008_df = pd.DataFrame(columns=raw_2008_df_cols)
-    last_page = 55
-
-    # append all the pages' tables together
-    for index, table in enumerate(tables):
-        page_num = index + 1
-        # extract the table as a dataframe
-        table_df = table.df
-
-        # check every cell besides first one on first row is empty string
-        assert table_df.iloc[0].iloc[1:].eq("").all()
-        if page_num == 1:
-            assert table_df.iloc[0][0] == first_page_header_string
-        else:
-            assert table_df.iloc[0][0] == non_first_page_header_string
-        # now drop that first row
-        table_df = table_df.drop(index=[0])
-
-        # special shape on first pass
-        # check the first row is just the header values in one cell
-        if page_num == 1:
-            assert table_df.shape == (44, 8)
-            table_df["Tort Status"] = "TORT"
-        # special rules for last page
-        elif page_num == last_page:
-            assert table_df.shape == (47, 8)
-            # make everything after 37 non tort and everything before tort
-            assert table_df[0].loc[37] == "NON-TORT"
-            assert table_df.loc[47][0] == (
-                "TOTAL JUDGMENT/VERDICTS & "
-                "SETTLEMENTS \n129,670,864 \nTOTAL FEES AND COSTS \n6,903,180"
+    backend = pdf_table_backends.get_pdf_table_backend(pdf_backend)
+
+    page_dfs = []
+    total_texts = []
+    tort_status = PDF_TORT_STATUS_LABELS[0]
+    non_tort_page_num, non_tort_position = first_non_tort_row
+    for page_num in range(1, num_pages + 1):
+        if page_checkpoint is not None and page_checkpoint.is_completed(page_num):
+            table_df, tort_status, total_text = page_checkpoint.load_result(page_num)
+            page_dfs.append(table_df)
+            total_texts.append(total_text)
+            continue
+
+        # the pages are read one at a time so a failure only loses the page
+        # it happened on
+        table_dfs = backend.read_tables(pdf_path, [page_num])
+        if len(table_dfs) != 1:
+            raise data_validation.ValidationError(
+                f"{pdf_backend} read {len(table_dfs)} tables from page "
+                f"{page_num} of the {year} pdf, expected 1"
             )
-            table_df.loc[:37, "Tort Status"] = "TORT"
-            table_df.loc[37:, "Tort Status"] = "NON-TORT"
-            # drop the non tort lable row and the last one
-            table_df = table_df.drop(index=[37, 47])
-        else:
-            # special shape on some pages with 50 rows instead of 51
-            if page_num in [12, 41, 47, 49, 51, 53]:
-                assert table_df.shape == (49, 8)
-            else:
-                assert table_df.shape == (50, 8)
-            table_df["Tort Status"] = "TORT"
+        # the header row is only sure to be on the first page, the other
+        # pages repeat it or not depending on the backend
+        if page_num == 1 and not (
+            table_dfs[0]
+            .astype(str)
+            .apply(lambda col: col.str.contains(PDF_HEADER_ROW_TEXT, regex=False))
+            .any(axis=None)
+        ):
+            raise data_validation.ValidationError(
+                f"{pdf_backend} read no header row from page 1 of the {year} pdf"
+            )
+        table_df, tort_status, total_text = get_pdf_table_data_rows(
+            table_dfs[0], tort_status
+        )
 
+        # check the number of rows and that the rows before the non-tort
+        # label are tort and the ones after non-tort
+        page_rules = data_validation.get_shape_rules(
+            page_num_rows.get(page_num, default_page_num_rows), 9
+        )
+        if page_num == non_tort_page_num:
+            page_rules += [
+                data_validation.ValidationRule(
+                    data_validation.VALUE_AT,
+                    "Tort Status",
+                    (non_tort_position - 1, "TORT"),
+                ),
+                data_validation.ValidationRule(
+                    data_validation.VALUE_AT,
+                    "Tort Status",
+                    (non_tort_position, "NON-TORT"),
+                ),
+            ]
+        else:
+            page_rules.append(
+                data_validation.ValidationRule(
+                    data_validation.VALUE_IN,
+                    "Tort Status",
+                    ["TORT" if page_num < non_tort_page_num else "NON-TORT"],
+                )
+            )
+        data_validation.validate_df(
+            table_df, page_rules, table_name=f"{year} pdf page {page_num}"
+        )
         table_df["pdf_page_num"] = page_num
 
         # rename the column
-        table_df.columns = raw_2008_df_cols
+        table_df.columns = PDF_DF_COL_TYPES.keys()
+
+        # specific value renames since the value was cutoff
+        for (fix_page_num, position, col), value in cell_fixes.items():
+            if fix_page_num == page_num:
+                table_df.loc[position, col] = value
+
         # fix the issue with the fees and primary cause column getting jumbled
-        table_df[["FEES & COSTS($)", "PRIMARY CAUSE"]] = (
-            table_df["FEES & COSTS($)"]
-            .str.cat(table_df["PRIMARY CAUSE"])
-            .str.extract(FEE_AND_PRIM_CASE_PAT)
+        data_validation.validate_df(
+            table_df,
+            rules=[
+                data_validation.ValidationRule(
+                    data_validation.NOT_NULL, "FEES & COSTS($)"
+                )
+            ],
+            table_name=f"{year} pdf page {page_num}",
         )
+        if backend.misaligns_fee_and_primary_cause:
+            table_df[["FEES & COSTS($)", "PRIMARY CAUSE"]] = (
+                table_df["FEES & COSTS($)"]
+                .astype(str)
+                .str.cat(table_df["PRIMARY CAUSE"])
+                .str.extract(FEE_AND_PRIM_CASE_PAT)
+            )
 
-        # do special replacements and convert the numerical columns
-        table_df["FEES & COSTS($)"] = (
-            table_df["FEES & COSTS($)"].str.replace(",", "").astype(int)
-        )
-        table_df["PAYMENT AMOUNT($)"].replace(
-            payment_amount_replacements,
-            inplace=True,
-        )
-        table_df["PAYMENT AMOUNT($)"] = (
-            table_df["PAYMENT AMOUNT($)"].str.replace(",", "").astype(int)
-        )
+        # convert the money columns
+        for money_col in ["PAYMENT AMOUNT($)", "FEES & COSTS($)"]:
+            table_df[money_col] = money_parsing.cents_to_dollars(
+                money_parsing.to_cents(table_df[money_col])
+            )
 
-        # now append
-        raw_2008_df = raw_2008_df.append(table_df, ignore_index=True)
+        page_dfs.append(table_df)
+        total_texts.append(total_text)
+        if page_checkpoint is not None:
+            page_checkpoint.complete(page_num, (table_df, tort_status, total_text))
 
+    raw_df = pd.concat(page_dfs, ignore_index=True)
+    validate_pdf_totals(raw_df, " ".join(total_texts), year)
     # convert to datetime
-    raw_2008_df["DATE TO COMPTROLLER"] = pd.to_datetime(
-        raw_2008_df["DATE TO COMPTROLLER"]
+    raw_df["DATE TO COMPTROLLER"] = date_parsing.to_datetime(
+        raw_df["DATE TO COMPTROLLER"], RAW_C.LAW_WEBSITE_PDF_DATE_FORMATS
     )
     # fix dtypes
-    raw_2008_df = raw_2008_df.astype(raw_2008_df_col_types)
+    raw_df = raw_df.astype(PDF_DF_COL_TYPES)
     # do whitespace fixing
-    raw_2008_df = util.strip_and_trim_whitespace(raw_2008_df)
+    raw_df = util.strip_and_trim_whitespace(raw_df)
 
-    # save to csv
-    util.save_df(
-        df=raw_2008_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2008_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
-
-    return raw_2008_df
+    return raw_df
 
 
-def process_2009_law_website_data() -> pd.DataFrame:
-    """Loads the raw 2009 settlement data from the law department website,
-    converts it from pdf to a pandas dataframe, then saves it as a csv
-    and returns the dataframe
+def load_2008_law_website_pdf_data(
+    pdf_backend: str = pdf_table_backends.DEFAULT_PDF_TABLE_BACKEND,
+    page_checkpoint: Optional[pipeline_checkpoints.PipelineCheckpoint] = None,
+) -> pd.DataFrame:
+    """Converts the raw 2008 settlement data pdf from the law department
+    website to a pandas dataframe with the given pdf table backend,
+    recording each page in page_checkpoint if given
     """
-    # get the path to the pdf
-    raw_2009_pdf_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-        RAW_C.RAW_2009_LAW_WEBSITE_DATA_PDF
-    )
-    # use camelot to convert the first 21 pages tables to dataframes
-    tables = camelot.read_pdf(filepath=str(raw_2009_pdf_path), pages="1-21")
-    first_page_header_string = (
-        "PAYMENT \nFEES & \nCITY \nDATE \nAMOUNT \nCOSTS "
-        "\nDEPARTMENT \nTO \nCASE # \nPAYEE \n($) \n($) \nPRIMARY CAUSE "
-        "\nINVOLVED \nDISPOSITION \nCOMPTROLLER \nTORT"
-    )
-
-    # the first pages table has less rows than normal
-    raw_2009_df_col_types = collections.OrderedDict(
-        {
-            "CASE #": str,
-            "PAYEE": str,
-            "PAYMENT AMOUNT($)": int,
-            "FEES & COSTS($)": int,
-            "PRIMARY CAUSE": str,
-            "CITY DEPARTMENT INVOLVED": str,
-            "DISPOSITION": str,
-            "DATE TO COMPTROLLER": np.datetime64,
-            "Tort Status": str,
-            "pdf_page_num": int,
-        }
-    )
-    raw_2009_df_cols = raw_2009_df_col_types.keys()
-
-    # special replacements for the payment amount column
-    payment_amount_replacements = {
-        "(2,144)": "-2144",
-        "(14,405)": "-14405",
-        "(1,340)": "-1340",
-        "(1,000)": "-1000",
-        "(1,352)": "-1352",
-        "(1,353)": "-1353",
-        "(500)": "-500",
-        "(1,175)": "-1175",
-        "($550.23)": "550.23",
-        "$620.00": "620",
-        "$223.83": "223.83",
-        "$450.00": "450",
-        "$2,499.15": "2,499.15",
-    }
-
-    last_page = 21
-    raw_2009_df = pd.DataFrame(columns=raw_2009_df_cols)
-
-    # append all the pages' tables together
-    for index, table in enumerate(tables):
-        page_num = index + 1
-        # extract the table as a dataframe
-        table_df = table.df.copy()
-
-        # special shape on first pass
-        # check the first row is just the header values in one cell
-        if page_num == 1:
-            # check every cell besides first one on first row is empty string
-            assert table_df.iloc[0].iloc[1:].eq("").all()
-            assert table_df.iloc[0][0] == first_page_header_string
-            # now drop that first row
-            table_df = table_df.drop(index=[0])
-            assert table_df.shape == (46, 8)
-            table_df["Tort Status"] = "TORT"
-        # special rule for page 20 where there is a split of tort and non-tort
-        elif page_num == 20:
-            assert table_df.loc[25].iloc[0] == "NON-TORT"
-            table_df = table_df.drop(index=[25])
-            assert table_df.shape == (54, 8)
-            table_df.loc[:25, "Tort Status"] = "TORT"
-            table_df.loc[25:, "Tort Status"] = "NON-TORT"
-        # special rules for last page
-        elif page_num == last_page:
-            assert table_df.shape == (47, 8)
-            # check the last row is the sums
-            assert table_df.loc[46][0] == (
-                "TOTAL JUDGMENT/VERDICTS & "
-                "SETTLEMENTS \n51,155,053 \nTOTAL FEES AND COSTS \n7,660,924 "
-                "\nTOTAL JUDGMENT/VERDICTS, SETTLEMENTS, FEES AND COSTS \n58,815,977"
-            )
-            table_df["Tort Status"] = "NON-TORT"
-            # drop the non tort lable row and the last one
-            table_df = table_df.drop(index=[46])
-        else:
-            assert table_df.shape == (55, 8)
-            table_df["Tort Status"] = "TORT"
-        # add a page number
-        table_df["pdf_page_num"] = page_num
-
-        # rename the column
-        table_df.columns = raw_2009_df_cols
-
-        # specific value rename since the number was cutoff
-        if page_num == 9:
-            table_df.loc[13, "PAYMENT AMOUNT($)"] = "1395000"
+    return load_law_website_pdf_data(
+        pdf_path=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+            RAW_C.RAW_2008_LAW_WEBSITE_DATA_PDF
+        ),
+        year=2008,
+        num_pages=55,
+        default_page_num_rows=50,
+        # the first page has the header, the last the non-tort label and
+        # totals, and some pages have 49 rows instead of 50
+        page_num_rows={1: 44, 12: 49, 41: 49, 47: 49, 49: 49, 51: 49, 53: 49, 55: 45},
+        first_non_tort_row=(55, 36),
+        cell_fixes={},
+        pdf_backend=pdf_backend,
+        page_checkpoint=page_checkpoint,
+    )
+
+
+def load_2009_law_website_pdf_data(
+    pdf_backend: str = pdf_table_backends.DEFAULT_PDF_TABLE_BACKEND,
+    page_checkpoint: Optional[pipeline_checkpoints.PipelineCheckpoint] = None,
+) -> pd.DataFrame:
+    """Converts the raw 2009 settlement data pdf from the law department
+    website to a pandas dataframe with the given pdf table backend,
+    recording each page in page_checkpoint if given
+    """
+    return load_law_website_pdf_data(
+        pdf_path=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+            RAW_C.RAW_2009_LAW_WEBSITE_DATA_PDF
+        ),
+        year=2009,
+        num_pages=21,
+        default_page_num_rows=55,
+        # the first page has the header, page 20 the non-tort label and the
+        # last page the totals
+        page_num_rows={1: 46, 20: 54, 21: 46},
+        first_non_tort_row=(20, 25),
+        # the number was cutoff
+        cell_fixes={(9, 13, "PAYMENT AMOUNT($)"): "1395000"},
+        pdf_backend=pdf_backend,
+        page_checkpoint=page_checkpoint,
+    )
+
+
+def process_2008_law_website_data(
+    pdf_backend: str = pdf_table_backends.DEFAULT_PDF_TABLE_BACKEND,
+    save_csv: bool = True,
+    page_checkpoint: Optional[pipeline_checkpoints.PipelineCheckpoint] = None,
+) -> pd.DataFrame:
+    """Loads the raw 2008 settlement data from the law department website,
+    converts it from pdf to a pandas dataframe, then saves it as a csv unless
+    save_csv is False and returns the dataframe from the function. Each pdf
+    page is recorded in page_checkpoint if given
+    """
+    raw_2008_df = load_2008_law_website_pdf_data(pdf_backend, page_checkpoint)
 
-        # fix the issue with the fees and primary cause column getting jumbled
-        assert table_df["FEES & COSTS($)"].notna().all()
-        table_df[["FEES & COSTS($)", "PRIMARY CAUSE"]] = (
-            table_df["FEES & COSTS($)"]
-            .astype(str)
-            .str.cat(table_df["PRIMARY CAUSE"])
-            .str.extract(FEE_AND_PRIM_CASE_PAT)
+    # save to csv
+    if save_csv:
+        util.save_df(
+            df=raw_2008_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2008_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
         )
 
-        # do special replacements and convert the numerical columns
-        table_df["FEES & COSTS($)"] = (
-            table_df["FEES & COSTS($)"].str.replace(",", "").astype(int)
-        )
-        table_df["PAYMENT AMOUNT($)"].replace(
-            payment_amount_replacements,
-            inplace=True,
-        )
-        table_df["PAYMENT AMOUNT($)"] = (
-            table_df["PAYMENT AMOUNT($)"].str.replace(",", "").astype(float)
-        )
+    return raw_2008_df
 
-        # now append
-        raw_2009_df = raw_2009_df.append(table_df, ignore_index=True)
 
-    # convert to datetime
-    raw_2009_df["DATE TO COMPTROLLER"] = pd.to_datetime(
-        raw_2009_df["DATE TO COMPTROLLER"]
-    )
-    # fix dtypes
-    raw_2009_df = raw_2009_df.astype(raw_2009_df_col_types)
-    # do whitespace fixing
-    raw_2009_df = util.strip_and_trim_whitespace(raw_2009_df)
+def process_2009_law_website_data(
+    pdf_backend: str = pdf_table_backends.DEFAULT_PDF_TABLE_BACKEND,
+    save_csv: bool = True,
+    page_checkpoint: Optional[pipeline_checkpoints.PipelineCheckpoint] = None,
+) -> pd.DataFrame:
+    """Loads the raw 2009 settlement data from the law department website,
+    converts it from pdf to a pandas dataframe, then saves it as a csv unless
+    save_csv is False and returns the dataframe. Each pdf page is recorded in
+    page_checkpoint if given
+    """
+    raw_2009_df = load_2009_law_website_pdf_data(pdf_backend, page_checkpoint)
 
-    util.save_df(
-        df=raw_2009_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2009_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2009_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2009_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2009_df
 
 
-def process_2010_law_website_data() -> pd.DataFrame:
+def process_2010_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2010 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 3.
     # also make the first unskipped row the headers
+    raw_2010_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2010_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2010_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2010_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2010_excel_path,
         sheet_name=RAW_C.RAW_2010_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=3,
     )
     # verify there are 957 rows in total
-    assert raw_2010_df.shape == (957, 8)
+    data_validation.validate_df(
+        raw_2010_df,
+        rules=data_validation.get_shape_rules(957, 8),
+        table_name="raw 2010 law website data",
+        source_file=raw_2010_excel_path,
+    )
 
     # fix any whitespace issues
     raw_2010_df = util.strip_and_trim_whitespace(raw_2010_df)
 
-    util.save_df(
-        df=raw_2010_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2010_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2010_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2010_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2010_df
 
 
-def process_2011_law_website_data() -> pd.DataFrame:
+def process_2011_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2011 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 4.
     # also make the first unskipped row the headers
+    raw_2011_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2011_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2011_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2011_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2011_excel_path,
         sheet_name=RAW_C.RAW_2011_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=4,
     )
     # verify there are 935 rows in total
-    assert raw_2011_df.shape == (935, 8)
+    data_validation.validate_df(
+        raw_2011_df,
+        rules=data_validation.get_shape_rules(935, 8),
+        table_name="raw 2011 law website data",
+        source_file=raw_2011_excel_path,
+    )
 
     # fix any whitespace issues
     raw_2011_df = util.strip_and_trim_whitespace(raw_2011_df)
 
-    util.save_df(
-        df=raw_2011_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2011_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2011_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2011_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2011_df
 
 
-def process_2012_law_website_data() -> pd.DataFrame:
+def process_2012_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2012 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 6.
     # also make the first unskipped row the headers
+    raw_2012_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2012_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2012_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2012_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2012_excel_path,
         sheet_name=RAW_C.RAW_2012_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=6,
     )
-    # verify there are 919 rows in total
-    assert raw_2012_df.shape == (919, 8)
+    # verify there are 919 rows in total and where the tort and non tort
+    # label rows are
+    data_validation.validate_df(
+        raw_2012_df,
+        rules=data_validation.get_shape_rules(919, 8)
+        + [
+            data_validation.ValidationRule(
+                data_validation.VALUE_AT, "CASE #", (0, "TORT")
+            ),
+            data_validation.ValidationRule(
+                data_validation.VALUE_AT, "CASE #", (909, "NON-TORT")
+            ),
+        ],
+        table_name="raw 2012 law website data",
+        source_file=raw_2012_excel_path,
+    )
 
     # split into tort and non tort
-    assert raw_2012_df.loc[0, "CASE #"] == "TORT"
-    assert raw_2012_df.loc[909, "CASE #"] == "NON-TORT"
-
     raw_2012_df.loc[0:909, "Tort Status"] = "TORT"
     raw_2012_df.loc[909:, "Tort Status"] = "NON-TORT"
 
@@ -394,32 +533,40 @@ def process_2012_law_website_data() -> pd.DataFrame:
     # fix any whitespace issues
     raw_2012_df = util.strip_and_trim_whitespace(raw_2012_df)
 
-    util.save_df(
-        df=raw_2012_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2012_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2012_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2012_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2012_df
 
 
-def process_2013_law_website_data() -> pd.DataFrame:
+def process_2013_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2013 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 4.
     # also make the first unskipped row the headers
+    raw_2013_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2013_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2013_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2013_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2013_excel_path,
         sheet_name=RAW_C.RAW_2013_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=4,
     )
     # verify there are 1068 rows in total
-    assert raw_2013_df.shape == (1068, 9)
+    data_validation.validate_df(
+        raw_2013_df,
+        rules=data_validation.get_shape_rules(1068, 9),
+        table_name="raw 2013 law website data",
+        source_file=raw_2013_excel_path,
+    )
 
     # rename the last column to no name
     raw_2013_df.rename(columns={"Unnamed: 8": "Hidden Column"}, inplace=True)
@@ -427,260 +574,335 @@ def process_2013_law_website_data() -> pd.DataFrame:
     # fix any whitespace issues
     raw_2013_df = util.strip_and_trim_whitespace(raw_2013_df)
 
-    util.save_df(
-        df=raw_2013_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2013_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2013_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2013_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2013_df
 
 
-def process_2014_law_website_data() -> pd.DataFrame:
+def process_2014_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2014 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 3 rows and the last 654.
     # also make the first unskipped row the headers
+    raw_2014_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2014_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2014_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2014_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2014_excel_path,
         sheet_name=RAW_C.RAW_2014_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=3,
         skipfooter=654,
     )
-    # verify there are 1172 rows in total
-    assert raw_2014_df.shape == (1172, 13)
+    # verify there are 1172 rows in total and the comptroller column is empty
+    data_validation.validate_df(
+        raw_2014_df,
+        rules=data_validation.get_shape_rules(1172, 13)
+        + [
+            data_validation.ValidationRule(data_validation.ALL_NULL, "COMPTROLLER"),
+        ],
+        table_name="raw 2014 law website data",
+        source_file=raw_2014_excel_path,
+    )
 
     # drop the hidden comptroller column
-    assert raw_2014_df["COMPTROLLER"].isna().all()
     raw_2014_df.drop(columns=["COMPTROLLER"], inplace=True)
 
     for col in ["EFFECTIVE DATE\n", "DATE TO\nCOMPTROLLER", "DUE DATE"]:
-        raw_2014_df[col] = pd.to_datetime(raw_2014_df[col])
+        raw_2014_df[col] = date_parsing.to_datetime(
+            raw_2014_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2014_df = util.strip_and_trim_whitespace(raw_2014_df)
 
-    util.save_df(
-        df=raw_2014_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2014_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2014_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2014_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2014_df
 
 
-def process_2015_law_website_data() -> pd.DataFrame:
+def process_2015_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2015 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 6.
     # also make the first unskipped row the headers
+    raw_2015_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2015_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2015_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2015_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2015_excel_path,
         sheet_name=RAW_C.RAW_2015_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=6,
     )
-    # verify there are 1172 rows in total
-    assert raw_2015_df.shape == (1150, 8)
+    # verify there are 1150 rows in total
+    data_validation.validate_df(
+        raw_2015_df,
+        rules=data_validation.get_shape_rules(1150, 8),
+        table_name="raw 2015 law website data",
+        source_file=raw_2015_excel_path,
+    )
 
     for col in ["DATE TO\nCOMPTROLLER"]:
-        raw_2015_df[col] = pd.to_datetime(raw_2015_df[col])
+        raw_2015_df[col] = date_parsing.to_datetime(
+            raw_2015_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2015_df = util.strip_and_trim_whitespace(raw_2015_df)
 
-    util.save_df(
-        df=raw_2015_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2015_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2015_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2015_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2015_df
 
 
-def process_2016_law_website_data() -> pd.DataFrame:
+def process_2016_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2016 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 6.
     # also make the first unskipped row the headers
+    raw_2016_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2016_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2016_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2016_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2016_excel_path,
         sheet_name=RAW_C.RAW_2016_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=6,
     )
     # verify there are 946 rows in total
-    assert raw_2016_df.shape == (946, 8)
+    data_validation.validate_df(
+        raw_2016_df,
+        rules=data_validation.get_shape_rules(946, 8),
+        table_name="raw 2016 law website data",
+        source_file=raw_2016_excel_path,
+    )
 
     for col in ["DATE TO\nCOMPTROLLER"]:
-        raw_2016_df[col] = pd.to_datetime(raw_2016_df[col])
+        raw_2016_df[col] = date_parsing.to_datetime(
+            raw_2016_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2016_df = util.strip_and_trim_whitespace(raw_2016_df)
 
-    util.save_df(
-        df=raw_2016_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2016_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2016_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2016_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2016_df
 
 
-def process_2017_law_website_data() -> pd.DataFrame:
+def process_2017_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2017 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 6.
     # also make the first unskipped row the headers
+    raw_2017_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2017_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2017_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2017_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2017_excel_path,
         sheet_name=RAW_C.RAW_2017_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=6,
     )
     # verify there are 941 rows in total
-    assert raw_2017_df.shape == (941, 8)
+    data_validation.validate_df(
+        raw_2017_df,
+        rules=data_validation.get_shape_rules(941, 8),
+        table_name="raw 2017 law website data",
+        source_file=raw_2017_excel_path,
+    )
 
     for col in ["DATE TO\nCOMPTROLLER"]:
-        raw_2017_df[col] = pd.to_datetime(raw_2017_df[col])
+        raw_2017_df[col] = date_parsing.to_datetime(
+            raw_2017_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2017_df = util.strip_and_trim_whitespace(raw_2017_df)
 
-    util.save_df(
-        df=raw_2017_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2017_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2017_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2017_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2017_df
 
 
-def process_2018_law_website_data() -> pd.DataFrame:
+def process_2018_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2018 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 6.
     # also make the first unskipped row the headers
+    raw_2018_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2018_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2018_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2018_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2018_excel_path,
         sheet_name=RAW_C.RAW_2018_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=6,
     )
     # verify there are 913 rows in total
-    assert raw_2018_df.shape == (913, 8)
+    data_validation.validate_df(
+        raw_2018_df,
+        rules=data_validation.get_shape_rules(913, 8),
+        table_name="raw 2018 law website data",
+        source_file=raw_2018_excel_path,
+    )
 
     for col in ["DATE TO\nCOMPTROLLER"]:
-        raw_2018_df[col] = pd.to_datetime(raw_2018_df[col])
+        raw_2018_df[col] = date_parsing.to_datetime(
+            raw_2018_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2018_df = util.strip_and_trim_whitespace(raw_2018_df)
 
-    util.save_df(
-        df=raw_2018_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2018_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2018_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2018_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2018_df
 
 
-def process_2019_law_website_data() -> pd.DataFrame:
+def process_2019_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2019 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 7.
     # also make the first unskipped row the headers
+    raw_2019_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2019_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2019_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2019_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2019_excel_path,
         sheet_name=RAW_C.RAW_2019_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=7,
     )
     # verify there are 586 rows in total
-    assert raw_2019_df.shape == (586, 8)
+    data_validation.validate_df(
+        raw_2019_df,
+        rules=data_validation.get_shape_rules(586, 8),
+        table_name="raw 2019 law website data",
+        source_file=raw_2019_excel_path,
+    )
 
     for col in ["DATE TO\nCOMPTROLLER"]:
-        raw_2019_df[col] = pd.to_datetime(raw_2019_df[col])
+        raw_2019_df[col] = date_parsing.to_datetime(
+            raw_2019_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2019_df = util.strip_and_trim_whitespace(raw_2019_df)
 
-    util.save_df(
-        df=raw_2019_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2019_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2019_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2019_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2019_df
 
 
-def process_2020_law_website_data() -> pd.DataFrame:
+def process_2020_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2020 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 6.
     # also make the first unskipped row the headers
+    raw_2020_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2020_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2020_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2020_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2020_excel_path,
         sheet_name=RAW_C.RAW_2020_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
         skipfooter=6,
     )
     # verify there are 533 rows in total
-    assert raw_2020_df.shape == (533, 8)
+    data_validation.validate_df(
+        raw_2020_df,
+        rules=data_validation.get_shape_rules(533, 8),
+        table_name="raw 2020 law website data",
+        source_file=raw_2020_excel_path,
+    )
 
     for col in ["DATE TO\nCOMPTROLLER"]:
-        raw_2020_df[col] = pd.to_datetime(raw_2020_df[col])
+        raw_2020_df[col] = date_parsing.to_datetime(
+            raw_2020_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2020_df = util.strip_and_trim_whitespace(raw_2020_df)
 
-    util.save_df(
-        df=raw_2020_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2020_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2020_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2020_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2020_df
 
 
-def process_2021_law_website_data() -> pd.DataFrame:
+def process_2021_law_website_data(save_csv: bool = True) -> pd.DataFrame:
     """Loads the raw 2021 settlement data from the law department csv,
-    converts it to a properly formatted dataframe, saves to csv and returns it
+    converts it to a properly formatted dataframe, saves to csv unless save_csv is
+    False and returns it
     """
     # load the excel file and skip the first 4 rows and the last 7.
     # also make the first unskipped row the headers
+    raw_2021_excel_path = DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
+        RAW_C.RAW_2021_LAW_WEBSITE_DATA_EXCEL_FILE
+    )
     raw_2021_df = pd.read_excel(
-        io=DIR_C.RAW_UNMODIFIED_LAW_WEBSITE_DATA_DIR.joinpath(
-            RAW_C.RAW_2021_LAW_WEBSITE_DATA_EXCEL_FILE
-        ),
+        io=raw_2021_excel_path,
         sheet_name=RAW_C.RAW_2021_LAW_WEBSITE_DATA_EXCEL_SHEET,
         header=1,
         skiprows=4,
@@ -689,42 +911,92 @@ def process_2021_law_website_data() -> pd.DataFrame:
     # drop empty columns read in for some reason
     raw_2021_df.dropna(axis=1, inplace=True, how="all")
     # verify there are 473 rows in total
-    assert raw_2021_df.shape == (473, 8)
+    data_validation.validate_df(
+        raw_2021_df,
+        rules=data_validation.get_shape_rules(473, 8),
+        table_name="raw 2021 law website data",
+        source_file=raw_2021_excel_path,
+    )
 
     for col in ["DATE TO COMPTROLLER"]:
-        raw_2021_df[col] = pd.to_datetime(raw_2021_df[col])
+        raw_2021_df[col] = date_parsing.to_datetime(
+            raw_2021_df[col], RAW_C.LAW_WEBSITE_EXCEL_DATE_FORMATS
+        )
 
     # fix any whitespace issues
     raw_2021_df = util.strip_and_trim_whitespace(raw_2021_df)
 
-    util.save_df(
-        df=raw_2021_df,
-        file_name=RAW_C.RAW_CSV_FORMATTED_2021_LAW_WEBSITE_DATA_CSV,
-        save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
-    )
+    if save_csv:
+        util.save_df(
+            df=raw_2021_df,
+            file_name=RAW_C.RAW_CSV_FORMATTED_2021_LAW_WEBSITE_DATA_CSV,
+            save_dir=DIR_C.RAW_CSV_FORMATTED_LAW_WEBSITE_DATA_DIR,
+        )
 
     return raw_2021_df
 
 
-def raw_law_website_processing_main() -> None:
+# dict of data year to the function processing that year's raw data
+LAW_WEBSITE_PROCESSING_FUNCS = {
+    2008: process_2008_law_website_data,
+    2009: process_2009_law_website_data,
+    2010: process_2010_law_website_data,
+    2011: process_2011_law_website_data,
+    2012: process_2012_law_website_data,
+    2013: process_2013_law_website_data,
+    2014: process_2014_law_website_data,
+    2015: process_2015_law_website_data,
+    2016: process_2016_law_website_data,
+    2017: process_2017_law_website_data,
+    2018: process_2018_law_website_data,
+    2019: process_2019_law_website_data,
+    2020: process_2020_law_website_data,
+    2021: process_2021_law_website_data,
+}
+# years whose raw data is a pdf, processed and checkpointed page by page
+PDF_DATA_YEARS = [2008, 2009]
+
+# name of the checkpoint stage of the years, the pages of a pdf year are the
+# stage followed by the year
+RAW_LAW_WEBSITE_CHECKPOINT_STAGE = "raw_law_website_data"
+
+
+def raw_law_website_processing_main(resume: bool = False) -> None:
     """Main function for the raw_law_website_data_processing module
-    which creates cleaned csv versions of the data from 2008 to 2021
+    which creates cleaned csv versions of the data from 2008 to 2021.
+    Each year, and each page of the pdf years, is checkpointed once it is
+    done, so with resume an interrupted run continues from the first
+    unfinished one
     """
-    process_2008_law_website_data()
-    process_2009_law_website_data()
-    process_2010_law_website_data()
-    process_2011_law_website_data()
-    process_2012_law_website_data()
-    process_2013_law_website_data()
-    process_2014_law_website_data()
-    process_2015_law_website_data()
-    process_2016_law_website_data()
-    process_2017_law_website_data()
-    process_2018_law_website_data()
-    process_2019_law_website_data()
-    process_2020_law_website_data()
-    process_2021_law_website_data()
+    checkpoint = pipeline_checkpoints.PipelineCheckpoint(
+        RAW_LAW_WEBSITE_CHECKPOINT_STAGE, resume
+    )
+    for data_year, process_law_website_data in LAW_WEBSITE_PROCESSING_FUNCS.items():
+        if checkpoint.is_completed(data_year):
+            print(f"Skipping {data_year}, already processed")
+            continue
+
+        if data_year in PDF_DATA_YEARS:
+            page_checkpoint = pipeline_checkpoints.PipelineCheckpoint(
+                f"{RAW_LAW_WEBSITE_CHECKPOINT_STAGE}_{data_year}",
+                resume,
+                run_args={"pdf_backend": pdf_table_backends.DEFAULT_PDF_TABLE_BACKEND},
+            )
+            process_law_website_data(page_checkpoint=page_checkpoint)
+            page_checkpoint.clear()
+        else:
+            process_law_website_data()
+        checkpoint.complete(data_year)
+
+    checkpoint.clear()
 
 
 if __name__ == "__main__":
-    raw_law_website_processing_main()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip the years and pdf pages an interrupted run already processed",
+    )
+    args = parser.parse_args()
+    raw_law_website_processing_main(resume=args.resume)
@@ -0,0 +1,76 @@
+""" This module gives every standardized row a stable 64-bit record id so rows
+can be joined, deduplicated and updated downstream without matching on many
+columns.
+
+The record id is an unsigned 64-bit hash of the row's data source, its
+position in the original file and its key fields, computed for every row at
+once with pd.util.hash_pandas_object, which always uses the same hash key so
+the ids are the same on every run. Unsigned ids keep the same dtype in every
+file they're loaded from, so appending sources never turns them into floats.
+Rows of a data source with the same key fields as an earlier row are flagged
+as duplicates.
+"""
+
+# 3rd party imports
+import pandas as pd
+import numpy as np
+
+# repo specific imports
+import data_standardization_constants as STAN_C
+
+# the columns identifying a record, those a table has are its key fields
+RECORD_KEY_COLS = [
+    STAN_C.RAW_CASE_NUM_COL,
+    STAN_C.PAYMENT_RECIPIENT_COL,
+    STAN_C.CASE_NAME_COL,
+    STAN_C.PAYMENT_AMOUNT_COL,
+    STAN_C.FEES_AND_COSTS_COL,
+    STAN_C.PRIMARY_CAUSE_COL,
+    STAN_C.CITY_DEPARTMENT_INVOLVED_COL,
+    STAN_C.DISPOSITION_COL,
+    STAN_C.DATE_TO_COMPTROLLER_COL,
+    STAN_C.INCIDENT_DATE_COL,
+    STAN_C.DISPOSITION_DATE_COL,
+]
+
+
+def get_key_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hashes the key fields of each row. The fields are hashed as strings so
+    the hash doesn't depend on how a column happens to be typed."""
+    key_cols = [col for col in RECORD_KEY_COLS if col in df.columns]
+    return pd.util.hash_pandas_object(
+        df[key_cols].astype("string"), index=False
+    ).set_axis(df.index)
+
+
+def add_record_ids(df: pd.DataFrame, data_source: str) -> pd.DataFrame:
+    """Adds the record id and duplicate flag columns to a standardized table.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe with its rows in the order of the original
+        file.
+    data_source
+        The data source of the table.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataframe with a record id column and a column flagging the rows
+        whose key fields are the same as an earlier row's.
+    """
+    key_hashes = get_key_hashes(df)
+    record_id_parts_df = pd.DataFrame(
+        {
+            STAN_C.DATA_SOURCE_COL: data_source,
+            "source_row_num": np.arange(df.shape[0], dtype=np.uint64),
+            "key_hash": key_hashes.to_numpy(),
+        }
+    )
+    df[STAN_C.RECORD_ID_COL] = pd.util.hash_pandas_object(
+        record_id_parts_df, index=False
+    ).to_numpy()
+    df[STAN_C.DUPLICATE_RECORD_COL] = key_hashes.duplicated().to_numpy()
+
+    return df
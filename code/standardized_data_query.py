@@ -0,0 +1,397 @@
+""" This module contains a small query API over the partitioned standardized
+data. A query is a list of filters, each a tuple of (column, operator, value),
+and an optional list of columns to return. For example all POLICE federal
+civil court payments over $1M (the money columns are in cents) from 2015 to
+2021 is
+
+    query_standardized_data(
+        filters=[
+            ("city_department", "==", "POLICE"),
+            ("case_type", "==", "federal_civil_court"),
+            ("payment_amount_cents", ">", 1_000_000_00),
+            ("data_year", "between", (2015, 2021)),
+        ],
+        columns=["canonical_case_num", "payment_recipient", "payment_amount_cents"],
+    )
+
+The filters are pushed down to the partitioned dataset before anything is
+read:
+- Filters on the data source and data year prune partitions by their keys
+- Filters on other columns prune partitions using the min/max and value set
+  statistics saved in the partition metadata
+- Only the returned and filtered columns are read from the partitions that
+  are left
+Missing values never match a filter. Filter values are compared as numbers
+on numeric columns and as strings on string columns, so ("year_filed", "==",
+"2015") and ("year_filed", "==", 2015) match the same rows.
+"""
+
+# stdlib imports
+import numbers
+import pathlib
+from typing import Any, Callable, NamedTuple, Optional
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import partitioned_dataset
+
+# supported filter operators
+FILTER_OPERATORS = ["==", "!=", "<", "<=", ">", ">=", "in", "between"]
+
+# columns every partition is keyed on
+PARTITION_KEY_COLS = [STAN_C.DATA_SOURCE_COL, STAN_C.DATA_YEAR_COL]
+
+
+class QueryPlan(NamedTuple):
+    """The partitions and columns a query will read."""
+
+    partition_entries: list[dict[str, Any]]
+    columns: Optional[list[str]]
+    num_partitions_pruned: int
+
+
+def validate_filter(col: str, operator: str, value: Any) -> None:
+    """Checks a filter is well formed, raising a ValueError if not.
+
+    The operator must be one of FILTER_OPERATORS and the value a single
+    non-missing value, a list of them for "in" or a (low, high) pair of them
+    for "between".
+
+    Parameters
+    ----------
+    col
+        The column to filter on.
+    operator
+        The filter operator.
+    value
+        The value to compare against.
+    """
+    if operator not in FILTER_OPERATORS:
+        raise ValueError(f"Unsupported filter operator {operator}!")
+
+    if operator == "in":
+        if isinstance(value, (str, bytes)) or not isinstance(
+            value, (list, tuple, set, frozenset)
+        ):
+            raise ValueError(f"The value of the in filter on {col} must be a list!")
+        compared_values = list(value)
+    elif operator == "between":
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ValueError(
+                f"The value of the between filter on {col} must be a (low, high) pair!"
+            )
+        compared_values = list(value)
+    else:
+        compared_values = [value]
+
+    for compared_value in compared_values:
+        if not pd.api.types.is_scalar(compared_value) or pd.isna(compared_value):
+            raise ValueError(
+                f"Can not filter {col} on {compared_value!r}, filter values must be "
+                "non-missing numbers or strings"
+            )
+
+
+def check_single_data_source(
+    by: list[str], filters: Optional[list[tuple[str, str, Any]]]
+) -> None:
+    """Checks totals grouped by the given columns never add up rows of more
+    than one data source, raising a ValueError if they could.
+
+    The data sources overlap (e.g. the three matter disposition reports list
+    the same matters, and the FOIA CPD payments overlap the law website
+    years), so totals across them count the same rows more than once. The
+    data source must either be grouped by, or be filtered on with == or with
+    an in filter of a single data source.
+
+    Parameters
+    ----------
+    by
+        The columns the totals are grouped by.
+    filters
+        The (column, operator, value) filters of the totals.
+    """
+    if STAN_C.DATA_SOURCE_COL in by:
+        return
+    for col, operator, value in filters or []:
+        if col == STAN_C.DATA_SOURCE_COL and (
+            operator == "==" or (operator == "in" and len(set(value)) == 1)
+        ):
+            return
+
+    raise ValueError(
+        f"Group by {STAN_C.DATA_SOURCE_COL} or filter it to a single data source, "
+        "the data sources overlap so totals across them count the same rows "
+        "more than once"
+    )
+
+
+def to_filter_number(value: Any) -> numbers.Number:
+    """Converts a filter value compared with a numeric column to a number."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"Can not compare {value!r} with a numeric column!")
+    if not isinstance(value, numbers.Number):
+        raise ValueError(f"Can not compare {value!r} with a numeric column!")
+    return value
+
+
+def normalize_filter_value(
+    operator: str, value: Any, convert: Callable[[Any], Any]
+) -> Any:
+    """Converts a filter value, or each value of an "in" or "between" filter,
+    with convert, which is to_filter_number for numeric columns and str for
+    string columns."""
+    if operator in ["in", "between"]:
+        return [convert(compared_value) for compared_value in value]
+    return convert(value)
+
+
+def get_filter_mask(
+    df: pd.DataFrame,
+    col: str,
+    operator: str,
+    value: Any,
+) -> pd.Series:
+    """Gets the mask of the rows of a dataframe matching a single filter.
+
+    Parameters
+    ----------
+    df
+        The dataframe to filter.
+    col
+        The column to filter on.
+    operator
+        One of FILTER_OPERATORS.
+    value
+        The value to compare against. A collection of values for "in" and a
+        (low, high) tuple for the inclusive "between".
+
+    Returns
+    -------
+    pd.Series
+        Boolean mask which is True for matching rows.
+    """
+    validate_filter(col, operator, value)
+    if col not in df.columns:
+        return pd.Series(False, index=df.index)
+
+    values = df[col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # filter the distinct values once then look each row up by its code
+        categories_df = pd.DataFrame({col: values.cat.categories})
+        category_mask = get_filter_mask(categories_df, col, operator, value)
+        codes = values.cat.codes.to_numpy()
+        return pd.Series(category_mask.to_numpy()[codes] & (codes >= 0), index=df.index)
+
+    if pd.api.types.is_bool_dtype(values):
+        pass
+    elif pd.api.types.is_numeric_dtype(values):
+        value = normalize_filter_value(operator, value, to_filter_number)
+    elif pd.api.types.is_string_dtype(values):
+        value = normalize_filter_value(operator, value, str)
+
+    if operator == "==":
+        mask = values == value
+    elif operator == "!=":
+        mask = values != value
+    elif operator == "<":
+        mask = values < value
+    elif operator == "<=":
+        mask = values <= value
+    elif operator == ">":
+        mask = values > value
+    elif operator == ">=":
+        mask = values >= value
+    elif operator == "in":
+        mask = values.isin(list(value))
+    else:
+        low, high = value
+        mask = values.between(low, high)
+
+    return mask.fillna(False).astype(bool) & values.notna()
+
+
+def partition_may_match(
+    partition_entry: dict[str, Any],
+    col: str,
+    operator: str,
+    value: Any,
+) -> bool:
+    """Checks if a partition can have any rows matching a filter.
+
+    Uses only the partition's metadata entry, never its data. Returns True
+    whenever the statistics are not enough to rule the partition out.
+
+    Parameters
+    ----------
+    partition_entry
+        Metadata entry of the partition.
+    col
+        The column to filter on.
+    operator
+        One of FILTER_OPERATORS.
+    value
+        The value to compare against.
+
+    Returns
+    -------
+    bool
+        False only if no row in the partition can match the filter.
+    """
+    # partition keys are known exactly
+    if col in PARTITION_KEY_COLS:
+        key_df = pd.DataFrame({col: [partition_entry[col]]})
+        return bool(get_filter_mask(key_df, col, operator, value).iloc[0])
+
+    partition_stats = partition_entry.get("stats")
+    if partition_stats is None:
+        return True
+    col_stats = partition_stats.get(col)
+    # the column isn't in the partition or is all missing
+    if col_stats is None or col_stats["num_non_null"] == 0:
+        return False
+
+    if "min" in col_stats:
+        try:
+            value = normalize_filter_value(operator, value, to_filter_number)
+        except ValueError:
+            # the column is numeric in this partition only
+            return True
+        col_min, col_max = col_stats["min"], col_stats["max"]
+        if operator == "==":
+            return col_min <= value <= col_max
+        if operator == "!=":
+            return not col_min == col_max == value
+        if operator == "<":
+            return col_min < value
+        if operator == "<=":
+            return col_min <= value
+        if operator == ">":
+            return col_max > value
+        if operator == ">=":
+            return col_max >= value
+        if operator == "in":
+            return any(col_min <= in_value <= col_max for in_value in value)
+        low, high = value
+        return col_max >= low and col_min <= high
+
+    if "values" in col_stats:
+        value = normalize_filter_value(operator, value, str)
+        col_values = set(col_stats["values"])
+        if operator == "==":
+            return value in col_values
+        if operator == "!=":
+            return col_values != {value}
+        if operator == "in":
+            return not col_values.isdisjoint(value)
+
+    return True
+
+
+def plan_query(
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    columns: Optional[list[str]] = None,
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+) -> QueryPlan:
+    """Works out which partitions and columns a query needs to read.
+
+    Parameters
+    ----------
+    filters
+        List of (column, operator, value) filters which must all match.
+    columns
+        Columns to return. Returns every column if None.
+    dataset_dir
+        The directory of the partitioned dataset.
+
+    Returns
+    -------
+    QueryPlan
+        The partitions to read, the columns to read from them and how many
+        partitions were pruned.
+    """
+    filters = filters or []
+    for col, operator, value in filters:
+        validate_filter(col, operator, value)
+    all_entries = partitioned_dataset.load_partition_metadata(dataset_dir)
+    partition_entries = [
+        entry
+        for entry in all_entries
+        if all(
+            partition_may_match(entry, col, operator, value)
+            for col, operator, value in filters
+        )
+    ]
+    read_cols = None
+    if columns is not None:
+        filter_cols = [col for col, _, _ in filters]
+        read_cols = list(dict.fromkeys(columns + filter_cols))
+
+    return QueryPlan(
+        partition_entries=partition_entries,
+        columns=read_cols,
+        num_partitions_pruned=len(all_entries) - len(partition_entries),
+    )
+
+
+def query_standardized_data(
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    columns: Optional[list[str]] = None,
+    dataset_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_PARTITIONED_DATA_DIR,
+) -> pd.DataFrame:
+    """Returns the rows of the standardized data matching every filter.
+
+    Parameters
+    ----------
+    filters
+        List of (column, operator, value) filters which must all match.
+    columns
+        Columns to return. Returns every column if None.
+    dataset_dir
+        The directory of the partitioned dataset.
+
+    Returns
+    -------
+    pd.DataFrame
+        The matching rows with the requested columns.
+    """
+    query_plan = plan_query(filters, columns, dataset_dir)
+    if not query_plan.partition_entries:
+        if columns is None:
+            # every column of the dataset, in the order they are first seen
+            columns = list(
+                dict.fromkeys(
+                    col
+                    for entry in partitioned_dataset.load_partition_metadata(
+                        dataset_dir
+                    )
+                    for col in entry.get("stats", {})
+                )
+            )
+        return pd.DataFrame(columns=columns)
+
+    df = partitioned_dataset.load_partition_entries(
+        query_plan.partition_entries,
+        columns=query_plan.columns,
+        dataset_dir=dataset_dir,
+    )
+    match_mask = pd.Series(True, index=df.index)
+    for col, operator, value in filters or []:
+        match_mask &= get_filter_mask(df, col, operator, value)
+
+    result_df = df[match_mask].reset_index(drop=True)
+    if columns is not None:
+        result_df = result_df.reindex(columns=columns)
+
+    return result_df
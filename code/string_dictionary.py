@@ -0,0 +1,204 @@
+""" This module contains the global string dictionary shared by every source
+of the standardized data. The payee names, departments, dispositions, causes
+and other repetitive string columns are stored again in every year and every
+FOIA table. Loaded with the dictionary, each of those columns becomes a
+categorical whose codes index into the one dictionary, so the strings are
+held in memory once, sources can be appended without the categoricals
+falling back to strings, and joins and group-bys compare integer codes.
+
+The dictionary is saved in the cleaned and standardized data folder and is
+updated at the end of every standardization run. Strings are only ever
+appended to it, so the code of a string never changes.
+"""
+
+# stdlib imports
+import pathlib
+from typing import Iterable
+
+# 3rd party imports
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import util
+
+# string columns encoded with the dictionary
+DICTIONARY_ENCODED_COLS = [
+    STAN_C.PAYMENT_RECIPIENT_COL,
+    STAN_C.CITY_DEPARTMENT_INVOLVED_COL,
+    STAN_C.DISPOSITION_COL,
+    STAN_C.PRIMARY_CAUSE_COL,
+    STAN_C.CASE_TYPE_COL,
+    STAN_C.CASE_GOV_LEVEL_COL,
+    STAN_C.TORT_STATUS_COL,
+    STAN_C.DATA_SOURCE_COL,
+    STAN_C.PAYMENT_FUND_COL,
+    STAN_C.LAW_DEPT_MAIN_ASSIGNED_LAWYER_COL,
+    STAN_C.LAW_DEPT_DIVISION_COL,
+    STAN_C.CITY_ROLE_IN_LAWSUIT_COL,
+]
+# column of the saved dictionary, the code of a string is its row number
+DICTIONARY_VALUE_COL = "value"
+
+# dictionary loaded by load_string_dictionary along with the path and
+# modified time of the file it was loaded from
+_loaded_dictionary = {"file_key": None, "dictionary": None}
+
+
+def get_distinct_strings(df: pd.DataFrame) -> set[str]:
+    """Returns the distinct values of the dictionary encoded columns of a
+    dataframe as strings."""
+    distinct_strings = set()
+    for col in df.columns.intersection(DICTIONARY_ENCODED_COLS):
+        distinct_strings.update(df[col].dropna().astype(str).unique())
+    return distinct_strings
+
+
+def load_string_dictionary(
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.Index:
+    """Loads the string dictionary, reusing the last load if the file is
+    unchanged.
+
+    Parameters
+    ----------
+    save_dir
+        The directory the dictionary is saved in.
+
+    Returns
+    -------
+    pd.Index
+        The strings in code order, empty if the dictionary hasn't been built
+        yet.
+    """
+    dictionary_path = save_dir / STAN_C.STRING_DICTIONARY_CSV
+    if not dictionary_path.exists():
+        return pd.Index([], dtype=object)
+
+    file_key = (dictionary_path, dictionary_path.stat().st_mtime_ns)
+    if _loaded_dictionary["file_key"] != file_key:
+        # loaded as the exact text so e.g. "NONE" and "0931" stay as they are
+        _loaded_dictionary["dictionary"] = pd.Index(
+            pd.read_csv(dictionary_path, dtype=str, keep_default_na=False)[
+                DICTIONARY_VALUE_COL
+            ],
+            dtype=object,
+        )
+        _loaded_dictionary["file_key"] = file_key
+
+    return _loaded_dictionary["dictionary"]
+
+
+def update_string_dictionary(
+    distinct_strings: Iterable[str],
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.Index:
+    """Appends the strings the dictionary doesn't have yet and saves it.
+
+    Parameters
+    ----------
+    distinct_strings
+        Strings from get_distinct_strings.
+    save_dir
+        The directory the dictionary is saved in.
+
+    Returns
+    -------
+    pd.Index
+        The updated dictionary.
+    """
+    dictionary = load_string_dictionary(save_dir)
+    new_strings = sorted(set(distinct_strings).difference(dictionary))
+    if not new_strings:
+        return dictionary
+
+    dictionary = dictionary.append(pd.Index(new_strings, dtype=object))
+    util.save_df(
+        df=pd.DataFrame({DICTIONARY_VALUE_COL: dictionary}),
+        file_name=STAN_C.STRING_DICTIONARY_CSV,
+        save_dir=save_dir,
+    )
+    return dictionary
+
+
+def get_string_dictionary(
+    dfs: Iterable[pd.DataFrame],
+    save_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_DATA_DIR,
+) -> pd.Index:
+    """Returns the saved dictionary with any strings of the dataframes it
+    doesn't have yet appended, without saving them. The codes of the saved
+    strings are the same either way."""
+    dictionary = load_string_dictionary(save_dir)
+    new_strings = sorted(
+        set().union(*(get_distinct_strings(df) for df in dfs)).difference(dictionary)
+    )
+    return dictionary.append(pd.Index(new_strings, dtype=object))
+
+
+def get_string_codes(df: pd.DataFrame, dictionary: pd.Index) -> pd.DataFrame:
+    """Replaces the dictionary encoded columns of a dataframe with the codes
+    of their strings in the dictionary, -1 where missing. Dataframes of codes
+    append as cheaply as any integer columns, see codes_to_categoricals.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe.
+    dictionary
+        The dictionary from get_string_dictionary, which must have every
+        string of the dataframe's encoded columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataframe with its encoded columns as int32 codes.
+    """
+    code_cols = {}
+    for col in df.columns.intersection(DICTIONARY_ENCODED_COLS):
+        values = df[col].astype("string")
+        codes = dictionary.get_indexer(values.to_numpy(dtype=object, na_value=None))
+        assert (
+            codes[values.notna().to_numpy(dtype=bool)] >= 0
+        ).all(), f"Not every value of {col} is in the string dictionary!"
+        code_cols[col] = codes.astype("int32")
+
+    return df.assign(**code_cols)
+
+
+def codes_to_categoricals(df: pd.DataFrame, dictionary: pd.Index) -> pd.DataFrame:
+    """Converts the code columns from get_string_codes to categoricals with
+    the dictionary as their categories. Codes missing after appending
+    dataframes without the column are treated as -1."""
+    dictionary_dtype = pd.CategoricalDtype(dictionary)
+    return df.assign(
+        **{
+            col: pd.Categorical.from_codes(
+                df[col].fillna(-1).astype("int32"), dtype=dictionary_dtype
+            )
+            for col in df.columns.intersection(DICTIONARY_ENCODED_COLS)
+        }
+    )
+
+
+def encode_strings(df: pd.DataFrame, dictionary: pd.Index) -> pd.DataFrame:
+    """Converts the dictionary encoded columns of a dataframe to categoricals
+    with the dictionary as their categories.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe.
+    dictionary
+        The dictionary from get_string_dictionary, which must have every
+        string of the dataframe's encoded columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataframe with its encoded columns as categoricals whose codes
+        index into the dictionary. Dataframes encoded with the same
+        dictionary can be appended and keep their categoricals, though
+        appending the codes first and converting once is much faster.
+    """
+    return codes_to_categoricals(get_string_codes(df, dictionary), dictionary)
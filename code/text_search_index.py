@@ -0,0 +1,302 @@
+""" This module contains an inverted full-text index over the free text
+columns of the standardized data (case names, matter descriptions, primary
+causes and alternate disposition descriptions), so searching them for e.g.
+"false arrest" doesn't scan every row with a regex.
+
+The text is lower cased and split into tokens of letters and digits. The
+index saves a posting for every token of every row, the data source and
+record id of the row, the column and the token's position in it. The
+postings of each data source are saved in their own file and refreshed at
+the end of every standardization run, so re-standardizing a data source only
+rewrites its file. Loading the index merges every data source's file.
+
+Loaded, the postings are sorted by token, so the postings of a token, or of
+every token starting with a prefix, are one contiguous slice found with a
+binary search. Each posting is packed into one integer of its row, column
+and position, so rows with every token and phrases (the tokens at
+consecutive positions of the same column) are found by intersecting sorted
+integer arrays. Queries return record ids:
+
+    search_text("false arrest")
+    search_text("excess", mode="prefix")
+    search_text("excessive force", mode="phrase", cols=["extended_description"])
+"""
+
+# stdlib imports
+import re
+import pathlib
+from typing import Optional
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+
+# repo specific imports
+import directory_constants as DIR_C
+import data_standardization_constants as STAN_C
+import util
+
+# free text columns which are indexed
+TEXT_INDEX_COLS = [
+    STAN_C.CASE_NAME_COL,
+    STAN_C.EXTENDED_DESCRIPTION_COL,
+    STAN_C.PRIMARY_CAUSE_COL,
+    STAN_C.ALTERNATE_DISP_DESCRIPTION_COL,
+]
+# pattern of the tokens of lower cased text
+TOKEN_PAT = re.compile(r"[a-z0-9]+")
+# columns of the postings
+TEXT_COL = "text_col"
+POSITION_COL = "position"
+TOKEN_COL = "token"
+POSTING_COLS = [
+    STAN_C.DATA_SOURCE_COL,
+    STAN_C.RECORD_ID_COL,
+    TEXT_COL,
+    POSITION_COL,
+    TOKEN_COL,
+]
+# supported search modes
+SEARCH_MODES = ["tokens", "prefix", "phrase"]
+# a packed posting is the row, then 4 bits of column, then 20 bits of position
+ROW_SHIFT = 24
+COL_SHIFT = 20
+COL_MASK = (1 << (ROW_SHIFT - COL_SHIFT)) - 1
+POSITION_MASK = (1 << COL_SHIFT) - 1
+
+# index loaded by load_text_search_index along with the names and modified
+# times of the postings files it was loaded from
+_loaded_index = {"file_key": None, "index": None}
+
+
+def tokenize(text: str) -> list[str]:
+    """Returns the lower cased tokens of a text."""
+    return TOKEN_PAT.findall(text.lower())
+
+
+def get_postings(df: pd.DataFrame) -> pd.DataFrame:
+    """Gets the postings of the text columns of standardized rows.
+
+    Parameters
+    ----------
+    df
+        Standardized dataframe with data source and record id columns.
+        Text columns it doesn't have are skipped.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per token of every text with the POSTING_COLS.
+    """
+    col_postings_dfs = [pd.DataFrame(columns=POSTING_COLS)]
+    for text_col in df.columns.intersection(TEXT_INDEX_COLS):
+        tokens = df[text_col].dropna().astype(str).str.lower().str.findall(TOKEN_PAT)
+        tokens = tokens.explode().dropna()
+        col_postings_dfs.append(
+            pd.DataFrame(
+                {
+                    STAN_C.DATA_SOURCE_COL: df.loc[
+                        tokens.index, STAN_C.DATA_SOURCE_COL
+                    ],
+                    STAN_C.RECORD_ID_COL: df.loc[tokens.index, STAN_C.RECORD_ID_COL],
+                    TEXT_COL: text_col,
+                    POSITION_COL: tokens.groupby(level=0).cumcount(),
+                    TOKEN_COL: tokens,
+                }
+            )
+        )
+
+    return pd.concat(col_postings_dfs, ignore_index=True)
+
+
+class TextSearchIndex:
+    """In memory index of postings sorted by token."""
+
+    def __init__(self, postings_df: pd.DataFrame):
+        postings_df = postings_df.sort_values(TOKEN_COL, kind="stable")
+        row_codes, self.record_ids = pd.factorize(
+            postings_df[STAN_C.RECORD_ID_COL].to_numpy(dtype="uint64")
+        )
+        col_codes = pd.Categorical(
+            postings_df[TEXT_COL], categories=TEXT_INDEX_COLS
+        ).codes.astype("int64")
+        positions = postings_df[POSITION_COL].to_numpy(dtype="int64")
+        assert (
+            positions.max(initial=0) <= POSITION_MASK
+        ), "A text has too many tokens to index!"
+        self.packed_postings = (
+            (row_codes.astype("int64") << ROW_SHIFT)
+            | (col_codes << COL_SHIFT)
+            | positions
+        )
+        self.tokens = postings_df[TOKEN_COL].astype(str).to_numpy(dtype=object)
+
+    def get_token_postings(self, token: str, is_prefix: bool = False) -> np.ndarray:
+        """Returns the packed postings of a token, or of every token starting
+        with it if is_prefix."""
+        start = np.searchsorted(self.tokens, token, side="left")
+        if is_prefix:
+            # every token with the prefix sorts before the prefix followed
+            # by the last unicode character
+            end = np.searchsorted(self.tokens, token + "\U0010ffff", side="left")
+        else:
+            end = np.searchsorted(self.tokens, token, side="right")
+        return self.packed_postings[start:end]
+
+    def search(
+        self,
+        query: str,
+        mode: str = "tokens",
+        cols: Optional[list[str]] = None,
+    ) -> np.ndarray:
+        """Finds the rows matching a query.
+
+        Parameters
+        ----------
+        query
+            Text to search for, tokenized like the indexed text.
+        mode
+            One of SEARCH_MODES. "tokens" matches rows with every token of
+            the query, "prefix" rows with a token starting with each token
+            of the query and "phrase" rows with the tokens of the query one
+            after another in the same column.
+        cols
+            Only search these text columns. Searches every text column if
+            None.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted record ids of the matching rows.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search mode {mode}!")
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return self.record_ids[:0]
+
+        col_codes = np.array(
+            [TEXT_INDEX_COLS.index(col) for col in cols or TEXT_INDEX_COLS]
+        )
+        matches = None
+        for token_num, token in enumerate(query_tokens):
+            postings = self.get_token_postings(token, is_prefix=mode == "prefix")
+            postings = postings[np.isin((postings >> COL_SHIFT) & COL_MASK, col_codes)]
+            if mode == "phrase":
+                # shifted back to the position the phrase would start at, so
+                # the tokens of a phrase all have the same packed posting
+                postings = postings[(postings & POSITION_MASK) >= token_num]
+                token_matches = np.unique(postings - token_num)
+            else:
+                token_matches = np.unique(postings >> ROW_SHIFT)
+            matches = (
+                token_matches
+                if matches is None
+                else np.intersect1d(matches, token_matches, assume_unique=True)
+            )
+
+        if mode == "phrase":
+            matches = np.unique(matches >> ROW_SHIFT)
+
+        return np.sort(self.record_ids[matches])
+
+
+def get_postings_paths(index_dir: pathlib.Path) -> list[pathlib.Path]:
+    """Returns the paths of the saved postings files, one per data source,
+    sorted by data source."""
+    return sorted(index_dir.glob(f"*{STAN_C.TEXT_SEARCH_POSTINGS_CSV_ENDING}"))
+
+
+def load_postings(
+    index_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_DIR,
+) -> pd.DataFrame:
+    """Loads and merges the saved postings of every data source, empty if the
+    index hasn't been built yet."""
+    return pd.concat(
+        [pd.DataFrame(columns=POSTING_COLS)]
+        + [
+            util.load_df(file_name=postings_path.name, save_dir=index_dir)
+            for postings_path in get_postings_paths(index_dir)
+        ],
+        ignore_index=True,
+    )
+
+
+def load_text_search_index(
+    index_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_DIR,
+) -> TextSearchIndex:
+    """Loads the text search index, reusing the last load if no postings
+    file changed.
+
+    Parameters
+    ----------
+    index_dir
+        The directory the postings files are saved in.
+
+    Returns
+    -------
+    TextSearchIndex
+        The index, with no postings if it hasn't been built yet.
+    """
+    file_key = tuple(
+        (postings_path.name, postings_path.stat().st_mtime_ns)
+        for postings_path in get_postings_paths(index_dir)
+    )
+    if _loaded_index["index"] is None or _loaded_index["file_key"] != file_key:
+        _loaded_index["index"] = TextSearchIndex(load_postings(index_dir))
+        _loaded_index["file_key"] = file_key
+
+    return _loaded_index["index"]
+
+
+def update_text_search_index(
+    postings_df: pd.DataFrame,
+    index_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_DIR,
+) -> None:
+    """Replaces the postings files of the given data sources.
+
+    The files of other data sources are left as they are.
+
+    Parameters
+    ----------
+    postings_df
+        New postings from get_postings.
+    index_dir
+        The directory the postings files are saved in.
+    """
+    index_dir.mkdir(parents=True, exist_ok=True)
+    for data_source, source_postings_df in postings_df.groupby(
+        STAN_C.DATA_SOURCE_COL, sort=True
+    ):
+        util.save_df(
+            df=source_postings_df.reindex(columns=POSTING_COLS),
+            file_name=f"{data_source}{STAN_C.TEXT_SEARCH_POSTINGS_CSV_ENDING}",
+            save_dir=index_dir,
+        )
+
+
+def search_text(
+    query: str,
+    mode: str = "tokens",
+    cols: Optional[list[str]] = None,
+    index_dir: pathlib.Path = DIR_C.CLEANED_AND_STANDARDIZED_TEXT_SEARCH_INDEX_DIR,
+) -> np.ndarray:
+    """Searches the saved text search index, see TextSearchIndex.search.
+
+    Parameters
+    ----------
+    query
+        Text to search for.
+    mode
+        One of SEARCH_MODES.
+    cols
+        Only search these text columns. Searches every text column if None.
+    index_dir
+        The directory the postings files are saved in.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted record ids of the matching rows.
+    """
+    return load_text_search_index(index_dir).search(query, mode, cols)
@@ -3,37 +3,66 @@
 
 
 # stdlib imports
+import os
 import re
+import gzip
+import shutil
+import contextlib
+import hashlib
 import typing
 import pathlib
+import concurrent.futures
 
 # 3rd party imports
 import pandas as pd
 
+# repo specific imports
+import date_parsing
+
+# csv file endings save_df and load_df support, compressed csvs are
+# compressed with gzip or zstd depending on the ending
+CSV_FILE_ENDINGS = (".csv", ".csv.gz", ".csv.zst")
+GZIP_COMPRESSION_LEVEL = 6
+ZSTD_COMPRESSION_LEVEL = 3
+# number of rows rendered to csv text and compressed at a time
+CSV_CHUNK_NUM_ROWS = 20_000
+# number of threads compressing gzip chunks at once
+GZIP_NUM_THREADS = 4
+
 
 def load_df(
     file_name: str,
     save_dir: pathlib.Path,
     sheet_name: str = "",
     datetime_converserions: typing.Tuple[str, str] = {},
+    columns: typing.Optional[typing.List[str]] = None,
 ) -> pd.DataFrame:
     """
     Takes a filename and a directory then loads a dataframe from that
     file and returns it
 
     Inputs:
-        file_name(string): the name of the file the df will be loaded from
+        file_name(string): the name of the file the df will be loaded from,
+        csvs can be gzip (.csv.gz) or zstd (.csv.zst) compressed
         save_dir(pathlib path): the directory the file is in
         sheet_name(str): optional name of sheet if excel
         datetime_converserions(Dict[str, str]): An optional type of
         column name, datetime format to convert
+        columns(List[str]): optional names of the only columns to load,
+        names the file doesn't have are ignored
 
     Output:
         a dataframe loaded from the file
     """
-    # load depending on file ending
-    if file_name.endswith(".csv"):
-        df = pd.read_csv(save_dir / file_name)
+    # load depending on file ending, read_csv decompresses compressed csvs
+    # based on their ending
+    if file_name.endswith(CSV_FILE_ENDINGS):
+        df = pd.read_csv(
+            save_dir / file_name,
+            usecols=None if columns is None else lambda col: col in columns,
+        )
+    elif file_name.endswith(".feather"):
+        df = pd.read_feather(save_dir / file_name, columns=columns)
     elif file_name.endswith(".xlsx") or file_name.endswith(".xls"):
         # assert they didn't forget a sheet
         assert sheet_name != "", f"No sheet included with {file_name}"
@@ -47,42 +76,216 @@ def load_df(
         )
 
     # now attempt to get a good dtype
-    df = df.apply(
+    df = infer_dtypes(df)
+
+    # now do date time conversions
+    for col, datetime_format in datetime_converserions:
+        df[col] = date_parsing.to_datetime(df[col], [datetime_format])
+
+    return df
+
+
+def infer_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts the columns of a dataframe to numeric where possible and
+    every column to the best nullable dtype, which is how load_df types
+    what it loads
+
+    Inputs:
+        df(pandas dataframe): dataframe to type
+
+    Output:
+        the dataframe with the inferred dtypes
+    """
+    return df.apply(
         pd.to_numeric,
         errors="ignore",
         downcast="unsigned",
     ).convert_dtypes()
 
-    # now do date time conversions
-    for col, datetime_format in datetime_converserions:
-        df[col] = pd.to_datetime(df[col], format=datetime_format)
 
-    return df
+def get_csv_round_trip_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Takes a dataframe and returns it with the values and dtypes load_df
+    gives it after it is saved to csv with save_df, without writing or
+    parsing any csv text. Dates become the strings to_csv writes for them and
+    empty strings become missing like read_csv makes them.
+
+    Inputs:
+        df(pandas dataframe): dataframe as it would be passed to save_df
+
+    Output:
+        a new dataframe as load_df would load it from the csv
+    """
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].astype(str).where(df[col].notna())
+        elif pd.api.types.is_object_dtype(df[col]):
+            df[col] = df[col].mask(df[col].eq(""))
+
+    return infer_dtypes(df)
+
+
+@contextlib.contextmanager
+def atomic_write_path(file_path: pathlib.Path) -> typing.Iterator[pathlib.Path]:
+    """
+    Takes the path of a file to write and gives a temporary path next to it
+    to write the file to instead. Once the write finishes the temporary file
+    is renamed over the file, so readers and crashes only ever see the old or
+    the complete new file. The new file keeps the permissions of the file it
+    replaces. If the write fails the temporary file is removed.
+
+    Inputs:
+        file_path(pathlib path): path of the file to write
+
+    Output:
+        the temporary path to write to
+    """
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    try:
+        yield temp_path
+        if file_path.exists():
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
 
 
 def save_df(df: pd.DataFrame, file_name: str, save_dir: pathlib.Path) -> None:
     """
     Takes a dataframe, a filename, and a directory. The dataframe will
-    be saved with the file name in the given directory
+    be saved with the file name in the given directory, through a temporary
+    file so a crash never leaves a partly written file behind
 
     Inputs:
         df(pandas dataframe): dataframe to save
-        file_name(string): the name of the file the df will be saved as
+        file_name(string): the name of the file the df will be saved as,
+        csvs are gzip or zstd compressed if it ends in .csv.gz or .csv.zst
         save_dir(pathlib path): the directory the file should be saved in
 
     Output:
         nothing
     """
-
-    # now save the name
-    if file_name.endswith(".csv"):
-        df.to_csv(save_dir / file_name, index=False)
-    else:
+    if not file_name.endswith(CSV_FILE_ENDINGS + (".feather",)):
         raise NotImplementedError(
             "This function does not currently support the file extension "
             f"for {file_name}"
         )
 
+    # now save the name
+    with atomic_write_path(save_dir / file_name) as temp_path:
+        if file_name.endswith(".csv"):
+            df.to_csv(temp_path, index=False)
+        elif file_name.endswith(".csv.gz"):
+            save_gzip_csv(df, temp_path)
+        elif file_name.endswith(".csv.zst"):
+            save_zstd_csv(df, temp_path)
+        else:
+            # uncompressed so the file can be memory mapped without copying
+            df.reset_index(drop=True).to_feather(temp_path, compression="uncompressed")
+
+
+def get_csv_chunks(df: pd.DataFrame) -> typing.Iterator[bytes]:
+    """
+    Takes a dataframe and renders it as csv text a chunk of rows at a time,
+    so a compressor can stream it without the whole csv in memory. The
+    chunks joined together are the same text as df.to_csv(index=False).
+
+    Inputs:
+        df(pandas dataframe): dataframe to render
+
+    Output:
+        the utf-8 encoded csv text of each chunk, the first with the header
+    """
+    for start in range(0, max(df.shape[0], 1), CSV_CHUNK_NUM_ROWS):
+        yield df.iloc[start : start + CSV_CHUNK_NUM_ROWS].to_csv(
+            index=False, header=start == 0
+        ).encode("utf-8")
+
+
+def save_gzip_csv(df: pd.DataFrame, file_path: pathlib.Path) -> None:
+    """
+    Takes a dataframe and saves it as a gzip compressed csv. Each chunk of
+    rows is compressed as its own gzip member in a thread pool (zlib
+    releases the GIL) and the members are written in order. Concatenated
+    gzip members are a valid gzip file that every gzip reader decompresses
+    as one.
+
+    Inputs:
+        df(pandas dataframe): dataframe to save
+        file_path(pathlib path): path of the .csv.gz file
+
+    Output:
+        nothing
+    """
+    with open(file_path, "wb") as gzip_file, concurrent.futures.ThreadPoolExecutor(
+        max_workers=GZIP_NUM_THREADS
+    ) as executor:
+        # only keep a few chunks in flight so memory use stays bounded
+        pending = []
+        for chunk in get_csv_chunks(df):
+            pending.append(
+                executor.submit(gzip.compress, chunk, GZIP_COMPRESSION_LEVEL, mtime=0)
+            )
+            if len(pending) > GZIP_NUM_THREADS:
+                gzip_file.write(pending.pop(0).result())
+        for compressed_chunk in pending:
+            gzip_file.write(compressed_chunk.result())
+
+
+def save_zstd_csv(df: pd.DataFrame, file_path: pathlib.Path) -> None:
+    """
+    Takes a dataframe and saves it as a zstd compressed csv, streaming the
+    csv text into a compressor that uses a thread per core. Requires the
+    optional zstandard package, which read_csv also needs to load the file.
+
+    Inputs:
+        df(pandas dataframe): dataframe to save
+        file_path(pathlib path): path of the .csv.zst file
+
+    Output:
+        nothing
+    """
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL, threads=-1)
+    with open(file_path, "wb") as zstd_file, compressor.stream_writer(
+        zstd_file
+    ) as writer:
+        for chunk in get_csv_chunks(df):
+            writer.write(chunk)
+
+
+def load_memory_mapped_table(
+    file_name: str,
+    save_dir: pathlib.Path,
+    columns: typing.Optional[typing.List[str]] = None,
+) -> "pyarrow.Table":
+    """
+    Takes a feather (Arrow IPC) filename and a directory then memory maps
+    the file and returns it as an Arrow table without copying the data.
+    Every process mapping the same file shares one copy of it in the page
+    cache. Requires pyarrow.
+
+    Inputs:
+        file_name(string): the name of the uncompressed feather file
+        save_dir(pathlib path): the directory the file is in
+        columns(List[str]): optional names of the only columns to return
+
+    Output:
+        an Arrow table backed by the memory mapped file. Use .to_pandas()
+        to get a dataframe, which copies the data.
+    """
+    import pyarrow
+
+    source = pyarrow.memory_map(str(save_dir / file_name), "r")
+    table = pyarrow.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+
+    return table
+
 
 def strip_and_trim_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     """Strips trailing and leading whitespace and removes an excess
@@ -111,3 +314,20 @@ def strip_and_trim_whitespace(df: pd.DataFrame) -> pd.DataFrame:
             )
 
     return df
+
+
+def get_file_hash(file_path: pathlib.Path) -> str:
+    """Returns the sha256 hex digest of a file's contents.
+
+    Input:
+        file_path: path of the file to hash
+
+    Returns:
+        The hex digest of the file
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as hash_file:
+        for block in iter(lambda: hash_file.read(1 << 20), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()